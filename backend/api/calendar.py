@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from api.chatbot.calendarAI import calendar_ai
@@ -44,7 +45,7 @@ async def add_medication_schedule(request: CalendarRequest):
                 print(f"날짜 파싱 실패: {date_error}, 기본값 사용")
                 start_date = None
         
-        result = calendar_agent.process_medication_request(
+        result = await calendar_agent.process_medication_request(
             request.user_id,
             request.medication_text, 
             start_date
@@ -69,7 +70,8 @@ async def get_upcoming_schedules(user_id: str, days: int = 7):
     """앞으로 N일간의 복약 일정을 조회합니다."""
     
     try:
-        events = calendar_agent.get_upcoming_medication_events(user_id, days)
+        # googleapiclient는 동기 라이브러리이고 사용자별 잠금을 기다릴 수 있으므로 스레드에서 실행
+        events = await asyncio.to_thread(calendar_agent.get_upcoming_medication_events, user_id, days)
         
         return {
             "success": True,
@@ -95,7 +97,7 @@ async def calendar_health_check(user_id: str):
         
         if is_authenticated:
             # 간단한 API 호출 테스트
-            events = calendar_agent.get_upcoming_medication_events(user_id, 1)
+            events = await asyncio.to_thread(calendar_agent.get_upcoming_medication_events, user_id, 1)
             
             return {
                 "service": "Google Calendar API",
@@ -1,117 +1,150 @@
 
-import httpx
-from fastapi import APIRouter, HTTPException
-from schemas.chat import ChatRequest
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from schemas.chat import ChatRequest, ChatBatchRequest
 from core.config import settings
-from ibm_watson_machine_learning.foundation_models import Model
+from core.timing import start_request_timer, timed_stage
+from core.metrics import record_chat_agent
 from ibm_watson_machine_learning.metanames import GenTextParamsMetaNames as GenParams
-import asyncio
-from typing import Optional
+from utils.watsonx import watsonx_client, CircuitOpenError
+from utils.cache import answer_cache, normalize_question
+from utils.intent import KeywordMatcher
+from utils.drug_kb import drug_kb, format_duplicate_warning, contraindication_engine
 
 # AI 에이전트 임포트
 from api.chatbot.explainAI import explain_ai
 from api.chatbot.warnAI import warn_ai
 from api.chatbot.calendarAI import calendar_ai
+from api.chatbot.faqAI import faq_ai
+import asyncio
+import json
+import time
 import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # APIRouter 인스턴스 생성
 router = APIRouter()
 
-# IBM Watson 모델 인스턴스 (전역으로 한 번만 초기화)
-_watson_model: Optional[Model] = None
-
-
-def get_watson_model() -> Model:
-    """IBM Watson 모델 인스턴스를 반환합니다 (Singleton 패턴)"""
-    global _watson_model
-    if _watson_model is None:
-        # 설정 검증
-        if not settings.WATSONX_API_KEY or not settings.WATSONX_PROJECT_ID:
-            raise HTTPException(
-                status_code=500,
-                detail="IBM Watson API 키 또는 프로젝트 ID가 설정되지 않았습니다."
-            )
-
-        try:
-            # IBM Watson 자격 증명 설정
-            creds = {
-                "url": settings.WATSONX_API_URL,
-                "apikey": settings.WATSONX_API_KEY
-            }
-
-            # 모델 인스턴스 생성
-            _watson_model = Model(
-                model_id='ibm/granite-3-3-8b-instruct',
-                credentials=creds,
-                project_id=settings.WATSONX_PROJECT_ID
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"IBM Watson 모델 초기화 실패: {str(e)}"
-            )
-    return _watson_model
+# 일반 의료 상담 생성 파라미터
+GENERAL_GENERATION_PARAMS = {
+    GenParams.MAX_NEW_TOKENS: 300,  # 의료 상담용으로 조금 더 길게
+    GenParams.TEMPERATURE: 0.3,     # 의료 정보는 보수적으로
+    GenParams.REPETITION_PENALTY: 1.1
+}
+
+# 에이전트 타입별 이름
+AGENT_NAMES = {
+    "explain": "ExplainAI",
+    "warn": "WarnAI",
+    "add_cal": "CalendarAI",
+    "general": "GeneralAI",
+    "faq": "KnowledgeBase"
+}
+
+# 의도 분류 키워드 (한 번의 스캔으로 모든 카테고리를 찾도록 오토마톤으로 컴파일)
+INTENT_MATCHER = KeywordMatcher({
+    # 캘린더 관련 키워드
+    "add_cal": [
+        '일정', '캘린더', '알림', '스케줄', '추가', '등록', '복용',
+        '먹어', '드세요', '아침', '점심', '저녁', '식전', '식후', '하루'
+    ],
+    # 경고/부작용 관련 키워드
+    "warn": [
+        '부작용', '위험', '주의', '경고', '안전', '금기', '독성', '과량',
+        '응급', '알레르기', '상호작용', '임신', '수유', '간독성', '신독성'
+    ],
+    # 약물 설명 관련 키워드
+    "explain": [
+        '효과', '효능', '작용', '성분', '원리', '어떻게', '왜', '설명',
+        '무엇', '약', '성분', '기전', '치료', '개선', '완화'
+    ]
+})
 
 
-def get_medical_completion(prompt: str) -> str:
+async def get_medical_completion(prompt: str) -> str:
     """IBM Watson 모델에게 의료 상담 요청을 보내고 응답을 반환합니다"""
     try:
-        model = get_watson_model()
-        response = model.generate(
+        response = await watsonx_client.generate(
             prompt=prompt,
-            params={
-                GenParams.MAX_NEW_TOKENS: 300,  # 의료 상담용으로 조금 더 길게
-                GenParams.TEMPERATURE: 0.3,     # 의료 정보는 보수적으로
-                GenParams.REPETITION_PENALTY: 1.1
-            }
+            params=GENERAL_GENERATION_PARAMS
         )
         return response['results'][0]['generated_text']
+    except (HTTPException, CircuitOpenError):
+        # 대기열 초과(503), 서킷 차단 등은 그대로 전달
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"IBM Watson 모델 오류: {str(e)}")
 
 
-def classify_user_input(query: str) -> str:
-    """사용자 입력을 분류하여 적절한 AI 에이전트를 선택합니다"""
-    query_lower = query.lower()
-    
-    # 경고/부작용 관련 키워드
-    warn_keywords = [
-        '부작용', '위험', '주의', '경고', '안전', '금기', '독성', '과량',
-        '응급', '알레르기', '상호작용', '임신', '수유', '간독성', '신독성'
-    ]
-    
-    # 약물 설명 관련 키워드  
-    explain_keywords = [
-        '효과', '효능', '작용', '성분', '원리', '어떻게', '왜', '설명',
-        '무엇', '약', '성분', '기전', '치료', '개선', '완화'
-    ]
-    
-    # 캘린더 관련 키워드
-    calendar_keywords = [
-        '일정', '캘린더', '알림', '스케줄', '추가', '등록', '복용',
-        '먹어', '드세요', '아침', '점심', '저녁', '식전', '식후', '하루'
-    ]
-    
-    # 우선순위: 캘린더 > 경고 > 설명 > 일반
-    if any(keyword in query_lower for keyword in calendar_keywords):
-        return "add_cal"
-    elif any(keyword in query_lower for keyword in warn_keywords):
-        return "warn"
-    elif any(keyword in query_lower for keyword in explain_keywords):
-        return "explain"
+async def stream_medical_completion(prompt: str) -> AsyncIterator[str]:
+    """일반 의료 상담 응답을 생성되는 대로 조각 단위로 반환합니다"""
+    async for chunk in watsonx_client.generate_text_stream(prompt, GENERAL_GENERATION_PARAMS):
+        yield chunk
+
+
+async def get_general_answer(question: str, user_context_dict: dict, context_text: str,
+                             use_cache: bool = True) -> str:
+    """일반 의료 상담(GeneralAI) 답변을 캐시를 거쳐 반환합니다"""
+    cache_key = answer_cache.make_key("general", question, user_context_dict, GENERAL_GENERATION_PARAMS)
+    if use_cache:
+        cached_answer = await answer_cache.get(cache_key)
+        if cached_answer is not None:
+            return cached_answer
+    else:
+        answer_cache.record_bypass()
+
+    with timed_stage("prompt"):
+        prompt = build_medical_prompt(question, context_text)
+    answer = (await get_medical_completion(prompt)).strip()
+    await answer_cache.set(cache_key, answer)
+    return answer
+
+
+async def stream_general_answer(question: str, user_context_dict: dict, context_text: str,
+                                use_cache: bool = True) -> AsyncIterator[str]:
+    """일반 의료 상담(GeneralAI) 답변을 캐시를 거쳐 조각 단위로 반환합니다"""
+    cache_key = answer_cache.make_key("general", question, user_context_dict, GENERAL_GENERATION_PARAMS)
+    if use_cache:
+        cached_answer = await answer_cache.get(cache_key)
+        if cached_answer is not None:
+            yield cached_answer
+            return
     else:
-        return "general"
+        answer_cache.record_bypass()
 
+    chunks = []
+    async for chunk in stream_medical_completion(build_medical_prompt(question, context_text)):
+        chunks.append(chunk)
+        yield chunk
+    await answer_cache.set(cache_key, ''.join(chunks).strip())
 
-@router.post("/chat", summary="의료 AI 채팅")
-async def get_chat_response(request: ChatRequest):
-    """프론트엔드 요청을 적절한 AI 에이전트로 라우팅하여 응답을 반환합니다."""
 
-    # 사용자 컨텍스트 구성
+def check_duplicate_ingredients(medications) -> list:
+    """복용 약물 중 같은 유효성분이 들어 있는 조합을 찾습니다 (LLM 호출 전 결정적 검사)"""
+    if not settings.DRUG_KB_ENABLED or not medications:
+        return []
+    return drug_kb.find_duplicate_ingredients(medications)
+
+
+def check_contraindications(request: ChatRequest) -> list:
+    """복용 약물·질문 속 약의 질환 금기와 약물 간 상호작용을 규칙으로 찾습니다 (LLM 호출 전 결정적 검사)"""
+    return contraindication_engine.check(
+        request.currentMedications, request.underlying_diseases, request.question
+    )
+
+
+def build_user_context(request: ChatRequest, duplicates: list, contraindications: list):
+    """요청에서 에이전트용 컨텍스트 딕셔너리와 프롬프트용 컨텍스트 문자열을 구성합니다
+
+    duplicates, contraindications는 check_duplicate_ingredients(), check_contraindications()로
+    미리 구한 결과이며, 에이전트(WarnAI)가 다시 계산하지 않도록 딕셔너리에 함께 담습니다.
+    """
     user_context_dict = {
         'underlying_diseases': request.underlying_diseases,
-        'currentMedications': request.currentMedications
+        'currentMedications': request.currentMedications,
+        'duplicate_ingredients': duplicates,
+        'contraindications': contraindications
     }
     
     user_context = []
@@ -120,18 +153,19 @@ async def get_chat_response(request: ChatRequest):
     if request.currentMedications:
         user_context.append(
             f"현재 복용 약물: {', '.join(request.currentMedications)}")
+        for duplicate in duplicates:
+            user_context.append(
+                f"성분 중복: {', '.join(duplicate['medications'])} ({duplicate['ingredient']})")
 
     context_text = " | ".join(
         user_context) if user_context else "특별한 기저질환이나 복용 약물 없음"
     
-    # 사용자 입력 분류
-    agent_type = classify_user_input(request.question)
-    
-    # 세션 ID 생성 (캘린더 AI용)
-    session_id = str(uuid.uuid4())
+    return user_context_dict, bool(user_context), context_text
 
-    # 의료 전용 프롬프트 구성
-    medical_prompt = f"""
+
+def build_medical_prompt(question: str, context_text: str) -> str:
+    """일반 의료 상담(GeneralAI)용 프롬프트를 구성합니다"""
+    return f"""
 당신은 전문적인 의료 AI 어시스턴트입니다. 다음 지침을 따라 응답해주세요:
 
 지침:
@@ -143,82 +177,183 @@ async def get_chat_response(request: ChatRequest):
 
 환자 정보:
 - 사용자 상태: {context_text}
-- 질문: "{request.question}"
+- 질문: "{question}"
 
 위 정보를 바탕으로 적절한 의료 조언을 제공해주세요:
 """
 
+
+def build_model_metadata(agent_type: str, session_id: str, context_provided: bool) -> dict:
+    """응답에 포함할 모델 메타데이터를 구성합니다"""
+    if agent_type == "faq":
+        # 데이터셋으로 바로 답한 경우 (LLM 호출 없음)
+        model_name, model_provider = "MedDB / e약은요 데이터셋", "식품의약품안전처 의약품 허가 정보"
+    else:
+        model_name, model_provider = "IBM Granite 3.3 8B Instruct", "IBM Watson"
+    return {
+        "model_name": model_name,
+        "model_provider": model_provider,
+        "agent_used": AGENT_NAMES[agent_type],
+        "agent_type": agent_type,
+        "session_id": session_id if agent_type == "add_cal" else None,
+        "context_provided": context_provided,
+        "disclaimer": "이는 일반적인 건강 정보이며, 전문 의료진의 진료를 대체할 수 없습니다."
+    }
+
+
+def classify_user_input(query: str) -> Tuple[str, Optional[Tuple[str, Dict]]]:
+    """사용자 입력을 분류하여 적절한 AI 에이전트를 선택합니다
+
+    (에이전트 타입, FAQ 매칭 결과)를 반환합니다. FAQ 매칭 결과는 "faq"일 때만 있는
+    (의도, 제품 레코드)이며, 답변 단계에서 다시 찾지 않고 faq_ai.render()에 그대로 넘깁니다.
+    """
+    # 제품 효능/복용법/보관법 질문은 LLM 없이 데이터셋으로 답함
+    faq_match = faq_ai.match(query)
+    if faq_match is not None:
+        return "faq", faq_match
+
+    matches = INTENT_MATCHER.match(query)
+
+    # 우선순위: 캘린더 > 경고 > 설명 > 일반
+    for agent_type in ("add_cal", "warn", "explain"):
+        if agent_type in matches:
+            return agent_type, None
+    return "general", None
+
+
+def prepare_chat(request: ChatRequest) -> Dict[str, Any]:
+    """컨텍스트 구성, 안전 확인, 에이전트 분류를 한 번에 수행합니다
+
+    /chat, /chat/stream, 음성 채팅, 배치가 함께 사용합니다. 배치는 항목마다 한 번만 호출해
+    그룹 키와 대표 요청 생성에 같은 결과를 재사용합니다.
+    """
+    # 사용자 컨텍스트 구성 (복용 약물 성분 중복, 금기·상호작용은 LLM 호출 전에 확인)
+    with timed_stage("context"):
+        duplicates = check_duplicate_ingredients(request.currentMedications)
+        contraindications = check_contraindications(request)
+        user_context_dict, context_provided, context_text = build_user_context(
+            request, duplicates, contraindications
+        )
+
+    # 사용자 입력 분류
+    with timed_stage("classify"):
+        agent_type, faq_match = classify_user_input(request.question)
+
+    return {
+        "agent_type": agent_type,
+        "faq_match": faq_match,
+        "session_id": str(uuid.uuid4()),  # 캘린더 AI용
+        "user_context_dict": user_context_dict,
+        "context_provided": context_provided,
+        "context_text": context_text,
+        "duplicates": duplicates,
+        "contraindications": contraindications
+    }
+
+
+@router.post("/chat", summary="의료 AI 채팅")
+async def get_chat_response(request: ChatRequest, response: Response = None):
+    """프론트엔드 요청을 적절한 AI 에이전트로 라우팅하여 응답을 반환합니다.
+
+    단계별 처리 시간은 `Server-Timing` 헤더와 응답의 `debug` 필드로 전달됩니다.
+    """
+    timer = start_request_timer()
+    prepared = prepare_chat(request)
+    result = await answer_chat(request, prepared)
+
+    record_chat_agent(AGENT_NAMES[prepared["agent_type"]], result["status"])
+    if timer is not None:
+        result["debug"] = timer.as_dict()
+        if response is not None:
+            response.headers.update(timer.headers())
+    return result
+
+
+async def answer_chat(request: ChatRequest, prepared: Dict[str, Any]) -> Dict[str, Any]:
+    """prepare_chat()의 결과로 에이전트 답변을 만들어 /chat 응답 형식으로 반환합니다 (메트릭은 호출자가 기록)"""
+    agent_type = prepared["agent_type"]
+    session_id = prepared["session_id"]
+    duplicates = prepared["duplicates"]
+
+    # 답변 캐시 사용 여부 (CalendarAI는 상태를 다루므로 캐시하지 않음)
+    use_cache = not request.bypass_cache
+
     try:
         # AI 에이전트별 처리
-        if agent_type == "explain":
-            # 약물 설명 AI
-            loop = asyncio.get_event_loop()
-            agent_response = await loop.run_in_executor(
-                None,
-                explain_ai.explain_medication,
-                request.question,
-                user_context_dict
+        with timed_stage("agent"):
+            agent_response = await _dispatch_agent(
+                agent_type, request, session_id, prepared["user_context_dict"], prepared["context_text"], use_cache,
+                prepared["faq_match"]
             )
-            agent_name = "ExplainAI"
-            
-        elif agent_type == "warn":
-            # 경고/안전 AI
-            loop = asyncio.get_event_loop()
-            agent_response = await loop.run_in_executor(
-                None,
-                warn_ai.check_safety_warnings,
-                request.question,
-                user_context_dict
-            )
-            agent_name = "WarnAI"
-            
-        elif agent_type == "add_cal":
-            # 캘린더 AI
-            loop = asyncio.get_event_loop()
-            agent_response = await loop.run_in_executor(
-                None,
-                calendar_ai.handle_calendar_request,
-                request.question,
-                session_id,
-                user_context_dict
-            )
-            agent_name = "CalendarAI"
-            
-        else:
-            # 일반 의료 상담 (기존 로직)
-            loop = asyncio.get_event_loop()
-            agent_response = await loop.run_in_executor(
-                None,
-                get_medical_completion,
-                medical_prompt
-            )
-            agent_name = "GeneralAI"
 
         # 성공 응답 반환
-        return {
+        result = {
             "answer": agent_response.strip(),
             "user_context": {
                 "underlying_diseases": request.underlying_diseases,
                 "medications": request.currentMedications
             },
-            "model_metadata": {
-                "model_name": "IBM Granite 3.3 8B Instruct",
-                "model_provider": "IBM Watson",
-                "agent_used": agent_name,
-                "agent_type": agent_type,
-                "session_id": session_id if agent_type == "add_cal" else None,
-                "context_provided": bool(user_context),
-                "disclaimer": "이는 일반적인 건강 정보이며, 전문 의료진의 진료를 대체할 수 없습니다."
-            },
+            "model_metadata": build_model_metadata(agent_type, session_id, prepared["context_provided"]),
             "status": "success"
         }
 
+    except CircuitOpenError as e:
+        # Watson 장애로 서킷이 열려 있으면 기다리지 않고 바로 fallback 응답
+        result = await _get_fallback_response(request, str(e))
     except HTTPException:
         # Watson 모델 오류 시 기존 fallback 로직 사용
         raise
     except Exception as e:
         # 기타 예외 시 fallback 응답
-        return await _get_fallback_response(request, f"서비스 일시 중단: {str(e)}")
+        result = await _get_fallback_response(request, f"서비스 일시 중단: {str(e)}")
+
+    # 성분 중복 경고는 답변 앞에 붙이고 구조화된 형태로도 전달
+    result["safety_warnings"] = duplicates
+    result["contraindications"] = prepared["contraindications"]
+    if duplicates:
+        result["answer"] = f"{format_duplicate_warning(duplicates)}\n\n{result['answer']}"
+    return result
+
+
+async def _dispatch_agent(agent_type: str, request: ChatRequest, session_id: str,
+                          user_context_dict: dict, context_text: str, use_cache: bool,
+                          faq_match: Optional[Tuple[str, Dict]] = None) -> str:
+    """분류된 에이전트로 요청을 보내고 답변을 반환합니다"""
+    if agent_type == "faq":
+        # 의약품 FAQ (분류 단계에서 찾은 제품 레코드로 데이터셋 답변)
+        return faq_ai.render(*faq_match, user_context_dict)
+
+    if agent_type == "explain":
+        # 약물 설명 AI
+        return await explain_ai.explain_medication(
+            request.question,
+            user_context_dict,
+            use_cache
+        )
+
+    if agent_type == "warn":
+        # 경고/안전 AI
+        return await warn_ai.check_safety_warnings(
+            request.question,
+            user_context_dict,
+            use_cache
+        )
+
+    if agent_type == "add_cal":
+        # 캘린더 AI
+        return await calendar_ai.handle_calendar_request(
+            request.question,
+            session_id,
+            user_context_dict
+        )
+
+    # 일반 의료 상담 (기존 로직)
+    return await get_general_answer(
+        request.question,
+        user_context_dict,
+        context_text,
+        use_cache
+    )
 
 
 async def _get_fallback_response(request: ChatRequest, error_msg: str):
@@ -257,6 +392,231 @@ async def _get_fallback_response(request: ChatRequest, error_msg: str):
     }
 
 
+def _format_sse(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 메시지를 만듭니다"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_agent_response(agent_type: str, question: str, user_context_dict: dict,
+                                 session_id: str, context_text: str, use_cache: bool = True,
+                                 faq_match: Optional[Tuple[str, Dict]] = None) -> AsyncIterator[str]:
+    """분류된 에이전트의 응답을 조각 단위로 반환합니다"""
+    if agent_type == "faq":
+        yield faq_ai.render(*faq_match, user_context_dict)
+    elif agent_type == "explain":
+        async for chunk in explain_ai.stream_explanation(question, user_context_dict, use_cache):
+            yield chunk
+    elif agent_type == "warn":
+        async for chunk in warn_ai.stream_safety_warnings(question, user_context_dict, use_cache):
+            yield chunk
+    elif agent_type == "add_cal":
+        # 캘린더 AI는 세션 상태를 다루므로 완성된 응답을 한 번에 전달
+        yield await calendar_ai.handle_calendar_request(question, session_id, user_context_dict)
+    else:
+        async for chunk in stream_general_answer(question, user_context_dict, context_text, use_cache):
+            yield chunk
+
+
+def prepare_chat_stream(request: ChatRequest) -> Dict[str, Any]:
+    """스트리밍 응답을 시작하기 전에 컨텍스트 구성, 안전 확인, 에이전트 분류를 마칩니다
+
+    /chat/stream과 음성 채팅 파이프라인이 함께 사용합니다. 스트림 시작 후에는 상태 코드를
+    바꿀 수 없으므로 Watson 대기열 초과(503)도 여기서 먼저 확인합니다.
+    """
+    prepared = prepare_chat(request)
+
+    # 데이터셋으로 답하는 FAQ는 Watson을 쓰지 않음
+    if prepared["agent_type"] != "faq":
+        watsonx_client.pool.check_capacity()
+    return prepared
+
+
+async def stream_answer_chunks(request: ChatRequest, prepared: Dict[str, Any]) -> AsyncIterator[str]:
+    """성분 중복 경고와 에이전트 답변 조각을 차례로 반환합니다 (생성 실패 시 예외 발생)"""
+    if prepared["duplicates"]:
+        yield f"{format_duplicate_warning(prepared['duplicates'])}\n\n"
+
+    started = False
+    async for chunk in _stream_agent_response(
+        prepared["agent_type"], request.question, prepared["user_context_dict"],
+        prepared["session_id"], prepared["context_text"], use_cache=not request.bypass_cache,
+        faq_match=prepared["faq_match"]
+    ):
+        # /chat 응답의 strip()과 맞추기 위해 앞쪽 공백 제거
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        yield chunk
+
+
+async def stream_chat_text(request: ChatRequest, prepared: Dict[str, Any]) -> AsyncIterator[str]:
+    """답변 텍스트만 필요한 곳(음성 채팅)을 위한 스트림
+
+    아직 아무것도 보내지 않은 상태에서 생성이 실패하면 /chat과 같이 fallback 답변을 대신 반환합니다.
+    """
+    agent_name = AGENT_NAMES[prepared["agent_type"]]
+    sent = False
+    try:
+        async for chunk in stream_answer_chunks(request, prepared):
+            sent = True
+            yield chunk
+    except Exception as e:
+        if sent:
+            record_chat_agent(agent_name, "error")
+            raise
+        fallback = await _get_fallback_response(request, f"서비스 일시 중단: {str(e)}")
+        record_chat_agent(agent_name, fallback["status"])
+        yield fallback["answer"]
+        return
+    record_chat_agent(agent_name, "success")
+
+
+@router.post("/chat/stream", summary="의료 AI 채팅 (스트리밍)")
+async def stream_chat_response(request: ChatRequest):
+    """
+    /chat과 동일한 에이전트 라우팅으로 응답을 생성하면서 토큰을 SSE 이벤트로 전달합니다.
+    
+    - **token**: 생성된 텍스트 조각 (`{"text": "..."}`). 복용 약물 성분이 겹치면 첫 조각이 경고 문구
+    - **metadata**: 마지막 이벤트. `/chat` 응답의 `model_metadata`, `user_context`, `safety_warnings`,
+      `contraindications`, `status`
+    - **error**: 생성 실패 시 fallback 응답
+    """
+    prepared = prepare_chat_stream(request)
+    agent_type = prepared["agent_type"]
+    duplicates = prepared["duplicates"]
+    contraindications = prepared["contraindications"]
+
+    async def event_stream():
+        try:
+            async for chunk in stream_answer_chunks(request, prepared):
+                yield _format_sse("token", {"text": chunk})
+        except Exception as e:
+            fallback = await _get_fallback_response(request, f"서비스 일시 중단: {str(e)}")
+            fallback["safety_warnings"] = duplicates
+            fallback["contraindications"] = contraindications
+            record_chat_agent(AGENT_NAMES[agent_type], fallback["status"])
+            yield _format_sse("error", fallback)
+            return
+
+        record_chat_agent(AGENT_NAMES[agent_type], "success")
+
+        yield _format_sse("metadata", {
+            "user_context": {
+                "underlying_diseases": request.underlying_diseases,
+                "medications": request.currentMedications
+            },
+            "model_metadata": build_model_metadata(agent_type, prepared["session_id"], prepared["context_provided"]),
+            "safety_warnings": duplicates,
+            "contraindications": contraindications,
+            "status": "success"
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시 버퍼링 비활성화
+        }
+    )
+
+
+def _batch_group_key(index: int, request: ChatRequest, prepared: Dict[str, Any]) -> Tuple:
+    """같은 답변을 공유할 수 있는 요청끼리 묶기 위한 키를 만듭니다 (prepare_chat() 결과 재사용)"""
+    agent_type = prepared["agent_type"]
+
+    # 캘린더 AI는 요청마다 세션을 만들므로 묶지 않음
+    if agent_type == "add_cal":
+        return (agent_type, index)
+
+    # 에이전트별 생성 파라미터는 고정이므로 에이전트 + 정규화 질문 + 사용자 컨텍스트가 같으면 같은 답변
+    return (agent_type, normalize_question(request.question), prepared["context_text"], request.bypass_cache)
+
+
+async def _run_batch_item(request: ChatRequest, prepared: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict:
+    """배치의 한 그룹을 처리하고 항목별 결과 형식으로 반환합니다"""
+    async with semaphore:
+        timer = start_request_timer()
+        try:
+            result = await answer_chat(request, prepared)
+            if timer is not None:
+                result["debug"] = timer.as_dict()
+            return result
+        except HTTPException as e:
+            return {
+                "status": "error",
+                "error": {"status_code": e.status_code, "detail": e.detail}
+            }
+        except Exception as e:
+            return await _get_fallback_response(request, f"서비스 일시 중단: {str(e)}")
+
+
+@router.post("/chat/batch", summary="의료 AI 배치 채팅")
+async def get_batch_chat_response(request: ChatBatchRequest):
+    """
+    여러 질문을 한 번에 처리합니다. 결과는 요청 순서대로 반환됩니다.
+
+    - 모든 질문을 먼저 분류한 뒤 같은 에이전트/질문/사용자 정보끼리 묶어 한 번만 생성합니다
+    - 그룹들은 `concurrency_limit`개씩 동시에 생성합니다
+    - 항목별 `status`: success, fallback(생성 오류 시 기본 응답), error(대기열 초과 등)
+    """
+    if len(request.items) > settings.CHAT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.CHAT_BATCH_MAX_ITEMS}개까지 요청할 수 있습니다."
+        )
+
+    start_time = time.perf_counter()
+
+    # 1. 항목별 컨텍스트 구성·분류 (한 번만 계산해 그룹 키와 생성에 재사용) 및 그룹화
+    prepared_items = [prepare_chat(item) for item in request.items]
+    groups: Dict[Tuple, List[int]] = {}
+    for index, (item, prepared) in enumerate(zip(request.items, prepared_items)):
+        groups.setdefault(_batch_group_key(index, item, prepared), []).append(index)
+
+    # 2. 그룹별 대표 요청을 동시 실행 수 제한 하에 생성
+    concurrency = min(
+        request.concurrency_limit or settings.CHAT_BATCH_CONCURRENCY,
+        settings.WATSONX_MAX_CONCURRENCY
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    group_indices = list(groups.values())
+    group_results = await asyncio.gather(*[
+        _run_batch_item(request.items[indices[0]], prepared_items[indices[0]], semaphore)
+        for indices in group_indices
+    ])
+
+    # 3. 요청 순서대로 결과 배치 (에이전트별 응답 수는 그룹이 아닌 항목 수로 기록)
+    results: List[Dict] = [None] * len(request.items)
+    for indices, result in zip(group_indices, group_results):
+        record_chat_agent(AGENT_NAMES[prepared_items[indices[0]]["agent_type"]], result["status"], len(indices))
+        for index in indices:
+            results[index] = {"index": index, **result}
+
+    status_counts: Dict[str, int] = {}
+    for result in results:
+        status_counts[result["status"]] = status_counts.get(result["status"], 0) + 1
+
+    return {
+        "results": results,
+        "summary": {
+            "total": len(results),
+            "unique_generations": len(group_indices),
+            "concurrency_limit": concurrency,
+            "status_counts": status_counts,
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 1)
+        }
+    }
+
+
+@router.get("/chat/cache/stats", summary="채팅 답변 캐시 통계")
+async def get_answer_cache_stats():
+    """답변 캐시의 히트/미스 통계를 반환합니다."""
+    return answer_cache.get_stats()
+
+
 @router.get("/health", summary="채팅 서비스 상태 확인")
 async def health_check():
     """IBM Watson 모델 연결 상태를 확인합니다."""
@@ -268,18 +628,13 @@ async def health_check():
         "WATSONX_PROJECT_ID": bool(settings.WATSONX_PROJECT_ID)
     }
 
-    # IBM Watson 모델 연결 테스트
+    # IBM Watson 연결 테스트 (IAM 토큰 발급)
     watson_status = "unknown"
     watson_error = None
 
     try:
-        # Watson 모델 인스턴스 생성 테스트
-        test_model = get_watson_model()
-        if test_model:
-            watson_status = "healthy"
-        else:
-            watson_status = "unavailable"
-            watson_error = "Model instance creation failed"
+        await watsonx_client.get_access_token()
+        watson_status = "healthy"
     except Exception as e:
         watson_status = "error"
         watson_error = str(e)
@@ -290,7 +645,11 @@ async def health_check():
         settings.WATSONX_PROJECT_ID
     ])
 
-    overall_status = "healthy" if watson_status == "healthy" and all_configured else "degraded"
+    breaker_state = watsonx_client.breaker.get_state()
+
+    overall_status = "healthy" if (
+        watson_status == "healthy" and all_configured and breaker_state["state"] == "closed"
+    ) else "degraded"
 
     return {
         "service": "Dr.Watson Chat API",
@@ -299,6 +658,13 @@ async def health_check():
         "watson_model_status": watson_status,
         "watson_error": watson_error,
         "all_configured": all_configured,
-        "model_id": "ibm/granite-3-3-8b-instruct",
+        "model_id": settings.WATSONX_MODEL_ID,
+        "model_pool": watsonx_client.pool.get_stats(),
+        "single_flight": watsonx_client.single_flight.get_stats(),
+        "circuit_breaker": breaker_state,
+        "hedging": {
+            "enabled": settings.WATSONX_HEDGING_ENABLED,
+            **watsonx_client.hedge_stats
+        },
         "message": "IBM Watson 모델이 정상 작동 중입니다." if overall_status == "healthy" else "IBM Watson 설정을 확인하세요."
     }
@@ -1,26 +1,37 @@
 from datetime import datetime
 from typing import Dict, Optional
+from fastapi import HTTPException
 from utils.googleCalender import calendar_agent, text_to_cal_converter
+from utils.intent import KeywordMatcher
 import re
 
 
 class CalendarAI:
     """복약 캘린더 관리를 위한 전문 AI 에이전트"""
+
+    # 복약 관련 키워드
+    MEDICATION_MATCHER = KeywordMatcher({
+        "medication": [
+            '복용', '먹어', '드세요', '정', '알', '캡슐', '시럽', '약',
+            '아침', '점심', '저녁', '식전', '식후', '취침', '하루', '일',
+            '매일', '주간', '개월', '번', '회'
+        ]
+    }, case_insensitive=False)
+
+    # 확인 응답 키워드
+    CONFIRMATION_MATCHER = KeywordMatcher({
+        "positive": ['네', '예', '추가', '맞', '좋', '확인', 'yes', 'ok', '그래'],
+        "negative": ['아니', '취소', '안', '싫', 'no', '됐']
+    })
     
     def __init__(self):
         self.user_sessions = {}  # 사용자별 세션 관리
     
-    def analyze_medication_schedule(self, query: str, user_id: str = "default", user_context: dict = None) -> str:
+    async def analyze_medication_schedule(self, query: str, user_id: str = "default", user_context: dict = None) -> str:
         """복약 스케줄 분석 및 캘린더 추가 제안"""
         
         # 복약 관련 키워드 확인
-        medication_keywords = [
-            '복용', '먹어', '드세요', '정', '알', '캡슐', '시럽', '약', 
-            '아침', '점심', '저녁', '식전', '식후', '취침', '하루', '일',
-            '매일', '주간', '개월', '번', '회'
-        ]
-        
-        has_medication_info = any(keyword in query for keyword in medication_keywords)
+        has_medication_info = self.MEDICATION_MATCHER.matches_any(query, "medication")
         
         if not has_medication_info:
             return """
@@ -45,7 +56,7 @@ class CalendarAI:
         
         # 복약 정보 분석
         try:
-            medication_info = text_to_cal_converter.extract_medication_info(query)
+            medication_info = await text_to_cal_converter.extract_medication_info(query)
             
             # 분석 결과 표시
             analysis_text = f"""
@@ -68,10 +79,13 @@ class CalendarAI:
             
             return analysis_text
             
+        except HTTPException:
+            # 대기열 초과(503) 등은 그대로 전달
+            raise
         except Exception as e:
             return f"복약 정보 분석 중 오류가 발생했습니다: {str(e)}\n다시 시도해 주세요."
     
-    def check_confirmation(self, response: str, user_id: str = "default") -> str:
+    async def check_confirmation(self, response: str, user_id: str = "default") -> str:
         """사용자 확인 응답 처리"""
         
         if user_id not in self.user_sessions:
@@ -82,18 +96,15 @@ class CalendarAI:
         if session['status'] != 'pending_confirmation':
             return "현재 확인 대기 중인 요청이 없습니다."
         
-        # 확인 키워드 체크
-        positive_keywords = ['네', '예', '추가', '맞', '좋', '확인', 'yes', 'ok', '그래']
-        negative_keywords = ['아니', '취소', '안', '싫', 'no', '됐']
-        
-        response_lower = response.lower().strip()
+        # 확인 키워드 체크 (긍정/부정을 한 번에 확인)
+        matches = self.CONFIRMATION_MATCHER.match(response.strip())
         
-        is_positive = any(keyword in response_lower for keyword in positive_keywords)
-        is_negative = any(keyword in response_lower for keyword in negative_keywords)
+        is_positive = "positive" in matches
+        is_negative = "negative" in matches
         
         if is_positive and not is_negative:
             # 캘린더 추가 실행
-            return self.process_calendar_addition(user_id)
+            return await self.process_calendar_addition(user_id)
         elif is_negative:
             # 취소 처리
             del self.user_sessions[user_id]
@@ -106,7 +117,7 @@ class CalendarAI:
 - 취소하시려면: **"아니요, 취소합니다"**
 """
     
-    def process_calendar_addition(self, user_id: str = "default") -> str:
+    async def process_calendar_addition(self, user_id: str = "default") -> str:
         """실제 캘린더 추가 처리"""
         
         if user_id not in self.user_sessions:
@@ -117,7 +128,7 @@ class CalendarAI:
         
         try:
             # 캘린더 에이전트를 통해 일정 추가
-            result = calendar_agent.process_medication_request(medication_text)
+            result = await calendar_agent.process_medication_request(user_id, medication_text)
             
             # 세션 정리
             del self.user_sessions[user_id]
@@ -174,15 +185,15 @@ class CalendarAI:
 잠시 후 다시 시도하시거나 관리자에게 문의해 주세요.
 """
     
-    def handle_calendar_request(self, query: str, user_id: str = "default", user_context: dict = None) -> str:
+    async def handle_calendar_request(self, query: str, user_id: str = "default", user_context: dict = None) -> str:
         """캘린더 요청 통합 처리"""
         
         # 현재 확인 대기 중인 세션이 있는지 확인
         if user_id in self.user_sessions and self.user_sessions[user_id]['status'] == 'pending_confirmation':
-            return self.check_confirmation(query, user_id)
+            return await self.check_confirmation(query, user_id)
         
         # 새로운 복약 정보 분석
-        return self.analyze_medication_schedule(query, user_id, user_context)
+        return await self.analyze_medication_schedule(query, user_id, user_context)
     
     def get_upcoming_schedules(self, days: int = 7) -> str:
         """다가오는 복약 일정 조회"""
@@ -1,32 +1,72 @@
-import httpx
-from ibm_watson_machine_learning.foundation_models import Model
 from ibm_watson_machine_learning.metanames import GenTextParamsMetaNames as GenParams
+from utils.watsonx import watsonx_client, CircuitOpenError
+from utils.cache import answer_cache
+from utils.drug_kb import drug_kb
+from utils.rag import passage_retriever
 from core.config import settings
-from typing import Optional
+from core.timing import timed_stage
+from typing import AsyncIterator
+from fastapi import HTTPException
 
 
 class ExplainAI:
     """약물 정보 설명을 위한 전문 AI 에이전트"""
     
-    def __init__(self):
-        self._model: Optional[Model] = None
+    # 생성 파라미터
+    GENERATION_PARAMS = {
+        GenParams.MAX_NEW_TOKENS: 400,
+        GenParams.TEMPERATURE: 0.2,  # 정확한 정보를 위해 낮은 온도
+        GenParams.REPETITION_PENALTY: 1.1
+    }
     
-    def get_model(self) -> Model:
-        """IBM Watson 모델 인스턴스를 반환합니다"""
-        if self._model is None:
-            creds = {
-                "url": settings.WATSONX_API_URL,
-                "apikey": settings.WATSONX_API_KEY
-            }
-            self._model = Model(
-                model_id='ibm/granite-3-3-8b-instruct',
-                credentials=creds,
-                project_id=settings.WATSONX_PROJECT_ID
-            )
-        return self._model
+    # 근거 자료에 넣을 필드 (라벨, 레코드 키)
+    REFERENCE_FIELDS = [
+        ("주성분", "ingredients"),
+        ("효능", "efficacy"),
+        ("사용법", "usage"),
+        ("주의사항", "precautions"),
+        ("상호작용", "interactions"),
+        ("이상반응", "adverse_reactions"),
+        ("보관법", "storage")
+    ]
     
-    def explain_medication(self, query: str, user_context: dict = None) -> str:
-        """약물에 대한 상세한 설명을 제공합니다"""
+    def find_reference_drugs(self, query: str, user_context: dict = None) -> list:
+        """질문과 복용 약물에 언급된 제품을 지식 베이스에서 찾습니다 (질문에 나온 약 우선)"""
+        if not settings.DRUG_KB_ENABLED:
+            return []
+        
+        limit = settings.DRUG_KB_GROUNDING_MAX_DRUGS
+        drugs = drug_kb.find_mentions(query, limit=limit)
+        if user_context and user_context.get('currentMedications') and len(drugs) < limit:
+            # 질문에 나온 약을 먼저, 남는 자리에 현재 복용 약물을 채움
+            names = {drug['name'] for drug in drugs}
+            for drug in drug_kb.find_mentions(" ".join(user_context['currentMedications']), limit=limit):
+                if drug['name'] not in names and len(drugs) < limit:
+                    drugs.append(drug)
+        return drugs
+    
+    def build_reference(self, query: str, user_context: dict = None, drugs: list = None) -> str:
+        """질문과 복용 약물에 언급된 제품의 허가 정보를 지식 베이스에서 찾아 근거 자료로 만듭니다"""
+        if drugs is None:
+            drugs = self.find_reference_drugs(query, user_context)
+        if not drugs:
+            return ""
+        
+        max_chars = settings.DRUG_KB_GROUNDING_MAX_CHARS
+        sections = []
+        for drug in drugs:
+            lines = [f"[{drug['name']}]"]
+            for label, field in self.REFERENCE_FIELDS:
+                value = drug.get(field)
+                if isinstance(value, list):
+                    value = ", ".join(value)
+                if value:
+                    lines.append(f"- {label}: {value[:max_chars]}")
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+    
+    def build_prompt(self, query: str, user_context: dict = None) -> str:
+        """에이전트 프롬프트를 구성합니다"""
         
         context_text = ""
         if user_context:
@@ -35,7 +75,20 @@ class ExplainAI:
             if user_context.get('currentMedications'):
                 context_text += f"현재 복용약물: {', '.join(user_context['currentMedications'])}\n"
         
-        prompt = f"""
+        drugs = self.find_reference_drugs(query, user_context)
+        reference = self.build_reference(query, user_context, drugs)
+        reference_text = f"""참고 자료 (식약처 허가 정보, 이 내용을 우선 근거로 사용하세요):
+{reference}
+""" if reference else ""
+        
+        # 참고 자료에 이미 들어간 제품은 빼고 관련 문단을 검색
+        passages = passage_retriever.build_reference(query, exclude_names=[drug['name'] for drug in drugs])
+        passage_text = f"""관련 자료 (질문과 비슷한 의약품 설명 문단):
+{passages}
+""" if passages else ""
+        grounding_text = "\n".join(text for text in (reference_text, passage_text) if text)
+        
+        return f"""
 당신은 약물 정보 전문가입니다. 다음 지침에 따라 약물에 대해 상세히 설명해주세요:
 
 지침:
@@ -47,25 +100,63 @@ class ExplainAI:
 
 환자 정보:
 {context_text}
-
+{grounding_text}
 질문: {query}
 
 위 정보를 바탕으로 약물에 대해 상세하고 정확한 설명을 제공해주세요:
 """
+    
+    async def explain_medication(self, query: str, user_context: dict = None, use_cache: bool = True) -> str:
+        """약물에 대한 상세한 설명을 제공합니다"""
+        cache_key = answer_cache.make_key("explain", query, user_context, self.GENERATION_PARAMS)
+        if use_cache:
+            cached_answer = await answer_cache.get(cache_key)
+            if cached_answer is not None:
+                return cached_answer
+        else:
+            answer_cache.record_bypass()
+        
+        with timed_stage("prompt"):
+            prompt = self.build_prompt(query, user_context)
         
         try:
-            model = self.get_model()
-            response = model.generate(
+            response = await watsonx_client.generate(
                 prompt=prompt,
-                params={
-                    GenParams.MAX_NEW_TOKENS: 400,
-                    GenParams.TEMPERATURE: 0.2,  # 정확한 정보를 위해 낮은 온도
-                    GenParams.REPETITION_PENALTY: 1.1
-                }
+                params=self.GENERATION_PARAMS
             )
-            return response['results'][0]['generated_text'].strip()
+            answer = response['results'][0]['generated_text'].strip()
+            await answer_cache.set(cache_key, answer)
+            return answer
+        except (HTTPException, CircuitOpenError):
+            # 대기열 초과(503), 서킷 차단 등은 그대로 전달
+            raise
         except Exception as e:
             return f"약물 정보 조회 중 오류가 발생했습니다. 약사나 의사와 직접 상담하시기 바랍니다. 오류: {str(e)}"
+    
+    async def stream_explanation(self, query: str, user_context: dict = None, use_cache: bool = True) -> AsyncIterator[str]:
+        """약물 설명을 생성되는 대로 조각 단위로 반환합니다"""
+        cache_key = answer_cache.make_key("explain", query, user_context, self.GENERATION_PARAMS)
+        if use_cache:
+            cached_answer = await answer_cache.get(cache_key)
+            if cached_answer is not None:
+                yield cached_answer
+                return
+        else:
+            answer_cache.record_bypass()
+        
+        prompt = self.build_prompt(query, user_context)
+        
+        try:
+            chunks = []
+            async for chunk in watsonx_client.generate_text_stream(prompt, self.GENERATION_PARAMS):
+                chunks.append(chunk)
+                yield chunk
+            await answer_cache.set(cache_key, ''.join(chunks).strip())
+        except (HTTPException, CircuitOpenError):
+            # 대기열 초과(503), 서킷 차단 등은 그대로 전달
+            raise
+        except Exception as e:
+            yield f"약물 정보 조회 중 오류가 발생했습니다. 약사나 의사와 직접 상담하시기 바랍니다. 오류: {str(e)}"
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,78 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from core.config import settings
+from utils.drug_kb import drug_kb
+from utils.intent import KeywordMatcher
+
+
+class FaqAI:
+    """자주 묻는 의약품 질문(효능/복용법/보관법)을 LLM 없이 데이터셋으로 답하는 에이전트
+
+    질문에 제품명 하나와 FAQ 의도 하나가 있을 때만 답하고, 부작용·상호작용·일정 등록처럼
+    판단이 필요한 질문은 None을 반환해 기존 에이전트로 넘깁니다.
+    """
+
+    # FAQ 의도별 키워드 (띄어쓰기를 뺀 질문과 비교)
+    INTENT_MATCHER = KeywordMatcher({
+        "efficacy": [
+            '효능', '효과', '뭐에좋', '어디에좋', '무슨약', '뭐하는약', '어떤약',
+            '어디에써', '어디에쓰', '용도', '적응증'
+        ],
+        "usage": [
+            '복용법', '복용방법', '용법', '용량', '사용법', '사용방법', '어떻게먹', '어떻게복용',
+            '어떻게사용', '먹는법', '먹는방법', '몇알', '몇정', '몇번먹', '얼마나먹', '언제먹'
+        ],
+        "storage": ['보관', '유효기간', '유통기한'],
+        # 아래 키워드가 있으면 FAQ로 답하지 않음 (안전성 판단, 병용, 일정 등록)
+        "exclude": [
+            '부작용', '위험', '주의', '경고', '안전', '금기', '독성', '과량', '응급', '알레르기',
+            '상호작용', '임신', '임산부', '수유', '같이', '함께', '대신', '술', '일정', '캘린더',
+            '알림', '스케줄', '추가', '등록'
+        ]
+    })
+
+    # 의도별 (레코드 필드, 답변 제목)
+    FIELDS = {
+        "efficacy": ("efficacy", "효능·효과"),
+        "usage": ("usage", "용법·용량"),
+        "storage": ("storage", "보관 방법")
+    }
+
+    DISCLAIMER = "이는 일반적인 정보이며, 개인별 상황에 따라 다를 수 있으므로 반드시 의사나 약사와 상담하세요."
+
+    def match(self, query: str) -> Optional[Tuple[str, Dict]]:
+        """FAQ로 답할 수 있는 질문이면 (의도, 제품 레코드)를 반환합니다"""
+        if not settings.DRUG_KB_ENABLED or not query:
+            return None
+
+        matches = self.INTENT_MATCHER.match(re.sub(r"\s+", "", query))
+        intents = [intent for intent in self.FIELDS if intent in matches]
+        if "exclude" in matches or len(intents) != 1:
+            return None
+
+        # 제품이 둘 이상이면 비교 질문이므로 기존 에이전트로
+        drugs = drug_kb.find_mentions(query, limit=2)
+        if len(drugs) != 1:
+            return None
+
+        intent = intents[0]
+        if not drugs[0].get(self.FIELDS[intent][0]):
+            return None
+        return intent, drugs[0]
+
+    def render(self, intent: str, drug: Dict, user_context: dict = None) -> str:
+        """match()가 찾은 (의도, 제품 레코드)로 데이터셋 답변을 만듭니다"""
+        field, title = self.FIELDS[intent]
+        lines = [f"[{drug['name']}] {title} (식약처 허가 정보)", drug[field]]
+        if intent != "storage" and drug.get("ingredients"):
+            lines.append(f"주성분: {', '.join(drug['ingredients'])}")
+        if user_context and (user_context.get('underlying_diseases') or user_context.get('currentMedications')):
+            lines.append("기저질환이나 복용 중인 약이 있으면 복용 전에 의사나 약사에게 먼저 확인하세요.")
+        lines.append("")
+        lines.append(self.DISCLAIMER)
+        return "\n".join(lines)
+
+
+# 싱글톤 인스턴스
+faq_ai = FaqAI()
@@ -1,41 +1,59 @@
-import httpx
-from ibm_watson_machine_learning.foundation_models import Model
 from ibm_watson_machine_learning.metanames import GenTextParamsMetaNames as GenParams
-from core.config import settings
-from typing import Optional
+from utils.watsonx import watsonx_client, CircuitOpenError
+from utils.cache import answer_cache
+from utils.drug_kb import format_contraindications
+from utils.rag import passage_retriever
+from core.timing import timed_stage
+from typing import AsyncIterator
+from fastapi import HTTPException
 
 
 class WarnAI:
     """약물 안전성 및 경고 정보를 위한 전문 AI 에이전트"""
     
-    def __init__(self):
-        self._model: Optional[Model] = None
+    # 생성 파라미터
+    GENERATION_PARAMS = {
+        GenParams.MAX_NEW_TOKENS: 400,
+        GenParams.TEMPERATURE: 0.1,  # 안전 정보는 매우 보수적으로
+        GenParams.REPETITION_PENALTY: 1.1
+    }
     
-    def get_model(self) -> Model:
-        """IBM Watson 모델 인스턴스를 반환합니다"""
-        if self._model is None:
-            creds = {
-                "url": settings.WATSONX_API_URL,
-                "apikey": settings.WATSONX_API_KEY
-            }
-            self._model = Model(
-                model_id='ibm/granite-3-3-8b-instruct',
-                credentials=creds,
-                project_id=settings.WATSONX_PROJECT_ID
-            )
-        return self._model
-    
-    def check_safety_warnings(self, query: str, user_context: dict = None) -> str:
-        """약물 안전성 및 부작용에 대한 경고 정보를 제공합니다"""
+    def build_prompt(self, query: str, user_context: dict = None) -> str:
+        """에이전트 프롬프트를 구성합니다
+
+        성분 중복(duplicate_ingredients)과 금기·상호작용(contraindications)은 채팅 라우터가
+        답변 앞 경고와 응답 필드용으로 이미 계산해 user_context에 넣어 둔 값을 그대로 씁니다.
+        """
+        user_context = user_context or {}
         
         context_text = ""
-        if user_context:
-            if user_context.get('underlying_diseases'):
-                context_text += f"기저질환: {', '.join(user_context['underlying_diseases'])}\n"
-            if user_context.get('currentMedications'):
-                context_text += f"현재 복용약물: {', '.join(user_context['currentMedications'])}\n"
+        if user_context.get('underlying_diseases'):
+            context_text += f"기저질환: {', '.join(user_context['underlying_diseases'])}\n"
+        if user_context.get('currentMedications'):
+            context_text += f"현재 복용약물: {', '.join(user_context['currentMedications'])}\n"
         
-        prompt = f"""
+        # 복용 약물 성분 중복은 데이터셋으로 확인된 사실로 전달
+        duplicate_text = ""
+        duplicates = user_context.get('duplicate_ingredients')
+        if duplicates:
+            lines = [
+                f"- {', '.join(d['medications'])}: 모두 '{d['ingredient']}' 성분 포함 ({', '.join(d['products'])})"
+                for d in duplicates
+            ]
+            duplicate_text = "확인된 성분 중복 (경고 문구는 이미 표시됨, 과량 복용 위험을 구체적으로 설명하세요):\n" + "\n".join(lines) + "\n"
+        
+        # 질환 금기·약물 상호작용은 규칙 엔진으로 확인된 사실로 전달
+        findings = user_context.get('contraindications')
+        rule_text = f"""확인된 금기·상호작용 (허가 정보와 약물 계열 규칙 기준, 빠짐없이 설명하세요):
+{format_contraindications(findings)}
+""" if findings else ""
+        
+        passages = passage_retriever.build_reference(query)
+        passage_text = f"""관련 자료 (질문과 비슷한 의약품 설명 문단, 허가 정보의 주의사항/상호작용/이상반응):
+{passages}
+""" if passages else ""
+        
+        return f"""
 당신은 약물 안전성 전문가입니다. 다음 지침에 따라 약물의 안전성과 경고사항을 설명해주세요:
 
 지침:
@@ -49,25 +67,63 @@ class WarnAI:
 
 환자 정보:
 {context_text}
-
+{duplicate_text}{rule_text}{passage_text}
 질문: {query}
 
 위 정보를 바탕으로 약물의 안전성과 주의사항을 상세히 설명해주세요:
 """
+    
+    async def check_safety_warnings(self, query: str, user_context: dict = None, use_cache: bool = True) -> str:
+        """약물 안전성 및 부작용에 대한 경고 정보를 제공합니다"""
+        cache_key = answer_cache.make_key("warn", query, user_context, self.GENERATION_PARAMS)
+        if use_cache:
+            cached_answer = await answer_cache.get(cache_key)
+            if cached_answer is not None:
+                return cached_answer
+        else:
+            answer_cache.record_bypass()
+        
+        with timed_stage("prompt"):
+            prompt = self.build_prompt(query, user_context)
         
         try:
-            model = self.get_model()
-            response = model.generate(
+            response = await watsonx_client.generate(
                 prompt=prompt,
-                params={
-                    GenParams.MAX_NEW_TOKENS: 400,
-                    GenParams.TEMPERATURE: 0.1,  # 안전 정보는 매우 보수적으로
-                    GenParams.REPETITION_PENALTY: 1.1
-                }
+                params=self.GENERATION_PARAMS
             )
-            return response['results'][0]['generated_text'].strip()
+            answer = response['results'][0]['generated_text'].strip()
+            await answer_cache.set(cache_key, answer)
+            return answer
+        except (HTTPException, CircuitOpenError):
+            # 대기열 초과(503), 서킷 차단 등은 그대로 전달
+            raise
         except Exception as e:
             return f"안전성 정보 조회 중 오류가 발생했습니다. 즉시 의료진과 상담하시기 바랍니다. 응급상황이라면 119에 신고하세요. 오류: {str(e)}"
+    
+    async def stream_safety_warnings(self, query: str, user_context: dict = None, use_cache: bool = True) -> AsyncIterator[str]:
+        """안전성 경고를 생성되는 대로 조각 단위로 반환합니다"""
+        cache_key = answer_cache.make_key("warn", query, user_context, self.GENERATION_PARAMS)
+        if use_cache:
+            cached_answer = await answer_cache.get(cache_key)
+            if cached_answer is not None:
+                yield cached_answer
+                return
+        else:
+            answer_cache.record_bypass()
+        
+        prompt = self.build_prompt(query, user_context)
+        
+        try:
+            chunks = []
+            async for chunk in watsonx_client.generate_text_stream(prompt, self.GENERATION_PARAMS):
+                chunks.append(chunk)
+                yield chunk
+            await answer_cache.set(cache_key, ''.join(chunks).strip())
+        except (HTTPException, CircuitOpenError):
+            # 대기열 초과(503), 서킷 차단 등은 그대로 전달
+            raise
+        except Exception as e:
+            yield f"안전성 정보 조회 중 오류가 발생했습니다. 즉시 의료진과 상담하시기 바랍니다. 응급상황이라면 119에 신고하세요. 오류: {str(e)}"
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, HTTPException, Query
+import time
+
+from core.config import settings
+from schemas.drug import DrugSafetyCheckRequest
+from utils.drug_kb import drug_kb, contraindication_engine
+
+# APIRouter 인스턴스 생성
+router = APIRouter()
+
+
+# 지식 베이스를 적재하는 중일 때 503 응답의 Retry-After (초)
+_LOADING_RETRY_AFTER = 5
+
+
+def _require_knowledge_base():
+    """지식 베이스가 비활성화되었거나, 적재 중이거나, 데이터가 없으면 503을 반환합니다"""
+    if not settings.DRUG_KB_ENABLED:
+        raise HTTPException(status_code=503, detail="의약품 지식 베이스가 비활성화되어 있습니다.")
+    if not drug_kb.ensure_loaded():
+        raise HTTPException(
+            status_code=503,
+            detail="의약품 지식 베이스를 적재하는 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(_LOADING_RETRY_AFTER)}
+        )
+    if not drug_kb.get_stats().get("records"):
+        raise HTTPException(status_code=503, detail="의약품 데이터가 적재되지 않았습니다.")
+
+
+@router.get("/drugs/kb/stats", summary="의약품 지식 베이스 통계")
+async def get_drug_kb_stats():
+    """적재된 레코드 수, 인덱스 크기, 적재 시간(load_ms)을 반환합니다."""
+    return drug_kb.get_stats()
+
+
+@router.get("/drugs/suggest", summary="의약품 이름 자동완성")
+async def suggest_drug_names(
+    q: str = Query(..., min_length=1, max_length=50, description="입력 중인 제품명/성분명 또는 초성 (예: ㅌㅇㄹㄴ)"),
+    limit: int = Query(default=10, ge=1, le=50, description="최대 결과 수")
+):
+    """
+    제품명·성분명을 접두어로 찾아 짧은 이름부터 반환합니다 (복용 약물 입력 자동완성용).
+
+    - 초성 검색: `ㅌㅇㄹㄴ` → 타이레놀..., 초성과 완성 글자를 섞어도 됩니다 (`타ㅇㄹ`)
+    - 각 결과의 `type`은 `product`(제품) 또는 `ingredient`(성분)입니다
+    """
+    _require_knowledge_base()
+
+    start = time.perf_counter()
+    suggestions = drug_kb.suggest(q, limit=limit)
+    lookup_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    return {
+        "query": q,
+        "count": len(suggestions),
+        "suggestions": suggestions,
+        "lookup_ms": lookup_ms
+    }
+
+
+@router.post("/drugs/safety-check", summary="금기·상호작용 확인")
+async def check_drug_safety(request: DrugSafetyCheckRequest):
+    """
+    복용 약물의 질환 금기와 약물 간 상호작용을 규칙으로 확인합니다. LLM을 호출하지 않습니다.
+
+    - **type**: `disease`(기저질환 금기) 또는 `interaction`(약물 간 상호작용)
+    - **severity**: `contraindicated`(복용 금지) 또는 `caution`(의사·약사와 상의)
+    - **source**: `curated`(약물 계열 규칙 표) 또는 `dataset`(허가 정보 주의사항/상호작용 문장, `evidence`에 원문)
+    - **ingredient**: 해당 약의 유효성분, **matched_by**/**matched_term**: 규칙이 걸린 항목
+      (`product` 제품명, `ingredient` 성분명, `group` 약물 계열)
+
+    심각한 항목부터 반환합니다. 같은 성분이 겹치는 경우는 `/chat`의 `safety_warnings`로 안내합니다.
+    """
+    _require_knowledge_base()
+    if not settings.DRUG_KB_RULES_ENABLED:
+        raise HTTPException(status_code=503, detail="금기·상호작용 규칙이 비활성화되어 있습니다.")
+    if not contraindication_engine.ensure_loaded():
+        # 빈 결과를 "금기 없음"으로 오해하지 않도록 준비될 때까지 503
+        raise HTTPException(
+            status_code=503,
+            detail="금기·상호작용 규칙을 준비하는 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(_LOADING_RETRY_AFTER)}
+        )
+
+    start = time.perf_counter()
+    findings = contraindication_engine.check(request.medications, request.underlying_diseases, request.question)
+    lookup_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    return {
+        "count": len(findings),
+        "contraindications": findings,
+        "lookup_ms": lookup_ms
+    }
+
+
+@router.get("/drugs/{name}", summary="의약품 정보 조회")
+async def get_drug(name: str, limit: int = Query(default=20, ge=1, le=100, description="최대 결과 수")):
+    """
+    제품명 또는 성분명으로 의약품 정보를 조회합니다. LLM을 호출하지 않습니다.
+
+    조회 순서 (`match_type`):
+    - **exact**: 제품명 원문 일치
+    - **normalized**: 괄호/공백/기호를 뺀 제품명 일치 (예: 게보린정 → 게보린정(수출명:돌로린정))
+    - **alias**: 함량·제형을 뺀 기본 이름 일치 (예: 타이레놀 → 타이레놀정500밀리그람)
+    - **ingredient**: 해당 성분이 들어 있는 제품 목록
+    """
+    _require_knowledge_base()
+
+    start = time.perf_counter()
+    match_type, results = drug_kb.lookup(name, limit=limit)
+    lookup_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    if not results:
+        raise HTTPException(status_code=404, detail=f"'{name}'에 해당하는 의약품 정보를 찾을 수 없습니다.")
+
+    return {
+        "query": name,
+        "match_type": match_type,
+        "count": len(results),
+        "results": results,
+        "lookup_ms": lookup_ms
+    }
@@ -3,6 +3,7 @@ from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from pydantic import BaseModel, EmailStr
 from typing import List
 from core.config import settings
+from core.metrics import track_upstream
 import os
 
 
@@ -16,9 +17,9 @@ conf = ConnectionConfig(
     MAIL_USERNAME=settings.MAIL_USERNAME,
     MAIL_PASSWORD=settings.MAIL_PASSWORD,
     MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=587,
-    MAIL_SERVER="smtp.gmail.com",  # Gmail SMTP 서버
-    MAIL_STARTTLS=True,
+    MAIL_PORT=settings.MAIL_PORT,
+    MAIL_SERVER=settings.MAIL_SERVER,  # 기본값: Gmail SMTP 서버
+    MAIL_STARTTLS=settings.MAIL_STARTTLS,
     MAIL_SSL_TLS=False,
     USE_CREDENTIALS=True,
     VALIDATE_CERTS=False  # SSL 검증 비활성화로 시도
@@ -89,7 +90,8 @@ IBM_DoctorAI 팀 드림
     fm = FastMail(conf)
     
     try:
-        await fm.send_message(message)
+        with track_upstream("smtp", "send_message"):
+            await fm.send_message(message)
         return {
             "message": "AI 상담 결과 이메일 전송 성공",
             "recipient": email_request.recipient,
@@ -164,7 +166,8 @@ IBM_DoctorAI 팀 드림
     fm = FastMail(conf)
     
     try:
-        await fm.send_message(message)
+        with track_upstream("smtp", "send_message"):
+            await fm.send_message(message)
         return {
             "message": "AI 상담 결과 다중 이메일 전송 성공", 
             "recipient_count": len(email_request.recipients),
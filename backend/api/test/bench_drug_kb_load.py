@@ -0,0 +1,107 @@
+"""
+의약품 지식 베이스 적재 벤치마크 (워커별 적재 시간과 메모리)
+uvicorn 워커처럼 프로세스 N개를 동시에 띄워 원본 CSV 파싱과 컴파일된 바이너리(mmap) 적재를 비교합니다.
+모든 워커가 적재를 마친 상태에서 각 워커의 RSS와 PSS(공유 페이지를 워커 수로 나눈 값)를 잽니다.
+
+실행: python api/test/bench_drug_kb_load.py [워커 수]
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+# 프로젝트 루트 경로를 sys.path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))  # api/test/
+api_dir = os.path.dirname(current_dir)                   # api/
+backend_dir = os.path.dirname(api_dir)                   # backend/
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)  # 설정의 상대 경로(데이터셋 위치) 기준
+
+
+def memory_kb(pid: str = "self") -> dict:
+    """/proc에서 RSS(전체/익명/파일)와 PSS를 읽습니다 (kB)"""
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                values[key] = int(value.split()[0])
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                values["Pss"] = int(line.split()[1])
+    return values
+
+
+def worker(binary_path: str):
+    """워커 하나: 적재 후 부모의 신호를 기다렸다가 메모리를 보고"""
+    from core.config import settings
+    settings.DRUG_KB_AUTO_COMPILE = False
+    from utils.drug_kb import DrugKnowledgeBase
+
+    before = memory_kb()
+    kb = DrugKnowledgeBase(binary_path=binary_path)
+    stats = kb.load()
+    # 실제 요청처럼 조회 몇 번 (mmap 페이지를 건드림)
+    kb.lookup("타이레놀")
+    kb.correct_drug_names("타이레롤 먹었는데 개보린이랑 같이 먹어도 돼요?")
+    kb.suggest("ㅌㅇㄹ")
+
+    print("ready", flush=True)
+    sys.stdin.readline()  # 모든 워커가 적재를 마칠 때까지 대기
+    after = memory_kb()
+    print(json.dumps({
+        "storage": stats["storage"],
+        "load_ms": stats["load_ms"],
+        **{key: after[key] - before[key] for key in ("VmRSS", "RssAnon", "RssFile")},
+        "total_rss": after["VmRSS"],
+        "total_pss": after["Pss"]
+    }), flush=True)
+
+
+def run(workers: int, binary_path: str) -> list:
+    processes = [
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", binary_path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        while process.stdout.readline().strip() != "ready":
+            pass
+    results = []
+    for process in processes:
+        process.stdin.write("go\n")
+        process.stdin.flush()
+        results.append(json.loads(process.stdout.readline()))
+        process.wait()
+    return results
+
+
+def main():
+    from core.config import settings
+    from utils.drug_kb.etl import compile_drug_kb
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    compile_drug_kb(settings.DRUG_KB_DATA_DIR, settings.DRUG_KB_BINARY_PATH)
+    print(f"바이너리 크기 {os.path.getsize(settings.DRUG_KB_BINARY_PATH) / 1024 / 1024:.2f}MB, 워커 {workers}개\n")
+
+    print(f"{'방식':<14} | {'적재(평균)':>9} | {'RSS 증가':>8} | {'워커 전용(익명)':>10} | {'공유(파일)':>8} | {'워커 PSS 합계':>10}")
+    print("-" * 86)
+    for label, binary_path in (("원본 CSV 파싱", ""), ("바이너리 mmap", settings.DRUG_KB_BINARY_PATH)):
+        results = run(workers, binary_path)
+        average = {key: sum(r[key] for r in results) / len(results)
+                   for key in ("load_ms", "VmRSS", "RssAnon", "RssFile")}
+        print(f"{label:<14} | {average['load_ms']:>7.1f}ms | {average['VmRSS'] / 1024:>6.1f}MB | "
+              f"{average['RssAnon'] / 1024:>13.1f}MB | {average['RssFile'] / 1024:>8.1f}MB | "
+              f"{sum(r['total_pss'] for r in results) / 1024:>10.1f}MB")
+    print("\n워커 PSS 합계: 공유 페이지를 나눠 계산한 전체 워커 메모리 (인터프리터/라이브러리 포함)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--worker":
+        worker(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,80 @@
+"""
+의약품 이름 자동완성 벤치마크
+실제 제품명/성분명에서 뽑은 접두어·초성 질의로 suggest()의 지연(p50/p99)과 메모리 사용량을 측정합니다.
+
+실행: python api/test/bench_drug_suggest.py
+"""
+
+import sys
+import os
+import time
+import random
+import tracemalloc
+
+# 프로젝트 루트 경로를 sys.path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))  # api/test/
+api_dir = os.path.dirname(current_dir)                   # api/
+backend_dir = os.path.dirname(api_dir)                   # backend/
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)  # 설정의 상대 경로(데이터셋 위치) 기준
+
+from utils.drug_kb import drug_kb, DrugNameSuggester, to_chosung, normalize_ingredient
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def build_queries(names, count: int, rng: random.Random):
+    """이름 앞부분 1~5글자를 완성형/초성/혼합 형태로 만든 질의"""
+    queries = []
+    for _ in range(count):
+        key = normalize_ingredient(rng.choice(names))
+        prefix = key[:rng.randint(1, min(5, len(key)))]
+        style = rng.random()
+        if style < 0.2:
+            prefix = to_chosung(prefix)
+        elif style < 0.3:
+            prefix = prefix[:-1] + to_chosung(prefix[-1])
+        queries.append(prefix)
+    return queries
+
+
+def main():
+    drug_kb.load()
+    names = [record["name"] for record in drug_kb.iter_records()]
+    entries = [(name, "product") for name in names]
+
+    tracemalloc.start()
+    suggester = DrugNameSuggester(entries)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"이름 {len(suggester):,}개, 자동완성 인덱스 약 {current / 1024 / 1024:.2f}MB")
+
+    rng = random.Random(42)
+    queries = build_queries(names, 50_000, rng)
+
+    # 워밍업
+    for query in queries[:1000]:
+        drug_kb.suggest(query)
+
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        t = time.perf_counter()
+        drug_kb.suggest(query)
+        latencies.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - start
+
+    print(f"질의 {len(queries):,}개: p50 {percentile(latencies, 0.5):.3f}ms | "
+          f"p99 {percentile(latencies, 0.99):.3f}ms | max {max(latencies):.3f}ms")
+    print(f"처리량 {len(queries) / elapsed:,.0f} QPS (단일 스레드, HTTP 처리 제외)")
+
+    print()
+    for query in ("ㅌㅇㄹㄴ", "타ㅇㄹ", "게보", "아세트"):
+        print(f"{query} → {[s['name'] for s in drug_kb.suggest(query, limit=3)]}")
+
+
+if __name__ == "__main__":
+    main()
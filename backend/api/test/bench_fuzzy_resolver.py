@@ -0,0 +1,113 @@
+"""
+약 이름 오타 교정 벤치마크
+SymSpell 방식 삭제 사전(FuzzyNameResolver.lookup)과 사전 전체를 비교하는 Levenshtein 검색의
+지연과 결과를 비교합니다. 질의는 실제 약 이름의 자모를 무작위로 1~2개 바꿔 만듭니다.
+
+실행: python api/test/bench_fuzzy_resolver.py
+"""
+
+import sys
+import os
+import time
+import random
+
+# 프로젝트 루트 경로를 sys.path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))  # api/test/
+api_dir = os.path.dirname(current_dir)                   # api/
+backend_dir = os.path.dirname(api_dir)                   # backend/
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)  # 설정의 상대 경로(데이터셋 위치) 기준
+
+from utils.drug_kb import drug_kb
+from utils.drug_kb.fuzzy import to_jamo
+
+_HANGUL_BASE = 0xAC00
+
+
+def levenshtein(a: str, b: str) -> int:
+    """제한 없는 Levenshtein 거리 (기준 구현)"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def mangle(word: str, rng: random.Random, edits: int) -> str:
+    """한글 음절의 초성/중성/종성 중 하나를 바꿔 음성 인식/OCR 오류를 흉내 냅니다"""
+    chars = list(word)
+    positions = [i for i, ch in enumerate(chars) if 0 <= ord(ch) - _HANGUL_BASE < 11172]
+    for index in rng.sample(positions, min(edits, len(positions))):
+        code = ord(chars[index]) - _HANGUL_BASE
+        cho, jung, jong = code // 588, code % 588 // 28, code % 28
+        part = rng.randrange(3)
+        if part == 0:
+            cho = rng.randrange(19)
+        elif part == 1:
+            jung = rng.randrange(21)
+        else:
+            jong = rng.randrange(28)
+        chars[index] = chr(_HANGUL_BASE + cho * 588 + jung * 28 + jong)
+    return "".join(chars)
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    drug_kb.load()
+    resolver = drug_kb._fuzzy
+    stats = drug_kb.get_stats()
+    print(f"사전 {stats['fuzzy_terms']:,}개, 삭제 문자열 {stats['fuzzy_delete_entries']:,}개")
+
+    rng = random.Random(42)
+    words = [key for key in resolver._keys if len(key) >= 4]
+    queries = []
+    for _ in range(300):
+        word = rng.choice(words)
+        queries.append((word, mangle(word, rng, rng.choice((1, 1, 2)))))
+
+    symspell_ms, bounded_ms, full_ms = [], [], []
+    found = agree = 0
+    lexicon = list(zip(resolver._keys, resolver._jamo))
+    for original, query in queries:
+        start = time.perf_counter()
+        results = resolver.lookup(query, limit=1)
+        symspell_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        expected = resolver.brute_force_lookup(query, limit=1)
+        bounded_ms.append((time.perf_counter() - start) * 1000)
+
+        if len(full_ms) < 30:
+            start = time.perf_counter()
+            jamo = to_jamo(query)
+            min(lexicon, key=lambda term: levenshtein(jamo, term[1]))
+            full_ms.append((time.perf_counter() - start) * 1000)
+
+        found += bool(results) and results[0]["key"] == original
+        agree += [r["distance"] for r in results] == [r["distance"] for r in expected]
+
+    print(f"질의 {len(queries)}개 (자모 1~2개 오류), 원래 이름 복원 {found / len(queries):.1%}, "
+          f"전체 비교와 거리 일치 {agree / len(queries):.1%}")
+    print(f"{'방식':<28} | {'p50':>9} | {'p99':>9}")
+    print("-" * 54)
+    for name, values in (("삭제 사전 (SymSpell)", symspell_ms),
+                         ("전체 비교 (거리 제한 OSA)", bounded_ms),
+                         ("전체 비교 (Levenshtein)", full_ms)):
+        print(f"{name:<28} | {percentile(values, 0.5):>7.3f}ms | {percentile(values, 0.99):>7.3f}ms")
+
+    print()
+    for text in ("타이레롤을 먹었는데 개보린이랑 같이 먹어도 돼요?", "판콜애이 하루에 몇 번 먹어요"):
+        start = time.perf_counter()
+        corrected, corrections = drug_kb.correct_drug_names(text)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{text} → {corrected} ({elapsed:.3f}ms, {[c['original'] + '→' + c['corrected'] for c in corrections]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+키워드 매처 벤치마크
+기존 카테고리별 선형 스캔(any/in)과 Aho-Corasick 매처의 처리 시간을 긴 입력에서 비교합니다.
+
+실행: python api/test/bench_keyword_matcher.py
+"""
+
+import sys
+import os
+import time
+import random
+
+# 프로젝트 루트 경로를 sys.path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))  # api/test/
+api_dir = os.path.dirname(current_dir)                   # api/
+backend_dir = os.path.dirname(api_dir)                   # backend/
+sys.path.insert(0, backend_dir)
+
+from utils.intent import KeywordMatcher
+from utils.intent import keyword_matcher
+from utils.ocr.ocr_processor import OCRProcessor
+
+# 데이터셋이 있으면 실제 의약품 설명문을 OCR 결과처럼 이어 붙여 사용
+DATASET_PATH = os.path.join(
+    os.path.dirname(backend_dir), "Examples", "RAG 학습을 위한 데이터셋 만들기", "MedDB_explain.csv"
+)
+
+
+def linear_scan(categories: dict, text: str) -> dict:
+    """기존 구현과 같은 방식: 카테고리마다 키워드별로 텍스트 전체를 검색"""
+    text_lower = text.lower()
+    detected = {}
+    for category, keywords in categories.items():
+        found = [kw for kw in keywords if kw.lower() in text_lower]
+        if found:
+            detected[category] = list(dict.fromkeys(found))
+    return detected
+
+
+def build_documents(size: int) -> str:
+    """약 size 글자의 OCR/음성 인식 결과 형태 텍스트 생성"""
+    if os.path.exists(DATASET_PATH):
+        with open(DATASET_PATH, encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+    else:
+        lines = [
+            "이 약은 두통, 치통, 생리통의 완화에 사용합니다 성인은 1회 1정을 복용합니다",
+            "처방전 환자 성명 홍길동 진단명 급성 상기도 감염 투약 일수 3일",
+            "보관 방법 습기와 빛을 피해 실온에서 보관하십시오 어린이 손이 닿지 않는 곳에",
+        ]
+
+    rng = random.Random(42)
+    chunks, length = [], 0
+    while length < size:
+        line = rng.choice(lines)
+        chunks.append(line)
+        length += len(line) + 1
+    return "\n".join(chunks)[:size]
+
+
+def measure(fn, text: str, repeat: int) -> float:
+    """평균 실행 시간 (ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    categories = OCRProcessor.MEDICAL_KEYWORD_MATCHER.categories
+    matcher = KeywordMatcher(categories)
+
+    # pyahocorasick이 없을 때의 순수 파이썬 오토마톤도 함께 측정
+    available = keyword_matcher.AHOCORASICK_AVAILABLE
+    keyword_matcher.AHOCORASICK_AVAILABLE = False
+    fallback_matcher = KeywordMatcher(categories)
+    keyword_matcher.AHOCORASICK_AVAILABLE = available
+
+    print(f"pyahocorasick 사용 가능: {available}")
+    print(f"카테고리 {len(categories)}개, 키워드 {sum(len(k) for k in categories.values())}개")
+    print(f"{'입력 길이':>10} | {'선형 스캔':>10} | {'AC (C)':>10} | {'AC (Python)':>12}")
+    print("-" * 52)
+
+    for size in (200, 2_000, 20_000, 200_000):
+        text = build_documents(size)
+        repeat = max(5, 200_000 // size)
+
+        # 결과 일치 확인
+        expected = linear_scan(categories, text)
+        for m in (matcher, fallback_matcher):
+            actual = {c: r["keywords"] for c, r in m.match(text).items()}
+            assert actual == expected, f"결과 불일치: {actual} != {expected}"
+
+        linear_ms = measure(lambda t: linear_scan(categories, t), text, repeat)
+        ac_ms = measure(matcher.match, text, repeat)
+        py_ms = measure(fallback_matcher.match, text, repeat)
+        print(f"{size:>10,} | {linear_ms:>8.3f}ms | {ac_ms:>8.3f}ms | {py_ms:>10.3f}ms")
+
+    # 키워드 수가 늘어날 때 (예: 약품명 사전) 선형 스캔은 키워드 수에 비례해 느려짐
+    print()
+    print(f"{'키워드 수':>10} | {'선형 스캔':>10} | {'AC (C)':>10}   (입력 20,000자)")
+    print("-" * 52)
+    text = build_documents(20_000)
+    words = sorted({w for w in build_documents(1_000_000).split() if len(w) >= 2})
+    for count in (32, 256, 2048):
+        many = {"keywords": words[:count]}
+        count = len(many["keywords"])
+        many_matcher = KeywordMatcher(many)
+        linear_ms = measure(lambda t: linear_scan(many, t), text, 10)
+        ac_ms = measure(many_matcher.match, text, 10)
+        print(f"{count:>10,} | {linear_ms:>8.3f}ms | {ac_ms:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
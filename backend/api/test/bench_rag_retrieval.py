@@ -0,0 +1,108 @@
+"""
+답변 근거 검색(RAG) 벤치마크
+문자 n-gram TF-IDF 인덱스의 생성/적재 시간과 질의 지연(p50/p95), 배치 검색 처리량을 측정합니다.
+
+실행: python api/test/bench_rag_retrieval.py
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+
+# 프로젝트 루트 경로를 sys.path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))  # api/test/
+api_dir = os.path.dirname(current_dir)                   # api/
+backend_dir = os.path.dirname(api_dir)                   # backend/
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)  # 설정의 상대 경로(데이터셋 위치) 기준
+
+from utils.drug_kb import drug_kb
+from utils.rag import CharNgramTfidfIndex, PassageRetriever
+
+QUERIES = [
+    "타이레놀 먹으면 간에 무리가 가나요",
+    "임산부가 먹어도 되는 두통약",
+    "이부프로펜이랑 와파린 같이 먹어도 되나요",
+    "졸음이 오는 감기약",
+    "게보린 하루에 몇 번 먹어요",
+    "위장약 부작용",
+    "아이가 열이 나는데 시럽 얼마나 먹여요",
+    "술 마신 다음 날 진통제 먹어도 돼요",
+]
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    drug_kb.load()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_dir = os.path.join(tmp_dir, "rag_index")
+        retriever = PassageRetriever(index_dir=index_dir)
+
+        start = time.perf_counter()
+        passages = retriever.build_passages()
+        passages_ms = (time.perf_counter() - start) * 1000
+
+        index = CharNgramTfidfIndex.build(passages)
+        index.save(index_dir)
+        size_mb = sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir)) / 1024 / 1024
+
+        start = time.perf_counter()
+        index = CharNgramTfidfIndex.load(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(f"문단 {index.n_docs:,}개, 가중치 {index.meta['nnz']:,}개, 인덱스 {size_mb:.1f}MB")
+        print(f"문단 생성 {passages_ms:.1f}ms | 인덱스 생성 {index.meta['build_ms']:.1f}ms | mmap 적재 {load_ms:.2f}ms")
+
+        # 첫 질의 (mmap 페이지가 아직 메모리에 없는 상태)
+        start = time.perf_counter()
+        index.search(QUERIES[0])
+        print(f"첫 질의 {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        # 단일 질의 지연
+        rng = random.Random(42)
+        latencies = []
+        for _ in range(500):
+            query = rng.choice(QUERIES)
+            start = time.perf_counter()
+            index.search(query, top_k=3)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"단일 질의 p50 {percentile(latencies, 0.5):.3f}ms | p95 {percentile(latencies, 0.95):.3f}ms")
+
+        # 배치 검색: 질의 여러 개를 한 번의 희소 행렬 곱으로 처리
+        print()
+        print(f"{'배치 크기':>8} | {'배치 검색':>10} | {'질의당':>9} | {'하나씩 검색':>11}")
+        print("-" * 50)
+        for batch_size in (1, 8, 32, 128):
+            queries = [rng.choice(QUERIES) for _ in range(batch_size)]
+            repeat = max(3, 256 // batch_size)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                batch_results = index.search_batch(queries, top_k=3)
+            batch_ms = (time.perf_counter() - start) / repeat * 1000
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                single_results = [index.search(q, top_k=3) for q in queries]
+            single_ms = (time.perf_counter() - start) / repeat * 1000
+
+            assert [[r["doc_id"] for r in rs] for rs in batch_results] == \
+                [[r["doc_id"] for r in rs] for rs in single_results], "배치/단일 결과 불일치"
+            print(f"{batch_size:>8} | {batch_ms:>8.2f}ms | {batch_ms / batch_size:>7.3f}ms | {single_ms:>9.2f}ms")
+
+        print()
+        for query in QUERIES[:3]:
+            print(f"Q: {query}")
+            for result in index.search(query, top_k=3):
+                print(f"   {result['score']:.3f} {result['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""
+부하 테스트용 가짜 외부 서비스 서버
+유료 IBM / Google 엔드포인트 대신 백엔드가 호출하는 API를 흉내 냅니다.
+
+- IBM IAM 토큰:        POST /identity/token
+- watsonx.ai 생성:      POST /ml/v1/text/generation, /ml/v1/text/generation_stream
+- Watson STT:          POST /speech-to-text/v1/recognize (GET /speech-to-text/v1/models)
+                       WebSocket /speech-to-text/v1/recognize (실시간 인식, 중간/최종 결과)
+- Watson TTS:          POST /text-to-speech/v1/synthesize (GET /text-to-speech/v1/voices)
+- Google OAuth 토큰:    POST /token
+- Google Calendar:     GET/POST /calendar/v3/calendars/{calendarId}/events
+- SMTP:                별도 포트 (EHLO, AUTH, MAIL, RCPT, DATA, QUIT)
+
+서비스별 지연/오류 프로필은 실행 인자로 지정하고, 실행 중에는
+PUT /_fake/profiles/{service} 로 바꿀 수 있습니다. 호출 통계는 GET /_fake/stats.
+
+실행 예:
+    python api/test/loadtest/fake_services.py --port 9100 --smtp-port 9125 \\
+        --latency watsonx=800 --jitter watsonx=300 --error-rate watsonx=0.02
+
+시작 시 출력되는 환경변수로 백엔드를 실행하면 모든 외부 호출이 이 서버로 향합니다.
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import random
+import time
+import uuid
+import wave
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+SERVICES = ["iam", "watsonx", "stt", "tts", "google", "smtp"]
+
+# 서비스별 기본 지연 (ms) - 실제 서비스의 대략적인 응답 시간
+DEFAULT_LATENCY_MS = {
+    "iam": 150,
+    "watsonx": 1500,
+    "stt": 700,
+    "tts": 500,
+    "google": 250,
+    "smtp": 300
+}
+
+# STT 가짜 인식 결과
+FAKE_TRANSCRIPTS = [
+    "타이레놀 효능이 뭐예요",
+    "아스피린 부작용 알려주세요",
+    "하루 세 번 식후에 먹는 약 일정 추가해줘",
+    "머리가 아프고 열이 나요",
+    "임신 중에 감기약 먹어도 되나요"
+]
+
+# watsonx.ai 가짜 답변
+FAKE_ANSWER = (
+    "문의하신 약물은 일반적으로 통증과 발열을 줄이는 데 사용됩니다. "
+    "정해진 용법과 용량을 지켜 복용하시고, 다른 약과 함께 드시는 경우 성분이 겹치지 않는지 확인하세요. "
+    "증상이 3일 이상 지속되거나 악화되면 의사나 약사와 상담하시기 바랍니다. "
+    "※ 이 정보는 참고용이며 전문적인 의료 상담을 대체할 수 없습니다."
+)
+
+FAKE_MEDICATION_JSON = {
+    "medication_name": "타이레놀",
+    "dosage": "1정",
+    "frequency": 3,
+    "times": ["아침", "점심", "저녁"],
+    "duration_days": 3,
+    "special_instructions": "식후 30분"
+}
+
+
+class ServiceProfile:
+    """가짜 서비스의 지연/오류 프로필"""
+
+    def __init__(self, latency_ms: float, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    def sample_delay(self) -> float:
+        """이번 요청의 지연 시간 (초)"""
+        latency = random.gauss(self.latency_ms, self.jitter_ms) if self.jitter_ms else self.latency_ms
+        return max(latency, 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+    def to_dict(self) -> Dict:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status
+        }
+
+
+class FakeServices:
+    """가짜 서비스 상태 (프로필, 통계, 저장된 캘린더 이벤트)"""
+
+    def __init__(self, profiles: Dict[str, ServiceProfile]):
+        self.profiles = profiles
+        self.stats = {name: {"requests": 0, "errors": 0} for name in SERVICES}
+        self.events = []
+        self.emails_received = 0
+
+    async def simulate(self, service: str):
+        """지연을 적용하고, 오류를 낼 차례면 상태 코드를 반환합니다"""
+        profile = self.profiles[service]
+        self.stats[service]["requests"] += 1
+        await asyncio.sleep(profile.sample_delay())
+        if profile.should_fail():
+            self.stats[service]["errors"] += 1
+            return profile.error_status
+        return None
+
+
+def error_response(status_code: int, service: str) -> JSONResponse:
+    headers = {"Retry-After": "1"} if status_code in (429, 503) else None
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": f"fake {service} error", "code": status_code},
+        headers=headers
+    )
+
+
+def make_wav(duration_seconds: float, sample_rate: int = 8000) -> bytes:
+    """무음 WAV 데이터를 생성합니다"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(sample_rate * duration_seconds))
+    return buffer.getvalue()
+
+
+def create_app(fake: FakeServices) -> FastAPI:
+    app = FastAPI(title="Fake External Services")
+
+    # ----- IBM IAM -----
+    @app.post("/identity/token")
+    async def iam_token():
+        status = await fake.simulate("iam")
+        if status:
+            return error_response(status, "iam")
+        now = int(time.time())
+        return {
+            "access_token": f"fake-iam-{uuid.uuid4().hex}",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "expiration": now + 3600
+        }
+
+    # ----- watsonx.ai -----
+    def generated_text(prompt: str) -> str:
+        # 캘린더 정보 추출 프롬프트에는 JSON으로 응답
+        if "복약 지시사항" in prompt and "JSON" in prompt:
+            return json.dumps(FAKE_MEDICATION_JSON, ensure_ascii=False)
+        return FAKE_ANSWER
+
+    @app.head("/")
+    async def root_head():
+        return Response(status_code=200)
+
+    @app.post("/ml/v1/text/generation")
+    async def generation(request: Request):
+        body = await request.json()
+        status = await fake.simulate("watsonx")
+        if status:
+            return error_response(status, "watsonx")
+        text = generated_text(body.get("input", ""))
+        return {
+            "model_id": body.get("model_id"),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "results": [{
+                "generated_text": text,
+                "generated_token_count": len(text) // 2,
+                "input_token_count": len(body.get("input", "")) // 2,
+                "stop_reason": "eos_token"
+            }]
+        }
+
+    @app.post("/ml/v1/text/generation_stream")
+    async def generation_stream(request: Request):
+        body = await request.json()
+        profile = fake.profiles["watsonx"]
+        fake.stats["watsonx"]["requests"] += 1
+
+        # 첫 토큰까지 전체 지연의 30%, 나머지는 조각마다 나눠서 적용
+        total_delay = profile.sample_delay()
+        await asyncio.sleep(total_delay * 0.3)
+        if profile.should_fail():
+            fake.stats["watsonx"]["errors"] += 1
+            return error_response(profile.error_status, "watsonx")
+
+        text = generated_text(body.get("input", ""))
+        words = text.split(" ")
+        chunks = [word + " " for word in words[:-1]] + [words[-1]]
+        chunk_delay = total_delay * 0.7 / max(len(chunks), 1)
+
+        async def event_stream():
+            for index, chunk in enumerate(chunks):
+                await asyncio.sleep(chunk_delay)
+                payload = {"results": [{"generated_text": chunk, "generated_token_count": index + 1}]}
+                yield f"id: {index}\nevent: message\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    # ----- Watson STT -----
+    @app.post("/speech-to-text/v1/recognize")
+    async def recognize(request: Request):
+        audio = await request.body()
+        status = await fake.simulate("stt")
+        if status:
+            return error_response(status, "stt")
+        return {
+            "result_index": 0,
+            "results": [{
+                "final": True,
+                "alternatives": [{
+                    "transcript": random.choice(FAKE_TRANSCRIPTS),
+                    "confidence": round(random.uniform(0.75, 0.98), 3)
+                }]
+            }],
+            "audio_bytes": len(audio)
+        }
+
+    @app.websocket("/speech-to-text/v1/recognize")
+    async def recognize_stream(websocket: WebSocket):
+        # Watson 프로토콜: start → listening, 오디오 프레임마다 중간 결과, stop → 최종 결과 + listening
+        await websocket.accept()
+        words = random.choice(FAKE_TRANSCRIPTS).split()
+        frames = 0
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("bytes"):
+                    frames += 1
+                    partial = " ".join(words[:min(frames, len(words))])
+                    await websocket.send_json({"result_index": 0, "results": [
+                        {"final": False, "alternatives": [{"transcript": partial}]}
+                    ]})
+                    continue
+                action = json.loads(message.get("text") or "{}").get("action")
+                if action == "start":
+                    await websocket.send_json({"state": "listening"})
+                elif action == "stop":
+                    status = await fake.simulate("stt")
+                    if status:
+                        await websocket.send_json({"error": f"fake stt error ({status})"})
+                        await websocket.close()
+                        return
+                    await websocket.send_json({"result_index": 0, "results": [{
+                        "final": True,
+                        "alternatives": [{
+                            "transcript": " ".join(words),
+                            "confidence": round(random.uniform(0.75, 0.98), 3)
+                        }]
+                    }]})
+                    await websocket.send_json({"state": "listening"})
+                    frames = 0
+        except WebSocketDisconnect:
+            return
+
+    @app.get("/speech-to-text/v1/models")
+    async def stt_models():
+        return {"models": [{"name": "ko-KR_BroadbandModel", "language": "ko-KR"}]}
+
+    # ----- Watson TTS -----
+    @app.post("/text-to-speech/v1/synthesize")
+    async def synthesize(request: Request):
+        body = await request.json()
+        status = await fake.simulate("tts")
+        if status:
+            return error_response(status, "tts")
+        # 글자당 약 60ms 분량의 무음 (최대 30초)
+        duration = min(len(body.get("text", "")) * 0.06, 30.0)
+        accept = request.headers.get("accept", "audio/wav")
+        return Response(content=make_wav(duration), media_type=accept)
+
+    @app.get("/text-to-speech/v1/voices")
+    async def tts_voices():
+        return {"voices": [{"name": "ko-KR_HyunjunVoice", "language": "ko-KR"}]}
+
+    # ----- Google OAuth / Calendar -----
+    @app.post("/token")
+    async def google_token():
+        status = await fake.simulate("google")
+        if status:
+            return error_response(status, "google")
+        return {
+            "access_token": f"fake-google-{uuid.uuid4().hex}",
+            "expires_in": 3600,
+            "token_type": "Bearer"
+        }
+
+    @app.post("/calendar/v3/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        body = await request.json()
+        status = await fake.simulate("google")
+        if status:
+            return error_response(status, "google")
+        event_id = uuid.uuid4().hex
+        event = {
+            **body,
+            "kind": "calendar#event",
+            "id": event_id,
+            "status": "confirmed",
+            "htmlLink": f"https://calendar.google.com/event?eid={event_id}"
+        }
+        fake.events.append(event)
+        # 메모리 사용량이 계속 늘지 않도록 최근 1000개만 유지
+        del fake.events[:-1000]
+        return event
+
+    @app.get("/calendar/v3/calendars/{calendar_id}/events")
+    async def list_events(calendar_id: str, maxResults: int = 250):
+        status = await fake.simulate("google")
+        if status:
+            return error_response(status, "google")
+        return {"kind": "calendar#events", "items": fake.events[-maxResults:]}
+
+    # ----- 제어용 -----
+    @app.get("/_fake/stats")
+    async def get_stats():
+        return {
+            "services": fake.stats,
+            "profiles": {name: profile.to_dict() for name, profile in fake.profiles.items()},
+            "calendar_events": len(fake.events),
+            "emails_received": fake.emails_received
+        }
+
+    @app.put("/_fake/profiles/{service}")
+    async def update_profile(service: str, request: Request):
+        if service not in fake.profiles:
+            return JSONResponse(status_code=404, content={"error": f"unknown service: {service}"})
+        updates = await request.json()
+        profile = fake.profiles[service]
+        for key in ("latency_ms", "jitter_ms", "error_rate", "error_status"):
+            if key in updates:
+                setattr(profile, key, type(getattr(profile, key))(updates[key]))
+        return profile.to_dict()
+
+    return app
+
+
+async def handle_smtp(fake: FakeServices, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """SMTP 세션 하나를 처리합니다 (TLS 없음, 모든 인증 허용)"""
+
+    async def reply(line: str):
+        writer.write((line + "\r\n").encode())
+        await writer.drain()
+
+    await reply("220 fake-smtp ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                writer.write(b"250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n")
+                await writer.drain()
+            elif verb == "HELO":
+                await reply("250 fake-smtp")
+            elif verb == "AUTH":
+                mechanism = command.split(" ")[1].upper() if " " in command else ""
+                if mechanism == "LOGIN":
+                    await reply("334 " + base64.b64encode(b"Username:").decode())
+                    await reader.readline()
+                    await reply("334 " + base64.b64encode(b"Password:").decode())
+                    await reader.readline()
+                elif mechanism == "PLAIN" and len(command.split(" ")) < 3:
+                    await reply("334 ")
+                    await reader.readline()
+                await reply("235 2.7.0 Authentication successful")
+            elif verb == "STARTTLS":
+                await reply("454 TLS not available")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    line = await reader.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                status = await fake.simulate("smtp")
+                if status:
+                    await reply("451 4.3.0 Fake temporary failure")
+                else:
+                    fake.emails_received += 1
+                    await reply("250 OK queued")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    except (ConnectionResetError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+def parse_overrides(values, cast) -> Dict:
+    """SERVICE=값 형식의 인자 목록을 딕셔너리로 변환합니다"""
+    result = {}
+    for item in values or []:
+        service, _, value = item.partition("=")
+        if service not in SERVICES:
+            raise SystemExit(f"알 수 없는 서비스: {service} (사용 가능: {', '.join(SERVICES)})")
+        result[service] = cast(value)
+    return result
+
+
+def print_backend_env(host: str, port: int, smtp_port: int):
+    base = f"http://{host}:{port}"
+    print("다음 환경변수로 백엔드를 실행하세요:")
+    print(f"  WATSONX_API_URL={base}")
+    print(f"  IBM_IAM_URL={base}/identity/token")
+    print("  WATSONX_API_KEY=fake WATSONX_PROJECT_ID=fake")
+    print(f"  WATSON_STT_URL={base}/speech-to-text WATSON_STT_API_KEY=fake")
+    print(f"  WATSON_TTS_URL={base}/text-to-speech WATSON_TTS_API_KEY=fake")
+    print(f"  GOOGLE_CALENDAR_API_ENDPOINT={base}/calendar/v3/ GOOGLE_TOKEN_URI={base}/token")
+    print(f"  MAIL_SERVER={host} MAIL_PORT={smtp_port} MAIL_STARTTLS=false")
+    print("  MAIL_USERNAME=fake MAIL_PASSWORD=fake MAIL_FROM=loadtest@example.com")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 가짜 외부 서비스 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100, help="HTTP 서비스 포트")
+    parser.add_argument("--smtp-port", type=int, default=9125, help="SMTP 포트")
+    parser.add_argument("--latency", action="append", metavar="SERVICE=MS", help="평균 지연 (ms)")
+    parser.add_argument("--jitter", action="append", metavar="SERVICE=MS", help="지연 표준편차 (ms)")
+    parser.add_argument("--error-rate", action="append", metavar="SERVICE=RATE", help="오류 비율 (0~1)")
+    parser.add_argument("--error-status", action="append", metavar="SERVICE=CODE", help="오류 상태 코드 (기본 500)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    latency = parse_overrides(args.latency, float)
+    jitter = parse_overrides(args.jitter, float)
+    error_rate = parse_overrides(args.error_rate, float)
+    error_status = parse_overrides(args.error_status, int)
+
+    profiles = {}
+    for name in SERVICES:
+        latency_ms = latency.get(name, DEFAULT_LATENCY_MS[name])
+        profiles[name] = ServiceProfile(
+            latency_ms=latency_ms,
+            jitter_ms=jitter.get(name, latency_ms * 0.2),  # 기본 표준편차: 평균의 20%
+            error_rate=error_rate.get(name, 0.0),
+            error_status=error_status.get(name, 500)
+        )
+    fake = FakeServices(profiles)
+
+    smtp_server = await asyncio.start_server(
+        lambda reader, writer: handle_smtp(fake, reader, writer), args.host, args.smtp_port
+    )
+    http_server = uvicorn.Server(uvicorn.Config(
+        create_app(fake), host=args.host, port=args.port, log_level="warning"
+    ))
+
+    print(f"가짜 서비스 HTTP: http://{args.host}:{args.port}, SMTP: {args.host}:{args.smtp_port}")
+    for name, profile in profiles.items():
+        print(f"  [{name}] {profile.to_dict()}")
+    print_backend_env(args.host, args.port, args.smtp_port)
+
+    async with smtp_server:
+        await http_server.serve()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
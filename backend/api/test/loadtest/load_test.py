@@ -0,0 +1,298 @@
+"""
+엔드투엔드 부하 테스트 실행기
+목표 RPS로 백엔드 주요 API를 호출하고 엔드포인트별 p50/p95/p99 지연과 오류율을 보고합니다.
+
+- /api/chat                    : 텍스트 채팅
+- /api/voice/chat              : 음성 채팅 (무음 WAV 업로드)
+- /api/files/upload            : 처방전 이미지 업로드 + OCR
+- /api/calendar/add-medication : 복약 일정 추가
+
+요청은 응답을 기다리지 않고 정해진 간격으로 시작하며(open-loop),
+지연은 예정된 시작 시각부터 측정합니다 (클라이언트가 밀려도 지연에 반영됨).
+
+실행 순서:
+    1. python api/test/loadtest/fake_services.py          (가짜 외부 서비스)
+    2. 출력된 환경변수로 백엔드 실행 (backend 디렉토리에서)
+    3. python api/test/loadtest/load_test.py --rps 20 --duration 60
+
+캘린더 테스트를 위해 --tokens-dir (백엔드 실행 디렉토리의 user_tokens)에
+가짜 Google 토큰을 만들어 둡니다.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import random
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from PIL import Image, ImageDraw
+
+SAMPLE_QUESTIONS = [
+    "타이레놀 효능이 뭐예요?",
+    "아스피린 부작용 알려주세요",
+    "머리가 아파요. 어떻게 해야 할까요?",
+    "임신 중에 감기약 먹어도 되나요?",
+    "이부프로펜이랑 아세트아미노펜 같이 먹어도 돼요?",
+    "소화제는 식전에 먹나요 식후에 먹나요?"
+]
+
+SAMPLE_MEDICATION_TEXTS = [
+    "타이레놀 하루 3번 식후 1정씩 3일간 복용",
+    "아목시실린 하루 2번 아침 저녁 식후 7일간",
+    "오메프라졸 하루 1번 아침 식전 14일간"
+]
+
+
+def make_wav(duration_seconds: float = 2.0, sample_rate: int = 16000) -> bytes:
+    """음성 채팅 업로드용 무음 WAV"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(sample_rate * duration_seconds))
+    return buffer.getvalue()
+
+
+def make_prescription_png() -> bytes:
+    """파일 업로드용 처방전 모양 이미지"""
+    image = Image.new("RGB", (600, 300), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(["PRESCRIPTION", "Patient: TEST", "Tylenol 500mg 1T TID x 3 days"]):
+        draw.text((20, 20 + index * 40), line, fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def seed_google_token(tokens_dir: str, user_id: str, token_uri: str):
+    """캘린더 API 호출에 쓸 가짜 Google 토큰 파일을 만듭니다 (UserTokenManager 형식)"""
+    directory = Path(tokens_dir)
+    directory.mkdir(exist_ok=True)
+    safe_user_id = "".join(c for c in user_id if c.isalnum() or c in ('-', '_'))
+    token_data = {
+        "user_id": user_id,
+        "token": "fake-google-access-token",
+        "refresh_token": "fake-google-refresh-token",
+        "token_uri": token_uri,
+        "client_id": "fake-client-id",
+        "client_secret": "fake-client-secret",
+        "scopes": ["openid", "email", "profile", "https://www.googleapis.com/auth/calendar"]
+    }
+    with open(directory / f"google_token_{safe_user_id}.json", "w") as f:
+        json.dump(token_data, f, indent=2)
+
+
+def user_ids(args) -> List[str]:
+    """캘린더 요청에 쓸 사용자 ID 목록 (같은 사용자의 요청은 서버에서 직렬화됨)"""
+    if args.users <= 1:
+        return [args.user_id]
+    return [f"{args.user_id}-{index}" for index in range(args.users)]
+
+
+class LoadTest:
+    """엔드포인트별 요청 생성과 결과 집계"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.wav_bytes = make_wav()
+        self.png_bytes = make_prescription_png()
+        self.results: Dict[str, List[Dict]] = {}
+        self.user_ids = user_ids(args)
+
+    def _question(self) -> str:
+        question = self.rng.choice(SAMPLE_QUESTIONS)
+        # 일부 질문은 고유하게 만들어 답변 캐시를 거치지 않도록 함
+        if self.rng.random() < self.args.unique_ratio:
+            question = f"{question} ({self.rng.randint(0, 10**9)})"
+        return question
+
+    async def _send(self, client: httpx.AsyncClient, endpoint: str) -> httpx.Response:
+        if endpoint == "chat":
+            return await client.post("/api/chat", json={
+                "question": self._question(),
+                "underlying_diseases": self.rng.choice([[], ["고혈압"], ["당뇨병", "고혈압"]]),
+                "currentMedications": self.rng.choice([[], ["아스피린"], ["메트포르민"]])
+            })
+        if endpoint == "voice":
+            return await client.post(
+                "/api/voice/chat",
+                files={"audio_file": ("question.wav", self.wav_bytes, "audio/wav")},
+                data={"audio_format": "wav"}
+            )
+        if endpoint == "upload":
+            return await client.post(
+                "/api/files/upload",
+                files={"file": ("prescription.png", self.png_bytes, "image/png")}
+            )
+        if endpoint == "calendar":
+            return await client.post("/api/calendar/add-medication", json={
+                "user_id": self.rng.choice(self.user_ids),
+                "medication_text": self.rng.choice(SAMPLE_MEDICATION_TEXTS)
+            })
+        raise ValueError(f"알 수 없는 엔드포인트: {endpoint}")
+
+    @staticmethod
+    def _is_success(endpoint: str, response: httpx.Response) -> bool:
+        if response.status_code != 200:
+            return False
+        if endpoint == "chat":
+            return response.json().get("status") == "success"
+        if endpoint == "calendar":
+            # 캘린더 API는 실패해도 200으로 응답하므로 본문 확인
+            return bool(response.json().get("success"))
+        return True
+
+    async def _fire(self, client: httpx.AsyncClient, endpoint: str, scheduled_at: float):
+        status = "exception"
+        ok = False
+        try:
+            response = await self._send(client, endpoint)
+            status = str(response.status_code)
+            ok = self._is_success(endpoint, response)
+        except httpx.TimeoutException:
+            status = "timeout"
+        except Exception as e:
+            status = type(e).__name__
+        self.results.setdefault(endpoint, []).append({
+            "latency": time.perf_counter() - scheduled_at,
+            "status": status,
+            "ok": ok
+        })
+
+    async def run(self) -> Dict:
+        mix = self.args.mix
+        endpoints, weights = list(mix.keys()), list(mix.values())
+        interval = 1.0 / self.args.rps
+
+        limits = httpx.Limits(max_connections=self.args.max_connections,
+                              max_keepalive_connections=self.args.max_connections)
+        async with httpx.AsyncClient(base_url=self.args.base_url, limits=limits,
+                                     timeout=self.args.timeout) as client:
+            tasks = []
+            start = time.perf_counter()
+            index = 0
+            while True:
+                scheduled_at = start + index * interval
+                if scheduled_at - start >= self.args.duration:
+                    break
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                endpoint = self.rng.choices(endpoints, weights)[0]
+                tasks.append(asyncio.create_task(self._fire(client, endpoint, scheduled_at)))
+                index += 1
+
+            sent_elapsed = time.perf_counter() - start
+            await asyncio.gather(*tasks)
+            total_elapsed = time.perf_counter() - start
+
+        return self.report(index, sent_elapsed, total_elapsed)
+
+    @staticmethod
+    def _summarize(samples: List[Dict]) -> Dict:
+        latencies = sorted(sample["latency"] * 1000 for sample in samples)
+        errors = sum(1 for sample in samples if not sample["ok"])
+        status_counts: Dict[str, int] = {}
+        for sample in samples:
+            status_counts[sample["status"]] = status_counts.get(sample["status"], 0) + 1
+
+        def percentile(p: float) -> float:
+            # nearest-rank 방식
+            rank = max(math.ceil(p / 100 * len(latencies)), 1)
+            return round(latencies[rank - 1], 1)
+
+        return {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(latencies[-1], 1),
+            "status_counts": status_counts
+        }
+
+    def report(self, sent: int, sent_elapsed: float, total_elapsed: float) -> Dict:
+        endpoints = {name: self._summarize(samples) for name, samples in self.results.items() if samples}
+        all_samples = [sample for samples in self.results.values() for sample in samples]
+        return {
+            "target_rps": self.args.rps,
+            "offered_rps": round(sent / sent_elapsed, 2) if sent_elapsed else 0.0,
+            "completed_rps": round(len(all_samples) / total_elapsed, 2) if total_elapsed else 0.0,
+            "duration_seconds": round(total_elapsed, 1),
+            "overall": self._summarize(all_samples) if all_samples else {},
+            "endpoints": endpoints
+        }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """chat=6,voice=1 형식의 요청 비율을 파싱합니다"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ("chat", "voice", "upload", "calendar"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 엔드포인트: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def print_report(report: Dict):
+    print(f"\n목표 {report['target_rps']} RPS | 실제 전송 {report['offered_rps']} RPS | "
+          f"완료 {report['completed_rps']} RPS | {report['duration_seconds']}초")
+    header = f"{'엔드포인트':<10} {'요청':>7} {'오류율':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["endpoints"].items()) + [("전체", report["overall"])]
+    for name, summary in rows:
+        if not summary:
+            continue
+        print(f"{name:<10} {summary['requests']:>7} {summary['error_rate'] * 100:>7.2f}% "
+              f"{summary['p50_ms']:>7.0f}ms {summary['p95_ms']:>7.0f}ms "
+              f"{summary['p99_ms']:>7.0f}ms {summary['max_ms']:>7.0f}ms")
+    for name, summary in report["endpoints"].items():
+        print(f"  {name} 상태 코드: {summary['status_counts']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dr.Watson 백엔드 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--rps", type=float, default=10.0, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="요청을 보내는 시간 (초)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("chat=6,voice=1,upload=1,calendar=2"),
+                        help="엔드포인트별 요청 비율 (예: chat=6,voice=1,upload=1,calendar=2)")
+    parser.add_argument("--unique-ratio", type=float, default=0.5,
+                        help="답변 캐시를 피하도록 고유하게 만들 질문 비율 (0~1)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--user-id", default="loadtest-user", help="캘린더 요청에 쓸 사용자 ID (접두어)")
+    parser.add_argument("--users", type=int, default=20, help="캘린더 요청을 나눌 가상 사용자 수")
+    parser.add_argument("--tokens-dir", default="user_tokens",
+                        help="백엔드가 읽는 Google 토큰 디렉토리 (비우면 토큰을 만들지 않음)")
+    parser.add_argument("--google-token-uri", default="http://127.0.0.1:9100/token")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    if args.tokens_dir and "calendar" in args.mix:
+        for user_id in user_ids(args):
+            seed_google_token(args.tokens_dir, user_id, args.google_token_uri)
+
+    report = asyncio.run(LoadTest(args).run())
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+단위 테스트 (pytest)
+
+실행 (backend/에서): python -m pytest -q api/test/unit
+"""
@@ -0,0 +1,186 @@
+"""서킷 브레이커 상태 전환 단위 테스트 (closed → open → half_open → closed/open)"""
+
+import asyncio
+
+import pytest
+
+from utils.watsonx import circuit_breaker
+from utils.watsonx.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """time.monotonic 대신 쓰는 수동 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(window_size=10, min_calls=4, failure_rate_threshold=0.5,
+                   slow_call_duration=5.0, slow_call_rate_threshold=0.5,
+                   open_duration=30.0, half_open_max_calls=1)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def succeed(breaker: CircuitBreaker, clock: FakeClock = None, elapsed: float = 0.0, **kwargs):
+    with breaker.guard(**kwargs):
+        if clock is not None:
+            clock.advance(elapsed)
+
+
+def fail(breaker: CircuitBreaker):
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("upstream error")
+
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.min_calls):
+        fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(breaker.min_calls - 1):
+        fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+
+
+def test_stays_closed_below_failure_rate(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        succeed(breaker)
+    fail(breaker)
+    succeed(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_state()["failure_rate"] == 0.2
+
+
+def test_opens_on_failure_rate_and_rejects(clock):
+    breaker = make_breaker()
+    succeed(breaker)
+    succeed(breaker)
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats["opened"] == 1
+
+    clock.advance(10)
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_after == pytest.approx(20.0)
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pytest.fail("열린 브레이커는 호출을 실행하지 않아야 합니다")
+    assert breaker.stats["rejected"] == 2
+    assert breaker.get_state()["retry_after"] == 20.0
+
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    succeed(breaker, clock, elapsed=1.0)
+    succeed(breaker, clock, elapsed=1.0)
+    succeed(breaker, clock, elapsed=6.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+    succeed(breaker, clock, elapsed=5.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats["slow_calls"] == 2
+    assert breaker.stats["failures"] == 0
+
+
+def test_half_open_success_closes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    breaker.check()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    succeed(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    # 닫히면 이전 실패 기록은 지워지므로 실패 한 번으로 다시 열리지 않음
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_failure_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats["opened"] == 2
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_after == pytest.approx(30.0)
+
+
+def test_half_open_slow_call_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    succeed(breaker, clock, elapsed=5.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_limits_trial_calls(clock):
+    breaker = make_breaker(half_open_max_calls=1)
+    trip(breaker)
+    clock.advance(30)
+    with breaker.guard():
+        # 시험 호출이 진행 중이면 다른 호출은 거절
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_trial_call_is_not_recorded(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    failures = breaker.stats["failures"]
+    with pytest.raises(asyncio.CancelledError):
+        with breaker.guard():
+            raise asyncio.CancelledError()
+    # 취소는 성공/실패로 보지 않고 시험 호출 자리만 돌려줌
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.stats["failures"] == failures
+    breaker.check()
+
+
+def test_latency_samples(clock):
+    breaker = make_breaker()
+    assert breaker.latency_percentile(95) is None
+    for elapsed in (1.0, 2.0, 3.0, 4.0):
+        succeed(breaker, clock, elapsed=elapsed)
+    # 스트림의 첫 응답 시간처럼 record_latency=False인 구간은 표본에서 제외
+    succeed(breaker, clock, elapsed=0.1, record_latency=False)
+    fail(breaker)
+    assert breaker.latency_samples == 4
+    assert breaker.latency_percentile(50) == 3.0
+    assert breaker.latency_percentile(95) == 4.0
+    assert breaker.stats["successes"] == 5
+
+
+def test_disabled_breaker_never_opens(clock):
+    breaker = make_breaker(enabled=False)
+    for _ in range(20):
+        fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+    assert breaker.stats["failures"] == 0
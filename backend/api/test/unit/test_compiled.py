@@ -0,0 +1,146 @@
+"""의약품 바이너리(mmap) 형식 저장/읽기 왕복 단위 테스트"""
+
+import os
+import sys
+from array import array
+
+import pytest
+
+from utils.drug_kb.compiled import (
+    FORMAT_VERSION,
+    CompiledFile,
+    MappedPostings,
+    MappedRecords,
+    StringPool,
+    changed_sources,
+    hash_table_sections,
+    read_header,
+    source_states,
+    write_compiled,
+)
+
+FIELDS = ("name", "company", "ingredients")
+LIST_FIELDS = ("ingredients",)
+RECORDS = [
+    ("타이레놀정500mg", "한국얀센", ("아세트아미노펜",)),
+    ("게보린정", "삼진제약", ("아세트아미노펜", "이소프로필안티피린", "카페인무수물")),
+    ("부루펜정200mg", "삼일제약", ("이부프로펜",)),
+    ("", "", ()),
+]
+POSTINGS = {
+    "아세트아미노펜": [0, 1],
+    "이부프로펜": [2],
+    "카페인무수물": [1],
+    "acetaminophen": [0, 1],
+}
+
+
+def compile_records(path: str, header=None):
+    """테스트 레코드와 사전을 저장하고 mmap으로 다시 엽니다"""
+    pool = StringPool()
+    sections = {}
+    for index, field in enumerate(FIELDS):
+        if field in LIST_FIELDS:
+            ptr, ids = [0], []
+            for record in RECORDS:
+                ids.extend(record[index])
+                ptr.append(len(ids))
+            sections[f"list.{field}.ptr"] = array("I", ptr)
+            sections[f"list.{field}.ids"] = pool.column(ids)
+        else:
+            sections[f"col.{field}"] = pool.column(record[index] for record in RECORDS)
+    sections.update(hash_table_sections("postings", pool, POSTINGS.items()))
+    sections["raw"] = b"\x01\x02\x03"
+    sections.update(pool.sections())
+    write_compiled(path, sections, header or {"records": len(RECORDS)})
+    return CompiledFile(path), pool
+
+
+def test_string_pool_deduplicates():
+    pool = StringPool()
+    assert pool.add("") == 0
+    first = pool.add("아세트아미노펜")
+    assert pool.add("아세트아미노펜") == first
+    assert pool.add(None) == 0
+    assert list(pool.column(["a", "아세트아미노펜", "a"])) == [2, first, 2]
+    assert len(pool) == 3
+
+
+def test_records_round_trip(tmp_path):
+    compiled, pool = compile_records(str(tmp_path / "drug_kb.bin"))
+    records = MappedRecords(compiled, FIELDS, LIST_FIELDS)
+    assert len(records) == len(RECORDS)
+    assert [records[i] for i in range(len(records))] == RECORDS
+    assert records[-1] == RECORDS[-1]
+    assert compiled.strings("col.company") == [record[1] for record in RECORDS]
+    assert [compiled.string(i) for i in range(len(pool))] == pool._strings
+    assert bytes(compiled.section("raw")) == b"\x01\x02\x03"
+
+
+def test_records_index_out_of_range(tmp_path):
+    compiled, _ = compile_records(str(tmp_path / "drug_kb.bin"))
+    records = MappedRecords(compiled, FIELDS, LIST_FIELDS)
+    for index in (len(RECORDS), -len(RECORDS) - 1):
+        with pytest.raises(IndexError):
+            records[index]
+
+
+def test_postings_round_trip(tmp_path):
+    compiled, _ = compile_records(str(tmp_path / "drug_kb.bin"))
+    postings = MappedPostings(compiled, "postings")
+    assert len(postings) == len(POSTINGS)
+    for key, ids in POSTINGS.items():
+        assert list(postings.get(key)) == ids
+    assert postings.get("없는성분") is None
+    assert postings.get("", []) == []
+
+
+def test_postings_with_colliding_slots(tmp_path):
+    # 키가 많으면 선형 탐사가 여러 칸을 건너야 하므로 충돌 경로도 함께 확인
+    entries = {f"성분{i}": [i, i * 2] for i in range(500)}
+    pool = StringPool()
+    sections = hash_table_sections("postings", pool, entries.items())
+    sections.update(pool.sections())
+    path = str(tmp_path / "postings.bin")
+    write_compiled(path, sections, {})
+    postings = MappedPostings(CompiledFile(path), "postings")
+    assert all(list(postings.get(key)) == ids for key, ids in entries.items())
+    assert postings.get("성분500") is None
+
+
+def test_header_round_trip(tmp_path):
+    path = str(tmp_path / "drug_kb.bin")
+    compile_records(path, {"records": len(RECORDS), "files": ["a.csv"]})
+    header = read_header(path)
+    assert header["version"] == FORMAT_VERSION
+    assert header["byteorder"] == sys.byteorder
+    assert header["records"] == len(RECORDS)
+    assert header["files"] == ["a.csv"]
+    assert header["data_offset"] % 8 == 0
+    assert not [name for name in os.listdir(tmp_path) if ".tmp." in name]
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "broken.bin"
+    path.write_bytes(b"NOTDRUGKB")
+    assert read_header(str(path)) is None
+    assert read_header(str(tmp_path / "missing.bin")) is None
+    with pytest.raises(ValueError):
+        CompiledFile(str(path))
+
+
+def test_changed_sources(tmp_path):
+    source = tmp_path / "drugs.csv"
+    source.write_text("name\n타이레놀\n", encoding="utf-8")
+    paths = [str(source)]
+    header = {"version": FORMAT_VERSION, "sources": source_states(paths)}
+    assert changed_sources(header, paths) == []
+
+    # 내용이 같으면 수정 시각만 바뀌어도 최신으로 간주
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert changed_sources(header, paths) == []
+
+    source.write_text("name\n게보린\n", encoding="utf-8")
+    assert changed_sources(header, paths) == ["drugs.csv"]
+    assert changed_sources(None, paths) == ["drugs.csv"]
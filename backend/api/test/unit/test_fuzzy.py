@@ -0,0 +1,91 @@
+"""자모 편집 거리와 SymSpell 방식 오타 교정기 단위 테스트"""
+
+import random
+
+import pytest
+
+from utils.drug_kb.fuzzy import FuzzyNameResolver, bounded_edit_distance, to_jamo
+
+
+def osa_distance(a: str, b: str) -> int:
+    """제한 없는 OSA(인접 교환 포함) 편집 거리 기준 구현"""
+    rows = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        rows[i][0] = i
+    for j in range(len(b) + 1):
+        rows[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[len(a)][len(b)]
+
+
+def test_to_jamo_decomposes_syllables():
+    assert to_jamo("놀") == "\u1102\u1169\u11af"  # 초성 ㄴ, 중성 ㅗ, 종성 ㄹ
+    assert to_jamo("타이") == "\u1110\u1161\u110b\u1175"  # 받침 없는 음절은 자모 두 개
+    assert to_jamo("정500mg") == "\u110c\u1165\u11bc500mg"  # 한글이 아닌 문자는 그대로
+    assert to_jamo("") == ""
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("타이레놀", "타이레놀", 0),
+    ("타이레놀", "타이래놀", 1),  # 중성 ㅔ → ㅐ 하나
+    ("타이레놀", "타이레롤", 1),  # 초성 ㄴ → ㄹ 하나
+    ("타이레놀", "타이놀", 2),  # 음절 하나(ㄹ, ㅔ)를 빠뜨림
+    ("게보린", "게보린정", 3),  # 음절 하나(ㅈ, ㅓ, ㅇ)를 덧붙임
+])
+def test_jamo_distance_of_common_typos(a, b, expected):
+    assert osa_distance(to_jamo(a), to_jamo(b)) == expected
+    assert bounded_edit_distance(to_jamo(a), to_jamo(b), 10) == expected
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_bounded_edit_distance_matches_reference(seed):
+    rng = random.Random(seed)
+    alphabet = "abcd"
+    a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+    b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+    max_distance = rng.randint(0, 3)
+    expected = osa_distance(a, b)
+    assert bounded_edit_distance(a, b, max_distance) == (expected if expected <= max_distance else max_distance + 1)
+
+
+def test_bounded_edit_distance_counts_transposition_once():
+    assert bounded_edit_distance("abcd", "abdc", 2) == 1
+    assert bounded_edit_distance("ab", "ba", 0) == 1  # 초과하면 max_distance + 1
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_symspell_lookup_matches_brute_force(seed):
+    rng = random.Random(seed)
+    syllables = "타이레놀게보린판콜에이아스피린"
+    words = {"".join(rng.choice(syllables) for _ in range(rng.randint(2, 6))) for _ in range(80)}
+    resolver = FuzzyNameResolver(((word, {"product": word}) for word in sorted(words)), max_distance=2)
+
+    for _ in range(20):
+        word = rng.choice(sorted(words))
+        chars = list(word)
+        # 음절 하나를 바꾸거나 지워 오타를 만듦
+        index = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            chars[index] = rng.choice(syllables)
+        else:
+            del chars[index]
+        query = "".join(chars)
+        if not query:
+            continue
+        expected = resolver.brute_force_lookup(query, limit=100)
+        got = resolver.lookup(query, limit=100)
+        if query in words:
+            assert got[0] == {"key": query, "distance": 0, "product": query}
+        else:
+            assert got == expected
+
+
+def test_lookup_prefers_closest_term():
+    resolver = FuzzyNameResolver([("타이레놀", {"product": "타이레놀정500밀리그람"}), ("게보린", {"product": "게보린정"})])
+    assert resolver.lookup("타이래놀", limit=1) == [{"key": "타이레놀", "distance": 1, "product": "타이레놀정500밀리그람"}]
+    assert resolver.lookup("전혀다른이름") == []
@@ -0,0 +1,88 @@
+"""키워드 매처 (Aho-Corasick) 단위 테스트"""
+
+import random
+
+import pytest
+
+from utils.intent import KeywordMatcher
+from utils.intent import keyword_matcher as keyword_matcher_module
+
+
+def make_matcher(categories, backend):
+    """지정한 오토마톤 구현(pyahocorasick 또는 순수 파이썬)으로 매처를 만듭니다"""
+    matcher = KeywordMatcher(categories)
+    if backend == "python":
+        matcher._automaton = keyword_matcher_module._PyAutomaton(list(matcher._keyword_categories))
+    elif not keyword_matcher_module.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not available")
+    return matcher
+
+
+@pytest.fixture(params=["pyahocorasick", "python"])
+def backend(request):
+    return request.param
+
+
+@pytest.mark.parametrize("keywords, text, expected", [
+    # 겹치는 매치: 먼저 시작하는 she가 이기고, 겹치는 hers는 버림
+    (["she", "hers", "he"], "ushers", [(1, "she")]),
+    # 같은 위치에서 시작하면 긴 쪽
+    (["he", "hers"], "hers", [(0, "hers")]),
+    # 긴 키워드 안의 짧은 키워드는 선택하지 않음
+    (["정신장애", "신장애"], "정신장애가 있어요", [(0, "정신장애")]),
+    # 앞의 짧은 매치와 뒤의 긴 매치가 겹치면 왼쪽 매치를 유지
+    (["ab", "bcde"], "abcde", [(0, "ab")]),
+    # 겹치지 않는 매치는 모두 반환
+    (["고혈압", "당뇨"], "고혈압과 당뇨가 있어요", [(0, "고혈압"), (5, "당뇨")]),
+])
+def test_find_longest_is_leftmost_longest(backend, keywords, text, expected):
+    matcher = make_matcher({"keywords": keywords}, backend)
+    assert matcher.find_longest(text) == expected
+
+
+def test_find_longest_empty(backend):
+    matcher = make_matcher({"keywords": ["she"]}, backend)
+    assert matcher.find_longest("") == []
+    assert matcher.find_longest("xyz") == []
+
+
+def _random_case(seed: int):
+    """작은 알파벳으로 겹치는 키워드가 많은 무작위 사전과 텍스트를 만듭니다"""
+    rng = random.Random(seed)
+    alphabet = "abc가나"
+    keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 12))]
+    categories = {f"c{i}": keywords[i::3] for i in range(3)}
+    text = "".join(rng.choice(alphabet + " ") for _ in range(rng.randint(0, 60)))
+    return categories, text
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_pure_python_automaton_matches_pyahocorasick(seed):
+    categories, text = _random_case(seed)
+    reference = make_matcher(categories, "pyahocorasick")
+    fallback = make_matcher(categories, "python")
+
+    assert sorted(fallback._automaton.iter(text)) == sorted(reference._automaton.iter(text))
+    assert fallback.match(text) == reference.match(text)
+    assert fallback.find_keywords(text) == reference.find_keywords(text)
+    assert fallback.find_longest(text) == reference.find_longest(text)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_automaton_finds_every_occurrence(backend, seed):
+    categories, text = _random_case(seed)
+    matcher = make_matcher(categories, backend)
+    expected = sorted(
+        (start + len(keyword) - 1, keyword)
+        for keyword in matcher._keyword_categories
+        for start in range(len(text))
+        if text.startswith(keyword, start)
+    )
+    assert sorted(matcher._automaton.iter(text)) == expected
+
+
+def test_match_scores_and_case_insensitivity(backend):
+    matcher = make_matcher({"pain": ["두통", "Headache", "치통"], "cold": ["감기"]}, backend)
+    result = matcher.match("HEADACHE와 두통, 또 두통")
+    assert result == {"pain": {"keywords": ["두통", "headache"], "hits": 3, "score": round(2 / 3, 4)}}
+    assert matcher.categories_of("headache") == ["pain"]
@@ -0,0 +1,121 @@
+"""문자 n-gram TF-IDF 인덱스 단위 테스트 (작은 말뭉치에서 상위 k개 검색)"""
+
+import math
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.rag.tfidf_index import (  # noqa: E402
+    MAX_DF,
+    CharNgramTfidfIndex,
+    hash_ngrams,
+    normalize_for_ngrams,
+)
+
+CORPUS = [
+    ("타이레놀", "아세트아미노펜은 두통과 발열에 사용하는 해열진통제입니다."),
+    ("부루펜", "이부프로펜은 염증과 통증을 줄이는 소염진통제입니다."),
+    ("아스피린", "아스피린은 혈전 예방과 통증 완화에 쓰입니다. 위장 출혈에 주의하세요."),
+    ("메트포르민", "메트포르민은 제2형 당뇨병 환자의 혈당을 낮춥니다."),
+    ("와파린", "와파린은 혈액 응고를 막는 항응고제로 출혈 위험이 있습니다."),
+    ("오메프라졸", "오메프라졸은 위산 분비를 억제하여 위궤양을 치료합니다."),
+]
+
+
+def reference_scores(passages, query):
+    """같은 n-gram 해시로 계산한 밀집 코사인 유사도 기준 구현"""
+    docs = [Counter(hash_ngrams(normalize_for_ngrams(f"{title} {text}")).tolist()) for title, text in passages]
+    n_docs = len(docs)
+    df = Counter(feature for doc in docs for feature in doc)
+
+    def idf(feature):
+        if df[feature] > max(MAX_DF * n_docs, 1):
+            return 0.0
+        return math.log((1 + n_docs) / (1 + df[feature])) + 1
+
+    def vector(counts):
+        weights = {f: (1 + math.log(c)) * idf(f) for f, c in counts.items()}
+        weights = {f: w for f, w in weights.items() if w > 0}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {f: w / norm for f, w in weights.items()}
+
+    q = vector(Counter(hash_ngrams(normalize_for_ngrams(query)).tolist()))
+    return [sum(w * vector(doc).get(f, 0.0) for f, w in q.items()) for doc in docs]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CharNgramTfidfIndex.build(CORPUS, meta={"source": "toy"})
+
+
+def test_normalize_for_ngrams():
+    assert normalize_for_ngrams("  Tylenol 500mg, 타이레놀! ") == "tylenol500mg타이레놀"
+    assert normalize_for_ngrams("ＡＢＣ") == "abc"
+    assert normalize_for_ngrams(None) == ""
+
+
+def test_build_meta(index):
+    assert index.n_docs == len(CORPUS)
+    assert index.meta["source"] == "toy"
+    assert index.meta["n_docs"] == len(CORPUS)
+    assert index.meta["nnz"] == len(index.doc_ids)
+
+
+@pytest.mark.parametrize("query, title", [
+    ("두통에 먹는 해열제", "타이레놀"),
+    ("당뇨병 혈당", "메트포르민"),
+    ("항응고제 와파린 출혈", "와파린"),
+    ("위궤양 위산", "오메프라졸"),
+    ("이부프로펜 소염", "부루펜"),
+])
+def test_search_top1(index, query, title):
+    assert index.search(query, top_k=1)[0]["title"] == title
+
+
+def test_search_matches_reference(index):
+    for query in ("출혈 위험", "통증 완화", "혈당", "진통제"):
+        expected = reference_scores(CORPUS, query)
+        assert index.score([query])[0] == pytest.approx(expected, abs=1e-5)
+
+        results = index.search(query, top_k=3)
+        ranked = sorted((score, doc_id) for doc_id, score in enumerate(expected) if score > 0)[::-1][:3]
+        assert [r["score"] for r in results] == pytest.approx([score for score, _ in ranked], abs=1e-4)
+        assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+        for result in results:
+            assert (result["title"], result["text"]) == CORPUS[result["doc_id"]]
+
+
+def test_search_top_k_and_min_score(index):
+    assert len(index.search("출혈", top_k=2)) == 2
+    assert len(index.search("출혈", top_k=100)) <= len(CORPUS)
+    assert index.search("출혈", top_k=3, min_score=1.0) == []
+    assert index.search("zzzz", top_k=3) == []
+    assert index.search("", top_k=3) == []
+
+
+def test_search_batch_matches_single(index):
+    queries = ["두통 해열", "혈당", "위산 억제"]
+    assert index.search_batch(queries, top_k=2) == [index.search(q, top_k=2) for q in queries]
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    index_dir = str(tmp_path / "rag_index")
+    index.save(index_dir)
+    index.save(index_dir)  # 기존 인덱스 교체
+    assert not (tmp_path / "rag_index.tmp").exists()
+    assert not (tmp_path / "rag_index.old").exists()
+
+    loaded = CharNgramTfidfIndex.load(index_dir)
+    assert loaded.meta == index.meta
+    assert loaded.n_docs == index.n_docs
+    assert [loaded.get_passage(i) for i in range(loaded.n_docs)] == [index.get_passage(i) for i in range(index.n_docs)]
+    for query in ("출혈 위험", "당뇨병"):
+        assert loaded.search(query, top_k=3) == index.search(query, top_k=3)
+
+
+def test_empty_index():
+    index = CharNgramTfidfIndex.build([])
+    assert index.n_docs == 0
+    assert index.search("두통") == []
@@ -0,0 +1,97 @@
+"""TTS 문장 청크 분할(SentenceBuffer) 단위 테스트"""
+
+import random
+
+import pytest
+
+from utils.voice.tts_stream import SentenceBuffer, split_sentences
+
+ANSWER = (
+    "타이레놀은 해열진통제입니다. 하루 최대 4000mg을 넘기지 마세요. "
+    "술을 마신 뒤에는 복용하지 않는 것이 좋습니다! 간 질환이 있나요? "
+    "그렇다면 의사와 상담하세요.\n복용 간격은 4시간 이상입니다."
+)
+
+
+def feed_all(buffer: SentenceBuffer, pieces):
+    chunks = []
+    for piece in pieces:
+        chunks.extend(buffer.feed(piece))
+    return chunks + buffer.flush()
+
+
+def test_first_chunk_is_single_sentence():
+    buffer = SentenceBuffer(min_chars=40)
+    assert buffer.feed("안녕하세요. 타이레놀은") == ["안녕하세요."]
+    assert buffer.emitted == 1
+
+
+def test_later_chunks_merge_up_to_min_chars():
+    chunks = split_sentences(ANSWER, min_chars=40)
+    assert chunks[0] == "타이레놀은 해열진통제입니다."
+    # 첫 청크 이후는 min_chars를 채울 때까지 문장을 합치고, 마지막 청크만 짧을 수 있음
+    assert all(len(chunk) >= 40 for chunk in chunks[1:-1])
+    assert chunks[1] == "하루 최대 4000mg을 넘기지 마세요. 술을 마신 뒤에는 복용하지 않는 것이 좋습니다!"
+    assert " ".join(chunks) == " ".join(ANSWER.split())
+
+
+def test_min_chars_one_gives_one_sentence_per_chunk():
+    assert split_sentences(ANSWER, min_chars=1) == [
+        "타이레놀은 해열진통제입니다.",
+        "하루 최대 4000mg을 넘기지 마세요.",
+        "술을 마신 뒤에는 복용하지 않는 것이 좋습니다!",
+        "간 질환이 있나요?",
+        "그렇다면 의사와 상담하세요.",
+        "복용 간격은 4시간 이상입니다.",
+    ]
+
+
+def test_incomplete_sentence_waits_for_more_text():
+    buffer = SentenceBuffer(min_chars=1)
+    assert buffer.feed("타이레놀은 해열") == []
+    assert buffer.feed("진통제입니다") == []
+    # 마침표 뒤 공백이 와야 문장이 끝난 것으로 봄 (4.5mg 같은 소수점 보호)
+    assert buffer.feed(".") == []
+    assert buffer.feed(" 하루") == ["타이레놀은 해열진통제입니다."]
+    assert buffer.flush() == ["하루"]
+    assert buffer.flush() == []
+
+
+def test_long_sentence_split_at_clauses_then_words():
+    sentence = "두통, 치통, 생리통에 사용하며 " + "매우 " * 30 + "효과적입니다."
+    chunks = split_sentences(sentence, min_chars=1, max_chars=30)
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert chunks[0].startswith("두통, 치통, 생리통에")
+    assert " ".join(chunks) == sentence
+    assert split_sentences("가나다라마바사, 아자차카타파하.", min_chars=1, max_chars=10) == [
+        "가나다라마바사,", "아자차카타파하."
+    ]
+
+
+def test_long_unfinished_sentence_is_emitted_early():
+    buffer = SentenceBuffer(min_chars=1, max_chars=30)
+    chunks = buffer.feed("매우 " * 20)
+    assert chunks and all(len(chunk) <= 30 for chunk in chunks)
+    assert " ".join(chunks + buffer.flush()) == " ".join(["매우"] * 20)
+
+
+def test_merged_chunk_respects_max_chars():
+    text = " ".join(f"문장{i}입니다." for i in range(20))
+    chunks = split_sentences(text, min_chars=100, max_chars=40)
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_blank_text():
+    assert split_sentences("") == []
+    assert split_sentences("  \n\n ") == []
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_streaming_matches_batch(seed):
+    # LLM 토큰처럼 임의 위치에서 잘라 넣어도 한 번에 나눈 결과와 같아야 함
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(ANSWER)), rng.randint(1, 30)))
+    pieces = [ANSWER[start:end] for start, end in zip([0] + cuts, cuts + [len(ANSWER)])]
+    min_chars = rng.choice([1, 20, 40, 80])
+    assert feed_all(SentenceBuffer(min_chars), pieces) == split_sentences(ANSWER, min_chars)
@@ -0,0 +1,105 @@
+"""앱 시작 워밍업(WarmupManager) 단위 테스트"""
+
+import asyncio
+import threading
+import time
+
+from core.warmup import WarmupManager
+
+
+def run(manager: WarmupManager, timeout: float = 1.0):
+    asyncio.run(manager.run(timeout))
+    return manager.get_status()
+
+
+def test_sync_and_async_components():
+    async def async_component():
+        return {"kind": "async"}
+
+    manager = WarmupManager()
+    manager.register("sync", lambda: {"kind": "sync"}, required=True)
+    manager.register("async", async_component)
+    manager.register("no_detail", lambda: None)
+    status = run(manager)
+
+    assert status["ready"] is True
+    assert status["degraded"] is False
+    assert status["components"]["sync"]["detail"] == {"kind": "sync"}
+    assert status["components"]["async"]["detail"] == {"kind": "async"}
+    assert "detail" not in status["components"]["no_detail"]
+    assert all(result["status"] == "ok" for result in status["components"].values())
+    assert all(result["duration_ms"] >= 0 for result in status["components"].values())
+
+
+def test_required_failure_is_not_ready():
+    def broken():
+        raise RuntimeError("데이터 없음")
+
+    manager = WarmupManager()
+    manager.register("database", lambda: None, required=True)
+    manager.register("drug_kb", broken, required=True)
+    status = run(manager)
+
+    assert status["ready"] is False
+    assert status["components"]["drug_kb"] == {
+        "status": "error", "required": True, "error": "데이터 없음",
+        "duration_ms": status["components"]["drug_kb"]["duration_ms"]
+    }
+
+
+def test_optional_failure_is_degraded():
+    def broken():
+        raise RuntimeError("tesseract 없음")
+
+    manager = WarmupManager()
+    manager.register("database", lambda: None, required=True)
+    manager.register("tesseract", broken)
+    status = run(manager)
+
+    assert status["ready"] is True
+    assert status["degraded"] is True
+
+
+def test_timeout_keeps_timeout_result():
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow_thread():
+        release.wait(5)
+        finished.set()
+        return {"late": True}
+
+    async def slow_coroutine():
+        await asyncio.sleep(5)
+
+    async def scenario():
+        manager = WarmupManager()
+        manager.register("thread", slow_thread, required=True)
+        manager.register("coroutine", slow_coroutine)
+        manager.register("fast", lambda: None)
+        await manager.run(0.05)
+        status = manager.get_status()
+        assert status["components"]["thread"]["status"] == "timeout"
+        assert status["components"]["coroutine"]["status"] == "timeout"
+        assert status["components"]["fast"]["status"] == "ok"
+
+        # 제한 시간 뒤에 스레드 작업이 끝나도 결과와 소요 시간을 덮어쓰지 않음
+        release.set()
+        assert await asyncio.to_thread(finished.wait, 5)
+        await asyncio.sleep(0.05)
+        return manager.get_status()
+
+    status = asyncio.run(scenario())
+    assert status["ready"] is False
+    assert status["degraded"] is True
+    for name in ("thread", "coroutine"):
+        assert status["components"][name]["status"] == "timeout"
+        assert status["components"][name]["duration_ms"] == 50.0
+        assert "detail" not in status["components"][name]
+
+
+def test_status_before_run():
+    manager = WarmupManager()
+    manager.register("database", lambda: time.sleep(0), required=True)
+    status = manager.get_status()
+    assert status == {"ready": False, "degraded": False, "warmup_duration_ms": None, "components": {}}
@@ -0,0 +1,147 @@
+"""watsonx 생성 요청 헤지(p95 초과 시 중복 요청) 단위 테스트"""
+
+import asyncio
+
+import pytest
+
+from core.config import settings
+from utils.watsonx.async_client import WatsonxAsyncClient, WatsonxError
+from utils.watsonx.circuit_breaker import CircuitOpenError
+from utils.watsonx.model_pool import ModelPool
+
+HEDGE_DELAY = 0.05
+
+
+class FakeAttempts:
+    """_attempt_generation 대신 쓰는 가짜 호출 (호출 순서대로 (지연, 결과 또는 예외))"""
+
+    def __init__(self, *plans):
+        self.plans = list(plans)
+        self.calls = 0
+        self.cancelled = []
+
+    async def __call__(self, body):
+        index = self.calls
+        self.calls += 1
+        delay, outcome = self.plans[index]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_client(monkeypatch, attempts: FakeAttempts, delay=HEDGE_DELAY) -> WatsonxAsyncClient:
+    client = WatsonxAsyncClient()
+    monkeypatch.setattr(client, "_attempt_generation", attempts)
+    monkeypatch.setattr(client, "_hedge_delay", lambda: delay)
+    return client
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_hedge_delay_uses_p95(monkeypatch):
+    client = WatsonxAsyncClient()
+    monkeypatch.setattr(settings, "WATSONX_HEDGING_ENABLED", False)
+    assert client._hedge_delay() is None
+
+    monkeypatch.setattr(settings, "WATSONX_HEDGING_ENABLED", True)
+    monkeypatch.setattr(settings, "WATSONX_HEDGE_MIN_SAMPLES", 20)
+    monkeypatch.setattr(settings, "WATSONX_HEDGE_MIN_DELAY", 0.5)
+    for _ in range(19):
+        client.breaker._latencies.append(2.0)
+    assert client._hedge_delay() is None  # 표본이 부족하면 헤지하지 않음
+    client.breaker._latencies.append(3.0)
+    assert client._hedge_delay() == 3.0
+
+    client.breaker._latencies.clear()
+    client.breaker._latencies.extend([0.1] * 20)
+    assert client._hedge_delay() == 0.5  # 최소 대기 시간
+
+
+def test_no_hedge_without_delay(monkeypatch):
+    attempts = FakeAttempts((0.0, {"id": "primary"}))
+    client = make_client(monkeypatch, attempts, delay=None)
+    assert run(client._post_generation({})) == {"id": "primary"}
+    assert attempts.calls == 1
+
+
+def test_fast_primary_is_not_hedged(monkeypatch):
+    attempts = FakeAttempts((0.0, {"id": "primary"}))
+    client = make_client(monkeypatch, attempts)
+    assert run(client._post_generation({})) == {"id": "primary"}
+    assert attempts.calls == 1
+    assert client.hedge_stats == {"hedged": 0, "hedge_won": 0}
+
+
+def test_hedge_wins_and_cancels_primary(monkeypatch):
+    attempts = FakeAttempts((5.0, {"id": "primary"}), (0.0, {"id": "hedge"}))
+    client = make_client(monkeypatch, attempts)
+    assert run(client._post_generation({})) == {"id": "hedge"}
+    assert client.hedge_stats == {"hedged": 1, "hedge_won": 1}
+    assert attempts.cancelled == [0]
+
+
+def test_primary_wins_after_hedge(monkeypatch):
+    attempts = FakeAttempts((HEDGE_DELAY * 2, {"id": "primary"}), (5.0, {"id": "hedge"}))
+    client = make_client(monkeypatch, attempts)
+    assert run(client._post_generation({})) == {"id": "primary"}
+    assert client.hedge_stats == {"hedged": 1, "hedge_won": 0}
+    assert attempts.cancelled == [1]
+
+
+def test_primary_failure_falls_back_to_hedge(monkeypatch):
+    attempts = FakeAttempts((HEDGE_DELAY * 2, WatsonxError("primary")), (HEDGE_DELAY * 4, {"id": "hedge"}))
+    client = make_client(monkeypatch, attempts)
+    assert run(client._post_generation({})) == {"id": "hedge"}
+    assert client.hedge_stats["hedge_won"] == 1
+
+
+def test_both_fail_raises_primary_error(monkeypatch):
+    attempts = FakeAttempts((HEDGE_DELAY * 2, WatsonxError("primary")), (0.0, WatsonxError("hedge")))
+    client = make_client(monkeypatch, attempts)
+    with pytest.raises(WatsonxError, match="primary"):
+        run(client._post_generation({}))
+    assert client.hedge_stats == {"hedged": 1, "hedge_won": 0}
+
+
+def test_no_hedge_without_free_slot(monkeypatch):
+    monkeypatch.setattr(ModelPool, "has_free_slot", property(lambda self: False))
+    attempts = FakeAttempts((HEDGE_DELAY * 2, {"id": "primary"}))
+    client = make_client(monkeypatch, attempts)
+    assert run(client._post_generation({})) == {"id": "primary"}
+    assert attempts.calls == 1
+    assert client.hedge_stats["hedged"] == 0
+
+
+@pytest.mark.parametrize("cancel_after", [HEDGE_DELAY / 2, HEDGE_DELAY * 2])
+def test_caller_cancel_cancels_attempts(monkeypatch, cancel_after):
+    # 헤지 대기 중 또는 헤지 후에 호출자가 취소되어도 진행 중인 요청이 남지 않아야 함
+    attempts = FakeAttempts((5.0, {"id": "primary"}), (5.0, {"id": "hedge"}))
+    client = make_client(monkeypatch, attempts)
+
+    async def scenario():
+        task = asyncio.ensure_future(client._post_generation({}))
+        await asyncio.sleep(cancel_after)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        # asyncio.run()이 종료하며 남은 작업을 취소하기 전에 확인
+        assert attempts.calls and sorted(attempts.cancelled) == list(range(attempts.calls))
+
+    run(scenario())
+
+
+def test_open_breaker_rejects_before_attempt(monkeypatch):
+    attempts = FakeAttempts()
+    client = make_client(monkeypatch, attempts)
+    client.breaker._transition(client.breaker.OPEN)
+    with pytest.raises(CircuitOpenError):
+        run(client._post_generation({}))
+    assert attempts.calls == 0
@@ -1,7 +1,8 @@
 import os
+import re
+import json
 import tempfile
-import httpx
-import base64
+import unicodedata
 try:
     import magic
     MAGIC_AVAILABLE = True
@@ -9,68 +10,32 @@ except ImportError:
     MAGIC_AVAILABLE = False
     print("Warning: python-magic not available. File type detection will use filename extensions.")
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, StreamingResponse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import io
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-# IBM Watson imports
-from ibm_watson import SpeechToTextV1, TextToSpeechV1
-from ibm_cloud_sdk_core.authenticators import IAMAuthenticator
-from ibm_watson.websocket import RecognizeCallback, AudioSource
-
 # Audio processing
 from pydub import AudioSegment
 from pydub.exceptions import CouldntDecodeError
 
 # Configuration
 from core.config import settings
-from api.chat import get_chat_response
+from core.timing import RequestTimer, start_request_timer, timed_stage
+from api.chat import get_chat_response, prepare_chat_stream, stream_chat_text, AGENT_NAMES
+from utils.drug_kb import drug_kb
+from utils.voice import (
+    watson_audio_client, AudioServiceBusyError, CONCATENABLE_FORMATS, SentenceBuffer, split_sentences,
+    synthesize_in_order, TranscriptCollector
+)
+from utils.cache import tts_cache
 from schemas.chat import ChatRequest
 
 # APIRouter 인스턴스 생성
 router = APIRouter()
 
-# IBM Watson 서비스 인스턴스 (Singleton 패턴)
-_stt_service: Optional[SpeechToTextV1] = None
-_tts_service: Optional[TextToSpeechV1] = None
-
-
-def get_stt_service() -> SpeechToTextV1:
-    """IBM Watson Speech-to-Text 서비스 인스턴스를 반환합니다"""
-    global _stt_service
-    if _stt_service is None:
-        if not settings.WATSON_STT_API_KEY:
-            raise HTTPException(
-                status_code=500,
-                detail="IBM Watson STT API 키가 설정되지 않았습니다."
-            )
-        
-        authenticator = IAMAuthenticator(settings.WATSON_STT_API_KEY)
-        _stt_service = SpeechToTextV1(authenticator=authenticator)
-        _stt_service.set_service_url(settings.WATSON_STT_URL)
-    
-    return _stt_service
-
-
-def get_tts_service() -> TextToSpeechV1:
-    """IBM Watson Text-to-Speech 서비스 인스턴스를 반환합니다"""
-    global _tts_service
-    if _tts_service is None:
-        if not settings.WATSON_TTS_API_KEY:
-            raise HTTPException(
-                status_code=500,
-                detail="IBM Watson TTS API 키가 설정되지 않았습니다."
-            )
-        
-        authenticator = IAMAuthenticator(settings.WATSON_TTS_API_KEY)
-        _tts_service = TextToSpeechV1(authenticator=authenticator)
-        _tts_service.set_service_url(settings.WATSON_TTS_URL)
-    
-    return _tts_service
-
 
 def validate_audio_file(file_content: bytes, max_size: int = 10 * 1024 * 1024) -> Dict[str, Any]:
     """오디오 파일을 검증하고 메타데이터를 반환합니다"""
@@ -152,8 +117,147 @@ def convert_audio_format(file_content: bytes, target_format: str = "wav") -> byt
         )
 
 
+# Watson STT가 지원하는 content-type으로 매핑
+WATSON_CONTENT_TYPES = {
+    'audio/wav': 'audio/wav',
+    'audio/x-wav': 'audio/wav',
+    'audio/mpeg': 'audio/mp3',
+    'audio/mp4': 'audio/mp4',
+    'audio/ogg': 'audio/ogg',
+    'audio/webm': 'audio/webm',
+    'audio/flac': 'audio/flac',
+    'audio/unknown': 'audio/wav'  # 기본값
+}
+
+
+def make_tts_safe_text(text: str) -> str:
+    """TTS 호환을 위해 이모지/특수문자/마크다운을 제거하고 Latin-1 호환 텍스트로 정리합니다"""
+    # 1. 모든 이모지와 특수문자 완전 제거
+    cleaned = ''.join(char for char in text if unicodedata.category(char) not in ['So', 'Sk', 'Sm', 'Cn'])
+
+    # 2. 마크다운 제거
+    cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
+    cleaned = re.sub(r'\n+', ' ', cleaned)
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+
+    # 3. Latin-1로 인코딩 불가능한 문자는 공백으로 대체
+    safe_chars = []
+    for char in cleaned:
+        try:
+            char.encode('latin-1')
+            safe_chars.append(char)
+        except UnicodeEncodeError:
+            safe_chars.append(' ')
+
+    # 4. 연속된 공백 정리
+    return re.sub(r'\s+', ' ', ''.join(safe_chars)).strip()
+
+
+async def synthesize_cached(cleaned_text: str, voice: str, audio_format: str,
+                            cache_key: Optional[str] = None) -> tuple:
+    """TTS 캐시를 먼저 확인하고, 없으면 Watson으로 합성해 저장합니다
+
+    Returns:
+        tuple: (오디오 바이트, 캐시 출처 "memory" | "disk" | "miss" | "disabled")
+    """
+    cache_key = cache_key or tts_cache.make_key(cleaned_text, voice, audio_format)
+    audio_content, cache_status = await tts_cache.get(cache_key)
+    if audio_content is None:
+        audio_content = await watson_audio_client.synthesize(cleaned_text, voice, audio_format)
+        await tts_cache.set(cache_key, audio_content)
+    return audio_content, cache_status
+
+
+async def _stream_audio_chunks(first_chunk: bytes, stream):
+    """첫 청크를 보낸 뒤 나머지 청크를 합성되는 대로 순서대로 보냅니다"""
+    try:
+        yield first_chunk
+        async for audio_chunk in stream:
+            yield audio_chunk
+    except Exception as e:
+        # 이미 응답이 시작되어 상태 코드를 바꿀 수 없으므로 기록만 하고 스트림을 끝냄
+        print(f"❌ TTS 청크 합성 실패, 스트림을 종료합니다: {e}")
+    finally:
+        await stream.aclose()
+
+
+async def stream_synthesis_response(chunks, voice: str, audio_format: str, headers: Dict[str, str],
+                                    timer: Optional[RequestTimer]) -> StreamingResponse:
+    """텍스트 청크(목록 또는 비동기 이터레이터)를 동시에 합성해 순서대로 스트리밍하는 응답을 만듭니다
+
+    청크마다 TTS 캐시를 사용합니다. 첫 청크까지는 기다려서 합성 실패를 일반 HTTP 오류로 돌려줍니다.
+    """
+    async def synthesize_chunk(chunk: str) -> bytes:
+        audio_chunk, _ = await synthesize_cached(chunk, voice, audio_format)
+        return audio_chunk
+
+    stream = synthesize_in_order(chunks, synthesize_chunk, settings.TTS_CHUNK_CONCURRENCY)
+    with timed_stage("tts_first_audio"):
+        try:
+            first_chunk = await stream.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b""  # 읽을 문장이 없음
+        except BaseException:
+            await stream.aclose()
+            raise
+
+    if timer is not None:
+        headers.update(timer.headers())
+    return StreamingResponse(
+        _stream_audio_chunks(first_chunk, stream),
+        media_type=f"audio/{audio_format}",
+        headers=headers
+    )
+
+
+async def synthesize_response(cleaned_text: str, voice: str, audio_format: str, cache_key: str,
+                              headers: Dict[str, str], timer: Optional[RequestTimer]) -> StreamingResponse:
+    """정리된 텍스트를 합성해 오디오 스트리밍 응답을 만듭니다
+
+    mp3/ogg는 문장 단위로 나눠 동시에 합성하고, 첫 문장이 준비되는 즉시 재생할 수 있도록
+    순서대로 이어 보냅니다 (문장별로 TTS 캐시 사용). 그 외 형식이나 한 문장짜리 텍스트는 한 번에 합성합니다.
+    """
+    chunks = [cleaned_text]
+    if settings.TTS_CHUNKING_ENABLED and audio_format in CONCATENABLE_FORMATS:
+        chunks = split_sentences(cleaned_text, settings.TTS_CHUNK_MIN_CHARS, settings.TTS_CHUNK_MAX_CHARS) or chunks
+
+    if len(chunks) > 1:
+        headers["X-TTS-Chunks"] = str(len(chunks))
+        return await stream_synthesis_response(chunks, voice, audio_format, headers, timer)
+
+    with timed_stage("tts"):
+        audio_content, cache_status = await synthesize_cached(cleaned_text, voice, audio_format, cache_key)
+    headers.update({"Content-Length": str(len(audio_content)), "X-TTS-Cache": cache_status})
+    if timer is not None:
+        headers.update(timer.headers())
+    return StreamingResponse(iter([audio_content]), media_type=f"audio/{audio_format}", headers=headers)
+
+
+async def _answer_sentences(chat_request: ChatRequest, prepared: Dict[str, Any]) -> AsyncIterator[str]:
+    """생성 중인 답변을 문장 청크로 나눠 TTS 호환 텍스트로 정리해 반환합니다 (빈 문장 제외)"""
+    buffer = SentenceBuffer(settings.TTS_CHUNK_MIN_CHARS, settings.TTS_CHUNK_MAX_CHARS)
+    async for chunk in stream_chat_text(chat_request, prepared):
+        for sentence in buffer.feed(chunk):
+            cleaned_text = make_tts_safe_text(sentence)
+            if cleaned_text:
+                yield cleaned_text
+    for sentence in buffer.flush():
+        cleaned_text = make_tts_safe_text(sentence)
+        if cleaned_text:
+            yield cleaned_text
+
+
+def _with_timing(result: Dict[str, Any], timer: Optional[RequestTimer], response: Response) -> Dict[str, Any]:
+    """JSON 응답에 단계별 처리 시간(debug 필드)과 Server-Timing 헤더를 붙입니다"""
+    if timer is not None:
+        result["debug"] = timer.as_dict()
+        response.headers.update(timer.headers())
+    return result
+
+
 @router.post("/voice/stt", summary="음성을 텍스트로 변환")
 async def speech_to_text(
+    response: Response,
     audio_file: UploadFile = File(..., description="변환할 오디오 파일"),
     model: str = Form(default="ko-KR_BroadbandModel", description="사용할 STT 모델"),
     confidence_threshold: float = Form(default=0.5, description="신뢰도 임계값")
@@ -164,74 +268,45 @@ async def speech_to_text(
     - **audio_file**: 음성 파일 (WAV, MP3, MP4, OGG, WebM, FLAC 지원)
     - **model**: IBM Watson STT 모델 (기본: 한국어 광대역 모델)
     - **confidence_threshold**: 결과 신뢰도 최소 임계값
+    
+    단계별 처리 시간은 `Server-Timing` 헤더와 응답의 `debug` 필드로 전달됩니다.
     """
+    timer = start_request_timer()
     try:
         # 파일 읽기
-        file_content = await audio_file.read()
+        with timed_stage("upload_read"):
+            file_content = await audio_file.read()
         
         # 파일 검증
-        validation_result = validate_audio_file(file_content)
+        with timed_stage("validate"):
+            validation_result = validate_audio_file(file_content)
         
-        # 원본 파일의 MIME 타입 감지
+        # 원본 파일의 MIME 타입을 Watson이 지원하는 content-type으로 매핑
         original_type = validation_result.get('file_type', 'audio/unknown')
+        watson_content_type = WATSON_CONTENT_TYPES.get(original_type, 'audio/wav')
         
-        # Watson이 지원하는 content-type으로 매핑
-        content_type_mapping = {
-            'audio/wav': 'audio/wav',
-            'audio/x-wav': 'audio/wav', 
-            'audio/mpeg': 'audio/mp3',
-            'audio/mp4': 'audio/mp4',
-            'audio/ogg': 'audio/ogg',
-            'audio/webm': 'audio/webm',
-            'audio/flac': 'audio/flac',
-            'audio/unknown': 'audio/wav'  # 기본값
-        }
-        
-        watson_content_type = content_type_mapping.get(original_type, 'audio/wav')
-        
-        # REST API 직접 호출로 STT 처리 (노트북 방식)
-        def direct_stt_call():
-            # Watson STT REST API 엔드포인트 (model을 URL 파라미터로)
-            stt_url = f"{settings.WATSON_STT_URL}/v1/recognize?model={model}"
-            
-            headers = {
-                'Content-Type': watson_content_type,
-                'Accept': 'application/json'
-            }
-            
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(
-                    stt_url, 
-                    headers=headers,
-                    content=file_content,  # 바이너리 오디오 데이터
-                    auth=('apikey', settings.WATSON_STT_API_KEY)  # 노트북과 동일한 인증
-                )
-            response.raise_for_status()
-            
-            return response.json()
-        
-        # 음성 인식 실행
-        loop = asyncio.get_event_loop()
-        recognition_result = await loop.run_in_executor(None, direct_stt_call)
+        # 음성 인식 실행 (공유 커넥션 풀 사용)
+        with timed_stage("stt"):
+            recognition_result = await watson_audio_client.recognize(file_content, watson_content_type, model)
         
         # 결과 처리
         if not recognition_result.get('results'):
-            return {
+            return _with_timing({
                 "text": "",
                 "confidence": 0.0,
                 "message": "음성을 인식할 수 없습니다.",
                 "status": "no_speech"
-            }
+            }, timer, response)
         
         # 가장 신뢰도가 높은 결과 선택
         best_result = recognition_result['results'][0]
         if not best_result.get('alternatives'):
-            return {
+            return _with_timing({
                 "text": "",
                 "confidence": 0.0,
                 "message": "대안 결과가 없습니다.",
                 "status": "no_alternatives"
-            }
+            }, timer, response)
         
         best_alternative = best_result['alternatives'][0]
         confidence = best_alternative.get('confidence', 0.0)
@@ -239,14 +314,14 @@ async def speech_to_text(
         
         # 신뢰도 검증
         if confidence < confidence_threshold:
-            return {
+            return _with_timing({
                 "text": transcript,
                 "confidence": confidence,
                 "message": f"음성 인식 신뢰도가 낮습니다 ({confidence:.2f} < {confidence_threshold})",
                 "status": "low_confidence"
-            }
+            }, timer, response)
         
-        return {
+        return _with_timing({
             "text": transcript,
             "confidence": confidence,
             "message": "음성 인식 성공",
@@ -257,7 +332,7 @@ async def speech_to_text(
                 "alternatives_count": len(best_result['alternatives']),
                 "word_count": len(transcript.split())
             }
-        }
+        }, timer, response)
         
     except HTTPException:
         raise
@@ -268,11 +343,107 @@ async def speech_to_text(
         )
 
 
+@router.websocket("/voice/stream")
+async def speech_to_text_stream(
+    websocket: WebSocket,
+    model: str = "ko-KR_BroadbandModel",
+    confidence_threshold: float = 0.5,
+    content_type: str = "audio/webm;codecs=opus",
+    interim_results: bool = True
+):
+    """
+    실시간 음성 인식 (WebSocket). 말하는 동안 오디오를 보내면 중간/최종 인식 결과를 바로 받습니다.
+    
+    쿼리 파라미터:
+    - **model**: IBM Watson STT 모델 (기본: 한국어 광대역 모델)
+    - **confidence_threshold**: 결과 신뢰도 최소 임계값 (`/voice/stt`와 같은 기준)
+    - **content_type**: 오디오 형식 (기본: 브라우저 MediaRecorder의 `audio/webm;codecs=opus`,
+      PCM이면 `audio/l16;rate=16000`)
+    - **interim_results**: 중간 결과 전송 여부
+    
+    클라이언트 → 서버: 오디오 프레임(binary), 녹음이 끝나면 `{"action": "stop"}`(text)
+    
+    서버 → 클라이언트 (JSON):
+    - `{"type": "listening"}`: 오디오를 보내도 됨
+    - `{"type": "interim", "result_index", "text"}`: 중간 결과
+    - `{"type": "final", "result_index", "text", "confidence", "status", "message"}`: 문장별 최종 결과
+    - `{"type": "end", "text", "confidence", "status", "message", "metadata"}`: 종료 요청 후 전체 결과
+      (`status`: success, low_confidence, no_speech)
+    - `{"type": "error", "message"}`: 오류 (이후 연결 종료)
+    """
+    await websocket.accept()
+    collector = TranscriptCollector(confidence_threshold)
+
+    try:
+        async with watson_audio_client.recognize_stream(model, content_type, interim_results) as stream:
+
+            async def forward_audio():
+                """클라이언트 오디오를 Watson으로 전달하고, stop을 받으면 종료를 알립니다"""
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    if message.get("bytes"):
+                        await stream.send_audio(message["bytes"])
+                    elif message.get("text"):
+                        try:
+                            action = json.loads(message["text"]).get("action")
+                        except (ValueError, AttributeError):
+                            action = None
+                        if action == "stop":
+                            await stream.stop()
+                            return
+
+            async def relay_results():
+                """Watson 결과를 클라이언트 이벤트로 바꿔 보냅니다"""
+                async for result in stream.messages():
+                    for event in collector.handle(result):
+                        await websocket.send_json(event)
+                    if collector.finished:
+                        return
+
+            audio_task = asyncio.create_task(forward_audio())
+            results_task = asyncio.create_task(relay_results())
+            try:
+                done, _ = await asyncio.wait({audio_task, results_task}, return_when=asyncio.FIRST_COMPLETED)
+                if audio_task in done:
+                    audio_task.result()  # 클라이언트 연결 종료는 여기서 전파
+                    # 종료 요청 후 남은 최종 결과를 기다림
+                    await asyncio.wait_for(results_task, timeout=settings.WATSON_STT_STREAM_FINAL_TIMEOUT)
+                else:
+                    results_task.result()
+            finally:
+                for task in (audio_task, results_task):
+                    task.cancel()
+                await asyncio.gather(audio_task, results_task, return_exceptions=True)
+
+        if collector.error is None:
+            await websocket.send_json(collector.summary())
+        await websocket.close(code=1000 if collector.error is None else 1011)
+
+    except WebSocketDisconnect:
+        return
+    except AudioServiceBusyError as e:
+        await websocket.send_json({"type": "error", "message": e.detail})
+        await websocket.close(code=1013)
+    except asyncio.TimeoutError:
+        # 최종 결과를 모두 받지 못했어도 받은 결과까지는 돌려줌
+        await websocket.send_json(collector.summary())
+        await websocket.close(code=1000)
+    except Exception as e:
+        try:
+            await websocket.send_json({"type": "error", "message": f"음성 인식 중 오류가 발생했습니다: {str(e)}"})
+            await websocket.close(code=1011)
+        except (RuntimeError, WebSocketDisconnect):
+            pass  # 이미 닫힌 연결
+
+
 @router.post("/voice/tts", summary="텍스트를 음성으로 변환")
 async def text_to_speech(
     text: str = Form(..., description="음성으로 변환할 텍스트"),
     voice: str = Form(default="ko-KR_HyunjunVoice", description="사용할 TTS 음성"),
-    audio_format: str = Form(default="mp3", description="출력 오디오 형식")
+    audio_format: str = Form(default="mp3", description="출력 오디오 형식"),
+    if_none_match: Optional[str] = Header(default=None, description="이전에 받은 ETag (같으면 304)")
 ):
     """
     텍스트를 음성으로 변환하여 오디오 파일을 반환합니다.
@@ -280,7 +451,14 @@ async def text_to_speech(
     - **text**: 음성으로 변환할 텍스트
     - **voice**: IBM Watson TTS 음성 (기본: 한국어 Jin 음성)
     - **audio_format**: 출력 형식 (mp3, wav, flac, ogg)
+    
+    mp3/ogg는 문장 단위로 나눠 동시에 합성하고 첫 문장부터 순서대로 스트리밍합니다 (`X-TTS-Chunks` 헤더).
+    같은 텍스트/음성/형식의 음성은 캐시에서 바로 반환합니다 (`X-TTS-Cache` 헤더: memory, disk, miss).
+    응답의 `ETag`를 `If-None-Match`로 보내면 이미 가진 음성은 본문 없이 304로 응답합니다.
+    
+    단계별 처리 시간은 `Server-Timing` 헤더로 전달됩니다.
     """
+    timer = start_request_timer()
     try:
         if not text.strip():
             raise HTTPException(
@@ -302,114 +480,18 @@ async def text_to_speech(
                 detail=f"지원하지 않는 오디오 형식입니다. 지원 형식: {', '.join(supported_formats)}"
             )
         
-        # 음성 합성 실행
-        loop = asyncio.get_event_loop()
+        # 이모지/특수문자 제거 후 캐시 키 계산 (키가 곧 ETag)
+        cleaned_text = make_tts_safe_text(text)
+        cache_key = tts_cache.make_key(cleaned_text, voice, audio_format)
+        if tts_cache.is_not_modified(if_none_match, cache_key):
+            return Response(status_code=304, headers={"ETag": tts_cache.etag(cache_key)})
         
-        # REST API 직접 호출로 UTF-8 인코딩 문제 해결
-        def direct_tts_call():
-            # 이모지 및 특수문자 제거 (TTS 호환성을 위해)
-            import re
-            
-            # 완전한 ASCII 호환 텍스트 생성 (Latin-1 문제 완전 해결)
-            def make_tts_safe_text(text):
-                import unicodedata
-                import re
-                
-                # 1. 모든 이모지와 특수문자 완전 제거
-                cleaned = ''.join(char for char in text if unicodedata.category(char) not in ['So', 'Sk', 'Sm', 'Cn'])
-                
-                # 2. 마크다운 제거
-                cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
-                cleaned = re.sub(r'\n+', ' ', cleaned)
-                cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                
-                # 3. Latin-1로 인코딩 불가능한 모든 문자 찾아서 제거
-                safe_chars = []
-                for char in cleaned:
-                    try:
-                        char.encode('latin-1')
-                        safe_chars.append(char)
-                    except UnicodeEncodeError:
-                        # Latin-1로 인코딩 불가능한 문자는 공백으로 대체
-                        safe_chars.append(' ')
-                
-                # 4. 연속된 공백 정리
-                final_text = ''.join(safe_chars)
-                final_text = re.sub(r'\s+', ' ', final_text).strip()
-                
-                return final_text
-            
-            # 텍스트 정리 (Latin-1 완전 호환)
-            cleaned_text = make_tts_safe_text(text)  # 완전한 ASCII 호환 변환
-            
-            # Watson TTS REST API 엔드포인트 (voice는 URL 파라미터로)
-            tts_url = f"{settings.WATSON_TTS_URL}/v1/synthesize?voice={voice}"
-            
-            # Basic 인증 헤더 생성
-            auth_string = f"apikey:{settings.WATSON_TTS_API_KEY}"
-            auth_b64 = base64.b64encode(auth_string.encode('utf-8')).decode('ascii')
-            
-            headers = {
-                'Content-Type': 'application/json; charset=utf-8',  # UTF-8 명시
-                'Accept': f'audio/{audio_format}',
-                'Authorization': f'Basic {auth_b64}'
-            }
-            
-            data = {
-                'text': cleaned_text,  # 정리된 텍스트 사용
-                'voice': voice
-            }
-            
-            # HTTPX를 사용한 완전한 UTF-8 제어
-            import json
-            import httpx
-            
-            # 완벽한 UTF-8 JSON 직렬화
-            json_data = json.dumps(data, ensure_ascii=False, indent=None, separators=(',', ':'))
-            json_bytes = json_data.encode('utf-8')
-            
-            # HTTPX용 헤더 설정 (Authorization은 auth 파라미터로)
-            headers_httpx = {
-                'Content-Type': 'application/json; charset=utf-8',
-                'Accept': f'audio/{audio_format}',
-                'Content-Length': str(len(json_bytes))
-            }
-            
-            print(f"🔍 TTS 디버그: HTTPX로 UTF-8 바이트 {len(json_bytes)}개 전송")
-            
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    tts_url,
-                    headers=headers_httpx,
-                    content=json_bytes,  # 완전한 UTF-8 바이트 제어
-                    auth=('apikey', settings.WATSON_TTS_API_KEY)  # 노트북과 동일한 인증 방식
-                )
-            response.raise_for_status()
-            
-            # Watson SDK 호환을 위한 응답 객체
-            class TTSResponse:
-                def __init__(self, content):
-                    self.content = content
-            
-            return TTSResponse(response.content)
-        
-        synthesis_result = await loop.run_in_executor(None, direct_tts_call)
-        
-        # 오디오 데이터 추출
-        audio_content = synthesis_result.content
-        
-        # 응답 생성
-        def generate():
-            yield audio_content
-        
-        return StreamingResponse(
-            generate(),
-            media_type=f"audio/{audio_format}",
-            headers={
-                "Content-Disposition": f"attachment; filename=tts_output.{audio_format}",
-                "Content-Length": str(len(audio_content))
-            }
-        )
+        # 음성 합성 실행 (캐시 미스일 때만 Watson 호출, mp3/ogg는 문장 단위 스트리밍)
+        headers = {
+            "Content-Disposition": f"attachment; filename=tts_output.{audio_format}",
+            "ETag": tts_cache.etag(cache_key)
+        }
+        return await synthesize_response(cleaned_text, voice, audio_format, cache_key, headers, timer)
         
     except HTTPException:
         raise
@@ -426,7 +508,9 @@ async def voice_chat(
     underlying_diseases: str = Form(default="", description="기저질환 (쉼표로 구분)"),
     current_medications: str = Form(default="", description="현재 복용 약물 (쉼표로 구분)"),
     tts_voice: str = Form(default="ko-KR_HyunjunVoice", description="응답 음성"),
-    audio_format: str = Form(default="mp3", description="출력 오디오 형식")
+    audio_format: str = Form(default="mp3", description="출력 오디오 형식"),
+    pipelined: Optional[bool] = Form(default=None, description="답변 생성과 TTS를 문장 단위로 겹쳐 실행 (기본: 서버 설정)"),
+    if_none_match: Optional[str] = Header(default=None, description="이전에 받은 ETag (같으면 304)")
 ):
     """
     음성 입력을 받아 STT → AI 채팅 → TTS 과정을 거쳐 음성 응답을 반환합니다.
@@ -436,58 +520,33 @@ async def voice_chat(
     2. 텍스트 → AI 채팅 응답 생성
     3. AI 응답 → 음성 변환 (TTS)
     4. 음성 파일 반환
+    
+    **파이프라인 모드** (mp3/ogg, `pipelined` 또는 VOICE_CHAT_PIPELINED): 답변을 토큰 스트림으로 받아
+    문장이 완성되는 대로 TTS에 보내고, 생성이 계속되는 동안 오디오를 순서대로 스트리밍합니다.
+    첫 음성까지의 시간은 STT + 첫 문장 생성 + 첫 문장 TTS 정도입니다.
+    `X-Agent-Used`, `X-STT-Confidence`는 응답 헤더로 먼저 전달되며,
+    답변 길이를 미리 알 수 없으므로 `X-Response-Length`, `ETag`는 보내지 않습니다.
+    
+    파이프라인을 쓰지 않으면 답변이 완성된 뒤 문장 단위로 동시에 합성해 첫 문장부터 스트리밍합니다 (mp3/ogg).
+    반복되는 답변(안내 문구, 자주 묻는 질문 등)의 음성은 TTS 캐시에서 바로 반환합니다.
+    응답의 `ETag`를 `If-None-Match`로 보내면 같은 답변 음성은 본문 없이 304로 응답합니다.
+    
+    단계별 처리 시간(STT, 분류, 프롬프트, 생성, TTS 등)은 `Server-Timing` 헤더로 전달됩니다.
     """
+    timer = start_request_timer()
     try:
         # Step 1: STT (음성 → 텍스트)
-        file_content = await audio_file.read()
-        validation_result = validate_audio_file(file_content)
+        with timed_stage("upload_read"):
+            file_content = await audio_file.read()
+        with timed_stage("validate"):
+            validation_result = validate_audio_file(file_content)
         
-        # 원본 파일의 MIME 타입 감지
+        # 원본 파일의 MIME 타입을 Watson이 지원하는 content-type으로 매핑
         original_type = validation_result.get('file_type', 'audio/unknown')
-        content_type_mapping = {
-            'audio/wav': 'audio/wav',
-            'audio/x-wav': 'audio/wav', 
-            'audio/mpeg': 'audio/mp3',
-            'audio/mp4': 'audio/mp4',
-            'audio/ogg': 'audio/ogg',
-            'audio/webm': 'audio/webm',
-            'audio/flac': 'audio/flac',
-            'audio/unknown': 'audio/wav'
-        }
-        watson_content_type = content_type_mapping.get(original_type, 'audio/wav')
-        
-        # REST API 직접 호출로 STT 처리
-        def direct_stt_call_chat():
-            # Watson STT REST API 엔드포인트
-            stt_url = f"{settings.WATSON_STT_URL}/v1/recognize"
-            
-            # Basic 인증 헤더 생성
-            auth_string = f"apikey:{settings.WATSON_STT_API_KEY}"
-            auth_b64 = base64.b64encode(auth_string.encode('utf-8')).decode('ascii')
-            
-            headers = {
-                'Authorization': f'Basic {auth_b64}',
-                'Content-Type': watson_content_type
-            }
-            
-            params = {
-                'model': 'ko-KR_BroadbandModel'
-            }
-            
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(
-                    stt_url, 
-                    headers=headers, 
-                    params=params,
-                    content=file_content,
-                )
-            response.raise_for_status()
-            
-            return response.json()
-        
-        loop = asyncio.get_event_loop()
+        watson_content_type = WATSON_CONTENT_TYPES.get(original_type, 'audio/wav')
         
-        recognition_result = await loop.run_in_executor(None, direct_stt_call_chat)
+        with timed_stage("stt"):
+            recognition_result = await watson_audio_client.recognize(file_content, watson_content_type)
         
         # STT 결과 확인
         if not recognition_result.get('results') or not recognition_result['results'][0].get('alternatives'):
@@ -505,6 +564,12 @@ async def voice_chat(
                 detail="음성에서 텍스트를 추출할 수 없습니다."
             )
         
+        # 음성 인식이 틀린 약 이름을 분류/프롬프트 전에 교정 (예: 타이레롤 → 타이레놀)
+        drug_name_corrections = []
+        if settings.DRUG_KB_ENABLED:
+            with timed_stage("normalize"):
+                user_text, drug_name_corrections = drug_kb.correct_drug_names(user_text)
+        
         # Step 2: AI 채팅 처리
         # 사용자 컨텍스트 파싱
         diseases_list = [d.strip() for d in underlying_diseases.split(',') if d.strip()] if underlying_diseases else []
@@ -517,210 +582,45 @@ async def voice_chat(
             currentMedications=medications_list
         )
         
+        # 파이프라인 모드: 답변 토큰 스트림에서 완성된 문장부터 바로 합성해 전송
+        use_pipeline = settings.VOICE_CHAT_PIPELINED if pipelined is None else pipelined
+        if use_pipeline and audio_format in CONCATENABLE_FORMATS:
+            # 컨텍스트 구성과 분류 시간은 prepare_chat_stream 안에서 context/classify 단계로 기록
+            prepared = prepare_chat_stream(chat_request)
+            pipeline_headers = {
+                "Content-Disposition": f"attachment; filename=voice_chat_response.{audio_format}",
+                "X-STT-Confidence": str(stt_confidence),
+                "X-Agent-Used": AGENT_NAMES[prepared["agent_type"]],
+                "X-Text-Length": str(len(user_text)),
+                "X-Drug-Name-Corrections": str(len(drug_name_corrections)),
+                "X-Pipelined": "true"
+            }
+            return await stream_synthesis_response(
+                _answer_sentences(chat_request, prepared), tts_voice, audio_format, pipeline_headers, timer
+            )
+        
         # AI 채팅 응답 생성
         chat_response = await get_chat_response(chat_request)
         ai_response_text = chat_response["answer"]
         
-        # Step 3: TTS (텍스트 → 음성)
-        # REST API 직접 호출로 한국어 처리
-        def direct_tts_call_chat():
-            # 이모지 및 특수문자 제거 (TTS 호환성을 위해)
-            import re
-            
-            # 완전한 ASCII 호환 텍스트 생성 (Latin-1 문제 완전 해결)
-            def make_tts_safe_text(text):
-                import unicodedata
-                import re
-                
-                # 1. 모든 이모지와 특수문자 완전 제거
-                cleaned = ''.join(char for char in text if unicodedata.category(char) not in ['So', 'Sk', 'Sm', 'Cn'])
-                
-                # 2. 마크다운 제거
-                cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
-                cleaned = re.sub(r'\n+', ' ', cleaned)
-                cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                
-                # 3. Latin-1로 인코딩 불가능한 모든 문자 찾아서 제거
-                safe_chars = []
-                for char in cleaned:
-                    try:
-                        char.encode('latin-1')
-                        safe_chars.append(char)
-                    except UnicodeEncodeError:
-                        # Latin-1로 인코딩 불가능한 문자는 공백으로 대체
-                        safe_chars.append(' ')
-                
-                # 4. 연속된 공백 정리
-                final_text = ''.join(safe_chars)
-                final_text = re.sub(r'\s+', ' ', final_text).strip()
-                
-                return final_text
-            
-            # 텍스트 정리 (Latin-1 완전 호환)
-            cleaned_text = make_tts_safe_text(ai_response_text)  # 완전한 ASCII 호환 변환
-            
-            print(f"정리된 TTS 텍스트: {repr(cleaned_text)}")
-            print(f"cleaned_text 타입: {type(cleaned_text)}")
-            print(f"cleaned_text 인코딩 테스트:")
-            try:
-                print(f"  UTF-8 인코딩: OK")
-                utf8_bytes = cleaned_text.encode('utf-8')
-                print(f"  UTF-8 바이트 길이: {len(utf8_bytes)}")
-            except Exception as e:
-                print(f"  UTF-8 인코딩 실패: {e}")
-            
-            # Watson TTS REST API 엔드포인트 (voice는 URL 파라미터로)
-            tts_url = f"{settings.WATSON_TTS_URL}/v1/synthesize?voice={tts_voice}"
-            print(f"TTS URL: {tts_url}")
-            
-            # Basic 인증 헤더 생성
-            auth_string = f"apikey:{settings.WATSON_TTS_API_KEY}"
-            auth_b64 = base64.b64encode(auth_string.encode('utf-8')).decode('ascii')
-            print(f"인증 헤더 생성: OK")
-            
-            headers = {
-                'Content-Type': 'application/json; charset=utf-8',
-                'Accept': f'audio/{audio_format}',
-                'Authorization': f'Basic {auth_b64}'
-            }
-            print(f"헤더: {headers}")
-            
-            data = {
-                'text': cleaned_text  # voice는 URL로 이동, text만 JSON에
-            }
-            print(f"데이터: {data}")
-            
-            # 🔍 LATIN-1 오류 완전 추적 및 해결
-            print("🔍 Latin-1 인코딩 문제 완전 추적 시작...")
-            
-            import json
-            import httpx
-            import traceback
-            
-            try:
-                # 1. 텍스트 문자 하나씩 Latin-1 호환성 검사
-                print(f"🔤 텍스트 분석: {repr(cleaned_text[:50])}...")
-                problematic_chars = []
-                for i, char in enumerate(cleaned_text):
-                    try:
-                        char.encode('latin-1')
-                    except UnicodeEncodeError:
-                        problematic_chars.append((i, char, ord(char)))
-                        if len(problematic_chars) >= 5:  # 처음 5개만
-                            break
-                
-                if problematic_chars:
-                    print(f"❌ Latin-1 비호환 문자 발견: {problematic_chars}")
-                    # 문제 문자들을 완전히 제거
-                    for pos, char, code in problematic_chars:
-                        cleaned_text = cleaned_text.replace(char, ' ')
-                    # 연속 공백 정리
-                    import re
-                    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-                    print(f"🔧 문제 문자 제거 후: {repr(cleaned_text[:50])}...")
-                else:
-                    print("✅ 모든 문자가 Latin-1 호환")
-                
-                # 2. Watson TTS API 정확한 파라미터 구성 (text만, voice는 URL에)
-                data = {
-                    'text': cleaned_text
-                }
-                
-                print(f"🎤 TTS 요청 음성: {tts_voice}")
-                print(f"🎤 TTS 요청 형식: {audio_format}")
-                print(f"🎤 TTS 요청 텍스트: {cleaned_text[:50]}...")
-                
-                # 3. 완벽한 UTF-8 JSON 직렬화
-                json_data = json.dumps(data, ensure_ascii=False, indent=None, separators=(',', ':'))
-                json_bytes = json_data.encode('utf-8')
-                
-                print(f"🔤 최종 JSON: {json_data[:100]}...")
-                print(f"🔤 UTF-8 바이트 수: {len(json_bytes)}")
-                
-            except Exception as e:
-                print(f"💥 텍스트 전처리 오류: {e}")
-                traceback.print_exc()
-                raise
-            
-            # 2. HTTPX로 완전한 UTF-8 제어 (Authorization은 auth 파라미터로)
-            headers_utf8 = {
-                'Content-Type': 'application/json; charset=utf-8',
-                'Accept': f'audio/{audio_format}',
-                'Content-Length': str(len(json_bytes))
-            }
-            
-            print(f"🌐 HTTPX 헤더: {headers_utf8}")
-            
-            try:
-                print("🚀 HTTPX POST 요청 시작 (완전 UTF-8 제어)...")
-                
-                # HTTPX 클라이언트로 UTF-8 완전 제어 (노트북 방식 적용)
-                with httpx.Client(timeout=30.0) as client:
-                    response = client.post(
-                        tts_url,
-                        headers=headers_utf8,
-                        content=json_bytes,  # 완전한 UTF-8 바이트 제어
-                        auth=('apikey', settings.WATSON_TTS_API_KEY)  # 노트북과 동일한 인증 방식
-                    )
-                
-                print(f"✅ HTTP 응답 상태: {response.status_code}")
-                print(f"📄 HTTP 응답 헤더: {dict(response.headers)}")
-                
-                if response.status_code != 200:
-                    print(f"❌ HTTP 오류 응답: {response.text}")
-                
-                response.raise_for_status()
-                print("🎉 HTTP 응답 성공!")
-                
-            except httpx.RequestError as e:
-                print(f"💥 HTTPX 요청 오류: {e}")
-                print(f"📝 오류 타입: {type(e)}")
-                traceback.print_exc()
-                raise Exception(f"TTS API 호출 실패: {str(e)}")
-            except Exception as e:
-                print(f"💥 예상치 못한 오류: {e}")
-                print(f"🔍 오류 타입: {type(e)}")
-                print(f"📊 오류 내용: {repr(str(e))}")
-                
-                # Latin-1 에러인지 확인
-                if 'latin-1' in str(e).lower():
-                    print("🎯 Latin-1 인코딩 오류 확인!")
-                    print("🔍 에러 발생 위치 추적:")
-                    traceback.print_exc()
-                else:
-                    traceback.print_exc()
-                raise
-            
-            # Watson SDK 호환 응답 객체
-            class TTSResponse:
-                def __init__(self, content):
-                    self.content = content
-            
-            return TTSResponse(response.content)
-        
-        synthesis_result = await loop.run_in_executor(None, direct_tts_call_chat)
-        
-        audio_content = synthesis_result.content
-        
-        # 응답 생성
-        def generate():
-            yield audio_content
+        # Step 3: TTS (텍스트 → 음성, 반복되는 답변은 캐시 사용)
+        cleaned_text = make_tts_safe_text(ai_response_text)
+        cache_key = tts_cache.make_key(cleaned_text, tts_voice, audio_format)
         
         # HTTP 헤더는 ASCII만 지원 - 한글 텍스트 완전 제거
         safe_headers = {
-            "Content-Disposition": f"attachment; filename=voice_chat_response.{audio_format}",
-            "Content-Length": str(len(audio_content)),
+            "ETag": tts_cache.etag(cache_key),
             "X-STT-Confidence": str(stt_confidence),
             "X-Agent-Used": chat_response.get("model_metadata", {}).get("agent_used", "Unknown"),
             "X-Text-Length": str(len(user_text)),
+            "X-Drug-Name-Corrections": str(len(drug_name_corrections)),
             "X-Response-Length": str(len(ai_response_text))
         }
+        if tts_cache.is_not_modified(if_none_match, cache_key):
+            return Response(status_code=304, headers=safe_headers)
         
-        return StreamingResponse(
-            generate(),
-            media_type=f"audio/{audio_format}",
-            headers=safe_headers
-        )
+        safe_headers["Content-Disposition"] = f"attachment; filename=voice_chat_response.{audio_format}"
+        return await synthesize_response(cleaned_text, tts_voice, audio_format, cache_key, safe_headers, timer)
         
     except HTTPException:
         raise
@@ -731,6 +631,12 @@ async def voice_chat(
         )
 
 
+@router.get("/voice/tts/cache/stats", summary="TTS 음성 캐시 통계")
+async def get_tts_cache_stats():
+    """TTS 캐시의 히트율, 절약한 오디오 바이트 수, 메모리/디스크 사용량을 반환합니다."""
+    return tts_cache.get_stats()
+
+
 @router.get("/voice/health", summary="음성 서비스 상태 확인")
 async def voice_health_check():
     """음성 처리 서비스들의 상태를 확인합니다"""
@@ -747,18 +653,7 @@ async def voice_health_check():
     
     # STT 서비스 상태 확인 (REST API 사용)
     try:
-        def test_stt_connection():
-            stt_url = f"{settings.WATSON_STT_URL}/v1/models"
-            auth_string = f"apikey:{settings.WATSON_STT_API_KEY}"
-            auth_b64 = base64.b64encode(auth_string.encode('utf-8')).decode('ascii')
-            
-            headers = {'Authorization': f'Basic {auth_b64}'}
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(stt_url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        
-        models = await asyncio.get_event_loop().run_in_executor(None, test_stt_connection)
+        models = await watson_audio_client.list_models()
         health_status["stt_status"] = "healthy" if models.get('models') else "unavailable"
     except Exception as e:
         health_status["stt_status"] = "error"
@@ -766,18 +661,7 @@ async def voice_health_check():
     
     # TTS 서비스 상태 확인 (REST API 사용)
     try:
-        def test_tts_connection():
-            tts_url = f"{settings.WATSON_TTS_URL}/v1/voices"
-            auth_string = f"apikey:{settings.WATSON_TTS_API_KEY}"
-            auth_b64 = base64.b64encode(auth_string.encode('utf-8')).decode('ascii')
-            
-            headers = {'Authorization': f'Basic {auth_b64}'}
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(tts_url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        
-        voices = await asyncio.get_event_loop().run_in_executor(None, test_tts_connection)
+        voices = await watson_audio_client.list_voices()
         health_status["tts_status"] = "healthy" if voices.get('voices') else "unavailable"
     except Exception as e:
         health_status["tts_status"] = "error"
@@ -791,6 +675,7 @@ async def voice_health_check():
         health_status["config_status"]["WATSON_TTS_API_KEY"]
     )
     
+    health_status["connection_pool"] = watson_audio_client.get_stats()
     health_status["status"] = "healthy" if overall_healthy else "degraded"
     health_status["message"] = "모든 음성 서비스가 정상 작동 중입니다." if overall_healthy else "일부 음성 서비스에 문제가 있습니다."
     
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    print("Warning: prometheus_client not available. /metrics 엔드포인트가 비활성화됩니다.")
+
+# LLM 생성은 수십 초까지 걸릴 수 있으므로 기본 버킷보다 넓게 잡음
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _NoopMetric:
+    """prometheus_client가 없을 때 사용하는 빈 메트릭 (호출부 코드를 바꾸지 않기 위함)"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_DURATION = Histogram(
+        "http_request_duration_seconds", "라우터/경로별 요청 처리 시간",
+        ["router", "method", "route"], buckets=LATENCY_BUCKETS
+    )
+    HTTP_REQUESTS = Counter(
+        "http_requests_total", "라우터/경로/상태 코드별 요청 수",
+        ["router", "method", "route", "status"]
+    )
+    HTTP_REQUESTS_IN_PROGRESS = Gauge(
+        "http_requests_in_progress", "처리 중인 요청 수"
+    )
+    CHAT_AGENT_REQUESTS = Counter(
+        "chat_agent_requests_total", "채팅 에이전트별 응답 수 (model_metadata.agent_used 기준)",
+        ["agent", "status"]
+    )
+    UPSTREAM_DURATION = Histogram(
+        "upstream_request_duration_seconds", "외부 서비스 호출 시간",
+        ["upstream", "operation", "outcome"], buckets=LATENCY_BUCKETS
+    )
+    UPSTREAM_ERRORS = Counter(
+        "upstream_errors_total", "외부 서비스 호출 오류 수",
+        ["upstream", "operation", "error"]
+    )
+    EVENT_LOOP_LAG = Histogram(
+        "event_loop_lag_seconds", "이벤트 루프 지연 (예약 시각 대비 실제 실행 시각)",
+        buckets=LOOP_LAG_BUCKETS
+    )
+else:
+    HTTP_REQUEST_DURATION = HTTP_REQUESTS = HTTP_REQUESTS_IN_PROGRESS = _NoopMetric()
+    CHAT_AGENT_REQUESTS = UPSTREAM_DURATION = UPSTREAM_ERRORS = EVENT_LOOP_LAG = _NoopMetric()
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str):
+    """외부 서비스 호출 구간의 소요 시간과 오류를 기록합니다
+
+    동기/비동기 코드 모두에서 with 블록으로 사용할 수 있습니다.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        UPSTREAM_DURATION.labels(upstream, operation, "error").observe(time.perf_counter() - start)
+        UPSTREAM_ERRORS.labels(upstream, operation, type(e).__name__).inc()
+        raise
+    else:
+        UPSTREAM_DURATION.labels(upstream, operation, "success").observe(time.perf_counter() - start)
+
+
+def record_chat_agent(agent: str, status: str, count: int = 1):
+    """채팅 에이전트 응답 수를 기록합니다 (배치에서 한 번 생성한 답변을 여러 항목이 공유하면 count개)"""
+    CHAT_AGENT_REQUESTS.labels(agent, status).inc(count)
+
+
+class _RuntimeCollector:
+    """스크레이프 시점에 값을 읽어오는 메트릭 (캐시 히트율, 실행기 대기열, 풀 사용량 등)"""
+
+    def __init__(self):
+        self.caches: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self.gauges: List[Tuple[str, str, Callable[[], float]]] = []
+        self.loop = None
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "캐시 히트 수", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "캐시 미스 수", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "캐시 히트율", labels=["cache"])
+        for name, stats_fn in self.caches.items():
+            stats = stats_fn()
+            hits.add_metric([name], stats.get("hits", 0))
+            misses.add_metric([name], stats.get("misses", 0))
+            ratio.add_metric([name], stats.get("hit_ratio", 0.0))
+        yield hits
+        yield misses
+        yield ratio
+
+        # asyncio.to_thread / run_in_executor(None, ...)가 사용하는 기본 스레드 풀
+        executor = getattr(self.loop, "_default_executor", None) if self.loop else None
+        queue = getattr(executor, "_work_queue", None)
+        yield GaugeMetricFamily(
+            "executor_queue_depth", "기본 스레드 풀에서 실행을 기다리는 작업 수",
+            value=queue.qsize() if queue is not None else 0
+        )
+        yield GaugeMetricFamily(
+            "executor_threads", "기본 스레드 풀의 스레드 수",
+            value=len(getattr(executor, "_threads", ()))
+        )
+
+        for name, documentation, value_fn in self.gauges:
+            yield GaugeMetricFamily(name, documentation, value=value_fn())
+
+
+_runtime_collector = _RuntimeCollector()
+if PROMETHEUS_AVAILABLE:
+    REGISTRY.register(_runtime_collector)
+
+
+def register_cache_stats(name: str, stats_fn: Callable[[], Dict[str, Any]]):
+    """캐시 통계 함수를 등록합니다 (hits, misses, hit_ratio 키를 읽음)"""
+    _runtime_collector.caches[name] = stats_fn
+
+
+def register_gauge(name: str, documentation: str, value_fn: Callable[[], float]):
+    """스크레이프 시점에 값을 읽는 게이지를 등록합니다"""
+    _runtime_collector.gauges.append((name, documentation, value_fn))
+
+
+async def monitor_event_loop_lag(interval: float):
+    """interval초마다 깨어나 예정보다 늦어진 시간을 이벤트 루프 지연으로 기록합니다"""
+    _runtime_collector.loop = asyncio.get_running_loop()
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(time.perf_counter() - start - interval, 0.0))
+
+
+def render_metrics() -> bytes:
+    """Prometheus 텍스트 형식으로 현재 메트릭을 반환합니다"""
+    return generate_latest(REGISTRY)
+
+
+class MetricsMiddleware:
+    """요청마다 라우터(태그)/경로 템플릿/상태 코드별 처리 시간을 기록하는 ASGI 미들웨어
+
+    경로 라벨은 실제 URL이 아닌 라우트 템플릿(/api/drugs/{name} 등)을 사용하므로
+    라벨 종류가 라우트 수를 넘지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # 라우팅이 끝난 뒤 scope에 매칭된 라우트가 기록됨
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            tags = getattr(route, "tags", None)
+            router = tags[0] if tags else "root"
+            method = scope.get("method", "")
+            HTTP_REQUEST_DURATION.labels(router, method, route_path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(router, method, route_path, str(status_code)).inc()
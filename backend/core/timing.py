@@ -0,0 +1,101 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+
+class RequestTimer:
+    """요청 처리 단계별 소요 시간을 기록합니다
+
+    - stage()로 감싼 구간의 시간을 단계 이름별로 누적합니다
+      (같은 단계가 여러 번 실행되면 합산하고 횟수를 함께 기록)
+    - server_timing_header()는 브라우저 개발자 도구에서 볼 수 있는
+      Server-Timing 헤더 값을 만듭니다
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, duration_ms: float):
+        """단계 소요 시간을 직접 기록합니다"""
+        stage = self.stages.setdefault(name, {"duration_ms": 0.0, "count": 0})
+        stage["duration_ms"] += duration_ms
+        stage["count"] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록의 소요 시간을 name 단계로 기록합니다 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        """응답의 debug 필드에 넣을 단계별 소요 시간 (ms)"""
+        return {
+            "timings_ms": {
+                name: round(stage["duration_ms"], 1) for name, stage in self.stages.items()
+            },
+            "stage_counts": {
+                name: stage["count"] for name, stage in self.stages.items() if stage["count"] > 1
+            },
+            "total_ms": round(self.total_ms, 1)
+        }
+
+    def server_timing_header(self) -> str:
+        """Server-Timing 헤더 값 (예: stt;dur=512.3, generation;dur=1830.2, total;dur=2400.1)"""
+        entries = [
+            f"{name};dur={stage['duration_ms']:.1f}" for name, stage in self.stages.items()
+        ]
+        entries.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(entries)
+
+    def headers(self) -> Dict[str, str]:
+        """응답에 붙일 헤더 (다른 출처의 프론트엔드에서도 타이밍을 볼 수 있도록 허용)"""
+        return {
+            "Server-Timing": self.server_timing_header(),
+            "Timing-Allow-Origin": "*"
+        }
+
+
+# 현재 요청의 타이머 (요청마다 별도의 컨텍스트에서 실행되므로 요청 간에 섞이지 않음)
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+
+def get_request_timer() -> Optional[RequestTimer]:
+    """현재 요청의 타이머를 반환합니다 (없으면 None)"""
+    return _current_timer.get()
+
+
+def start_request_timer() -> Optional[RequestTimer]:
+    """현재 요청의 타이머를 시작합니다
+
+    이미 타이머가 있으면 (예: /voice/chat 안에서 get_chat_response 호출) 그대로 이어서 사용합니다.
+    SERVER_TIMING_ENABLED가 꺼져 있으면 None을 반환합니다.
+    """
+    if not settings.SERVER_TIMING_ENABLED:
+        return None
+    timer = _current_timer.get()
+    if timer is None:
+        timer = RequestTimer()
+        _current_timer.set(timer)
+    return timer
+
+
+@contextmanager
+def timed_stage(name: str):
+    """현재 요청에 타이머가 있으면 with 블록의 소요 시간을 기록합니다"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
@@ -0,0 +1,90 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class WarmupManager:
+    """앱 시작 시 무거운 초기화 작업을 동시에 실행하고 준비 상태를 관리합니다
+
+    - register()로 등록한 작업을 run()에서 한꺼번에 실행합니다
+      (동기 함수는 스레드에서, 코루틴 함수는 이벤트 루프에서 실행)
+    - 제한 시간 안에 끝나지 않은 작업은 timeout으로 기록합니다
+    - required 작업이 모두 성공해야 ready가 되고, 선택 작업이 실패하면 degraded로 표시합니다
+    """
+
+    def __init__(self):
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+
+    def register(self, name: str, fn: Callable, required: bool = False):
+        """워밍업 작업을 등록합니다"""
+        self._components[name] = {"fn": fn, "required": required}
+
+    async def _run_component(self, name: str, fn: Callable):
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(fn):
+                detail = await fn()
+            else:
+                detail = await asyncio.to_thread(fn)
+            result = {"status": "ok"}
+            if detail is not None:
+                result["detail"] = detail
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        # 제한 시간 초과로 취소되면 여기까지 오지 않으므로 run()이 기록한 timeout 결과를 덮어쓰지 않음
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.results[name].update(result)
+
+    async def run(self, timeout: float):
+        """등록된 작업을 동시에 실행합니다"""
+        self.started_at = time.time()
+        start = time.perf_counter()
+        self.results = {
+            name: {"status": "running", "required": component["required"]}
+            for name, component in self._components.items()
+        }
+
+        tasks = [
+            asyncio.create_task(self._run_component(name, component["fn"]))
+            for name, component in self._components.items()
+        ]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            # 취소가 끝난 뒤에 timeout을 기록 (스레드에서 실행 중인 작업은 계속 돌 수 있지만 결과는 버려짐)
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for name, result in self.results.items():
+            if result["status"] == "running":
+                result["status"] = "timeout"
+                result["duration_ms"] = round(timeout * 1000, 1)
+            status_icon = "✅" if result["status"] == "ok" else "⚠️"
+            print(f"{status_icon} 워밍업 [{name}]: {result['status']} ({result['duration_ms']}ms)")
+
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.ready = all(
+            result["status"] == "ok" for result in self.results.values() if result["required"]
+        )
+        print(f"🚀 워밍업 완료: {self.duration_ms}ms, ready={self.ready}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """준비 상태와 구성요소별 워밍업 결과를 반환합니다"""
+        return {
+            "ready": self.ready,
+            "degraded": any(
+                result["status"] not in ("ok", "running") for result in self.results.values()
+                if not result["required"]
+            ),
+            "warmup_duration_ms": self.duration_ms,
+            "components": self.results
+        }
+
+
+# 싱글톤 인스턴스
+warmup_manager = WarmupManager()
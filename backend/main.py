@@ -1,13 +1,83 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api import chat, auth, email, file_upload, calendar, google_auth_with_userinfo, users, voice
+from fastapi.responses import JSONResponse, Response
+from api import chat, auth, email, file_upload, calendar, google_auth_with_userinfo, users, voice, drugs
+from core.config import settings
+from core.warmup import warmup_manager
+from core import metrics
 from DB.database import create_tables
+from utils.watsonx import watsonx_client
+from utils.voice import watson_audio_client
+from utils.cache import answer_cache, tts_cache
+from utils.googleCalender import calendar_agent
+from utils.ocr import OCRProcessor
+from utils.drug_kb import drug_kb, contraindication_engine
+from utils.rag import passage_retriever
+
+
+def load_drug_kb():
+    """의약품 지식 베이스를 적재합니다 (레코드가 0건이면 실패로 기록해 /ready가 503을 반환)"""
+    stats = drug_kb.load()
+    if not stats["records"]:
+        raise RuntimeError(f"의약품 데이터를 찾을 수 없습니다: {drug_kb.data_dir}")
+    return stats
+
+
+def load_rag_index():
+    """답변 근거 검색 인덱스를 적재합니다 (문단이 0개면 실패로 기록해 /ready에 degraded로 표시)"""
+    stats = passage_retriever.load()
+    if not stats.get("passages"):
+        raise RuntimeError(stats.get("error") or f"검색할 문단이 없습니다: {settings.RAG_EXTRA_CORPUS_PATH}")
+    return stats
+
+
+# 시작 시 워밍업할 구성요소 (데이터베이스 테이블 생성과 의약품 지식 베이스는 필수)
+warmup_manager.register("database", create_tables, required=True)
+warmup_manager.register("watsonx", watsonx_client.warm_up)
+warmup_manager.register("watson_audio", watson_audio_client.warm_up)
+warmup_manager.register("google_calendar", calendar_agent.warm_up)
+warmup_manager.register("tesseract", OCRProcessor().warm_up)
+if settings.DRUG_KB_ENABLED:
+    warmup_manager.register("drug_kb", load_drug_kb, required=True)
+    if settings.DRUG_KB_RULES_ENABLED:
+        warmup_manager.register("contraindication_rules", contraindication_engine.load)
+if settings.RAG_ENABLED:
+    warmup_manager.register("rag_index", load_rag_index)
+
+# 스크레이프 시점에 읽는 메트릭 (캐시 히트율, Watson 모델 풀 사용량)
+metrics.register_cache_stats("answer", answer_cache.get_stats)
+metrics.register_cache_stats("tts", tts_cache.get_stats)
+metrics.register_gauge("watsonx_pool_active", "진행 중인 Watson 생성 요청 수",
+                       lambda: watsonx_client.pool.get_stats()["active"])
+metrics.register_gauge("watsonx_pool_waiting", "Watson 모델 슬롯을 기다리는 요청 수",
+                       lambda: watsonx_client.pool.get_stats()["waiting"])
+metrics.register_gauge("watson_stt_active", "진행 중인 Watson STT 호출 수",
+                       lambda: watson_audio_client.stt.get_stats()["active"])
+metrics.register_gauge("watson_tts_active", "진행 중인 Watson TTS 호출 수",
+                       lambda: watson_audio_client.tts.get_stats()["active"])
 
-# FastAPI 앱 인스턴스 생성
-app = FastAPI(title="Dr.Watson Backend API", version="1.0.0")
 
-# 데이터베이스 테이블 생성
-create_tables()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공유 리소스를 관리합니다"""
+    # 워밍업은 백그라운드에서 실행하고, 끝날 때까지 /ready는 503을 반환
+    warmup_task = asyncio.create_task(warmup_manager.run(settings.WARMUP_TIMEOUT))
+    lag_task = None
+    if settings.METRICS_ENABLED:
+        lag_task = asyncio.create_task(metrics.monitor_event_loop_lag(settings.METRICS_LOOP_LAG_INTERVAL))
+    yield
+    warmup_task.cancel()
+    if lag_task is not None:
+        lag_task.cancel()
+    # 종료 시 Watson 커넥션 풀 정리
+    await watsonx_client.aclose()
+    await watson_audio_client.aclose()
+
+
+# FastAPI 앱 인스턴스 생성
+app = FastAPI(title="Dr.Watson Backend API", version="1.0.0", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -40,6 +110,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우터/경로별 요청 처리 시간 메트릭
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # API 라우터들을 포함시킴
 app.include_router(chat.router, prefix="/api", tags=["Chat"])
 # app.include_router(auth.router, prefix="/auth", tags=["Authentication"]) # 네이버 인증
@@ -50,12 +124,28 @@ app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
 app.include_router(google_auth_with_userinfo.router, prefix="/auth", tags=["Google Auth User Info"]) # 자동 사용자 관리(enhanced version)
 app.include_router(users.router, prefix="/api", tags=["User CRUD"])
 app.include_router(voice.router, prefix="/api", tags=["Voice"])
+app.include_router(drugs.router, prefix="/api", tags=["Drugs"])
 
 
 @app.get("/")
 def root():
     return {"message": "Dr.watson Backend Server", "status": "running"}
 
+
+@app.get("/ready")
+def readiness():
+    """로드밸런서용 준비 상태 확인 (워밍업 완료 전이거나 필수 구성요소 실패 시 503)"""
+    status = warmup_manager.get_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus 스크레이프용 메트릭 (요청 지연, 에이전트별 응답 수, 외부 서비스 지연/오류 등)"""
+    if not settings.METRICS_ENABLED or not metrics.PROMETHEUS_AVAILABLE:
+        return JSONResponse(status_code=503, content={"detail": "메트릭이 비활성화되어 있습니다."})
+    return Response(content=metrics.render_metrics(), media_type=metrics.CONTENT_TYPE_LATEST)
+
 """로컬 테스트용"""
 if __name__ == "__main__":
     import uvicorn
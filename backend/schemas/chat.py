@@ -24,6 +24,11 @@ class ChatRequest(BaseModel):
         example=["아스피린", "메트포르민"]
     )
 
+    bypass_cache: bool = Field(
+        default=False,
+        description="true이면 답변 캐시를 사용하지 않고 새로 생성합니다 (선택사항)."
+    )
+
     # api 사용설명서
     class Config:
         json_schema_extra = {
@@ -33,3 +38,30 @@ class ChatRequest(BaseModel):
                 "currentMedications": ["아스피린"]
             }
         }
+
+
+class ChatBatchRequest(BaseModel):
+    """의료 AI 배치 채팅 요청 모델"""
+
+    items: List[ChatRequest] = Field(
+        ...,
+        min_length=1,
+        description="처리할 채팅 요청 목록 (결과는 같은 순서로 반환됩니다)"
+    )
+
+    concurrency_limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="동시에 처리할 생성 요청 수 (선택사항). 생략하면 서버 기본값을 사용합니다."
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"question": "타이레놀의 효능이 뭔가요?"},
+                    {"question": "아스피린 부작용을 알려주세요", "currentMedications": ["와파린"]}
+                ],
+                "concurrency_limit": 8
+            }
+        }
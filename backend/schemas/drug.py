@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class DrugSafetyCheckRequest(BaseModel):
+    """금기·상호작용 확인 요청 모델"""
+
+    medications: List[str] = Field(
+        default_factory=list,
+        description="복용 중이거나 복용하려는 약물 목록 (제품명, 성분명 또는 '혈압약' 같은 계열 이름)",
+        example=["타이레놀", "와파린"]
+    )
+
+    underlying_diseases: Optional[List[str]] = Field(
+        default=None,
+        description="기저질환 목록 (선택사항)",
+        example=["고혈압"]
+    )
+
+    question: Optional[str] = Field(
+        default=None,
+        max_length=500,
+        description="질문 (선택사항). 질문에 나온 약도 함께 확인합니다.",
+        example="이부프로펜 같이 먹어도 돼요?"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "medications": ["타이레놀", "와파린"],
+                "underlying_diseases": ["고혈압"],
+                "question": "이부프로펜 같이 먹어도 돼요?"
+            }
+        }
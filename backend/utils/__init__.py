@@ -1,8 +1,14 @@
+from .watsonx import watsonx_client
+from .intent import KeywordMatcher
 from .ocr.ocr_processor import OCRProcessor, extract_text_from_file, analyze_medical_document
 from .googleCalender import calendar_agent, text_to_cal_converter
 from .googleToken.user_token_manager import token_manager
 
 __all__ = [
+    # Watson 모듈
+    'watsonx_client',
+    # 의도 분류 모듈
+    'KeywordMatcher',
     # OCR 모듈
     'OCRProcessor', 
     'extract_text_from_file', 
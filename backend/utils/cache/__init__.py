@@ -0,0 +1,10 @@
+"""
+캐시 모듈
+
+LLM 답변, TTS 음성 등 반복되는 결과를 재사용하기 위한 캐시를 제공합니다.
+"""
+
+from .answer_cache import AnswerCache, answer_cache, normalize_question
+from .tts_cache import TtsCache, tts_cache
+
+__all__ = ["AnswerCache", "answer_cache", "normalize_question", "TtsCache", "tts_cache"]
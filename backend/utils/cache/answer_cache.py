@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+
+def normalize_question(question: str) -> str:
+    """캐시 키용으로 질문을 정규화합니다 (유니코드/대소문자/공백/끝 문장부호)"""
+    normalized = unicodedata.normalize('NFKC', question).lower()
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    return normalized.rstrip('?!.~ ')
+
+
+def _normalize_list(values) -> list:
+    """컨텍스트 목록을 순서와 무관하게 비교할 수 있도록 정렬합니다"""
+    if not values:
+        return []
+    return sorted({unicodedata.normalize('NFKC', v).strip().lower() for v in values if v and v.strip()})
+
+
+class AnswerCache:
+    """채팅 답변 캐시 (메모리 LRU + TTL, SQLite 2차 저장소)
+
+    - 1차: 프로세스 메모리의 LRU (ANSWER_CACHE_MAX_ENTRIES)
+    - 2차: SQLite 파일 (재시작 후에도 유지, ANSWER_CACHE_DB_PATH)
+      SQLite 조회/저장은 asyncio.to_thread로 실행해 busy timeout 동안에도 이벤트 루프를 막지 않습니다
+    """
+
+    # N번 저장할 때마다 디스크 정리 수행
+    PRUNE_INTERVAL = 200
+
+    def __init__(self, max_entries: int = None, ttl: int = None, db_path: str = None):
+        self.max_entries = max_entries if max_entries is not None else settings.ANSWER_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.ANSWER_CACHE_TTL
+        self.db_path = db_path if db_path is not None else settings.ANSWER_CACHE_DB_PATH
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()  # 메모리 LRU용 (SQLite 작업 중에는 잡지 않음)
+        self._db_lock = threading.Lock()  # SQLite 연결용 (스레드에서만 잡음)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_prune = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ANSWER_CACHE_ENABLED and self.max_entries > 0
+
+    def make_key(self, agent_type: str, question: str, user_context: dict = None,
+                 params: Dict[str, Any] = None) -> str:
+        """질문, 정렬된 컨텍스트, 에이전트 타입, 생성 파라미터로 캐시 키를 만듭니다"""
+        user_context = user_context or {}
+        key_data = {
+            "agent_type": agent_type,
+            "question": normalize_question(question),
+            "underlying_diseases": _normalize_list(user_context.get('underlying_diseases')),
+            "current_medications": _normalize_list(user_context.get('currentMedications')),
+            "params": params or {},
+            "model_id": settings.WATSONX_MODEL_ID
+        }
+        raw = json.dumps(key_data, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite 연결을 반환합니다 (경로가 비어 있으면 디스크 저장소 비활성화)"""
+        if not self.db_path:
+            return None
+        if self._conn is None:
+            try:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=1.0)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS answers ("
+                    "key TEXT PRIMARY KEY, answer TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_created ON answers(created_at)")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"답변 캐시 DB 초기화 실패, 메모리 캐시만 사용합니다: {e}")
+                self.db_path = ""
+                self._conn = None
+        return self._conn
+
+    def _remember(self, key: str, answer: str, created_at: float):
+        """메모리 LRU에 저장하고 용량을 초과하면 가장 오래된 항목을 제거합니다"""
+        self._memory[key] = (answer, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        """SQLite에서 (답변, 저장 시각)을 읽습니다 (asyncio.to_thread에서 호출)"""
+        with self._db_lock:
+            conn = self._get_connection()
+            if conn is None:
+                return None
+            try:
+                return conn.execute(
+                    "SELECT answer, created_at FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"답변 캐시 조회 실패: {e}")
+                return None
+
+    def _write_disk(self, key: str, answer: str, now: float):
+        """SQLite에 답변을 저장합니다 (asyncio.to_thread에서 호출)"""
+        with self._db_lock:
+            conn = self._get_connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (key, answer, created_at) VALUES (?, ?, ?)",
+                    (key, answer, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                    self._prune_disk(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"답변 캐시 저장 실패: {e}")
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시된 답변을 반환합니다 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                answer, created_at = entry
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return answer
+                del self._memory[key]
+
+        if self.db_path:
+            row = await asyncio.to_thread(self._read_disk, key)
+            if row is not None and now - row[1] < self.ttl:
+                with self._lock:
+                    self._remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                return row[0]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, answer: str):
+        """답변을 메모리와 디스크에 저장합니다"""
+        if not self.enabled or not answer:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, answer, now)
+        self.stats["stores"] += 1
+        if self.db_path:
+            await asyncio.to_thread(self._write_disk, key, answer, now)
+
+    def _prune_disk(self, conn: sqlite3.Connection, now: float):
+        """만료된 항목과 용량 초과분을 디스크에서 제거합니다"""
+        self._writes_since_prune = 0
+        conn.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM answers WHERE key NOT IN ("
+            "SELECT key FROM answers ORDER BY created_at DESC LIMIT ?)",
+            (settings.ANSWER_CACHE_DISK_MAX_ENTRIES,)
+        )
+
+    def record_bypass(self):
+        """캐시 우회 요청 수를 기록합니다"""
+        self.stats["bypassed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """히트/미스 통계를 반환합니다"""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk_enabled": bool(self.db_path),
+            "enabled": self.enabled
+        }
+
+    def clear(self):
+        """메모리와 디스크 캐시를 모두 비웁니다"""
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            conn = self._get_connection()
+            if conn is not None:
+                conn.execute("DELETE FROM answers")
+                conn.commit()
+
+
+# 싱글톤 인스턴스
+answer_cache = AnswerCache()
@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+
+class TtsCache:
+    """TTS 음성 캐시 (메모리 LRU + 디스크 파일, 내용 주소 기반)
+
+    - 키: sha256(정리된 텍스트, 음성, 오디오 형식). 같은 입력이면 같은 오디오이므로 키를 ETag로 사용합니다
+    - 1차: 프로세스 메모리의 LRU (TTS_CACHE_MEMORY_MAX_BYTES, 오디오 바이트 기준)
+    - 2차: TTS_CACHE_DIR 아래 파일 (재시작/워커 간 공유, TTS_CACHE_DISK_MAX_BYTES 초과 시 오래 안 쓴 것부터 삭제)
+      디스크 작업(색인 스캔, 읽기, 쓰기, 삭제)은 asyncio.to_thread로 실행해 이벤트 루프를 막지 않습니다
+    """
+
+    def __init__(self, memory_max_bytes: int = None, disk_dir: str = None, disk_max_bytes: int = None):
+        self.memory_max_bytes = memory_max_bytes if memory_max_bytes is not None else settings.TTS_CACHE_MEMORY_MAX_BYTES
+        self.disk_dir = disk_dir if disk_dir is not None else settings.TTS_CACHE_DIR
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else settings.TTS_CACHE_DISK_MAX_BYTES
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()  # 메모리 LRU용 (디스크 작업 중에는 잡지 않음)
+        self._disk_lock = threading.Lock()  # 디스크 색인용 (스레드에서만 잡음)
+        # 디스크 파일 키 → (크기, 마지막 사용 시각). 처음 사용할 때 디렉토리를 한 번 훑어 채움
+        self._disk_index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._disk_bytes = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "not_modified": 0,
+            "bytes_saved": 0,
+            "disk_evictions": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return settings.TTS_CACHE_ENABLED and self.memory_max_bytes > 0
+
+    @staticmethod
+    def make_key(text: str, voice: str, audio_format: str) -> str:
+        """정리된 텍스트, 음성, 오디오 형식으로 캐시 키를 만듭니다"""
+        raw = json.dumps([text, voice, audio_format], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def etag(key: str) -> str:
+        return f'"{key}"'
+
+    def is_not_modified(self, if_none_match: Optional[str], key: str) -> bool:
+        """If-None-Match 헤더가 이 키의 ETag를 포함하면 True (304로 응답)"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        # "*"는 캐시에 오디오가 없어도 일치해 버리므로 정확한 ETag만 비교
+        if self.etag(key) in tags:
+            self.stats["not_modified"] += 1
+            return True
+        return False
+
+    def _path(self, key: str) -> Path:
+        return Path(self.disk_dir) / key[:2] / key
+
+    def _load_disk_index(self):
+        """디스크에 있는 캐시 파일 목록과 전체 크기를 읽습니다"""
+        self._disk_index = {}
+        self._disk_bytes = 0
+        root = Path(self.disk_dir)
+        if not root.is_dir():
+            return
+        for path in root.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            self._disk_index[path.name] = (stat.st_size, stat.st_mtime)
+            self._disk_bytes += stat.st_size
+
+    def _remember(self, key: str, audio: bytes):
+        """메모리 LRU에 저장하고 용량을 초과하면 가장 오래된 항목을 제거합니다"""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if len(audio) > self.memory_max_bytes:
+            return
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """디스크에서 오디오를 읽습니다 (asyncio.to_thread에서 호출)"""
+        with self._disk_lock:
+            if self._disk_index is None:
+                self._load_disk_index()
+            # 색인에 없어도 다른 워커가 저장했을 수 있으므로 파일을 직접 확인
+            path = self._path(key)
+            try:
+                audio = path.read_bytes()
+                # 마지막 사용 시각을 갱신해 오래 안 쓴 것부터 지우도록 함
+                now = time.time()
+                os.utime(path, (now, now))
+            except OSError:
+                previous = self._disk_index.pop(key, None)
+                if previous is not None:
+                    self._disk_bytes -= previous[0]
+                return None
+            previous = self._disk_index.get(key)
+            self._disk_bytes += len(audio) - (previous[0] if previous else 0)
+            self._disk_index[key] = (len(audio), now)
+            return audio
+
+    def _write_disk(self, key: str, audio: bytes):
+        """디스크에 오디오를 저장하고 용량을 넘으면 정리합니다 (asyncio.to_thread에서 호출)"""
+        with self._disk_lock:
+            if self._disk_index is None:
+                self._load_disk_index()
+            path = self._path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(audio)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"TTS 캐시 저장 실패, 메모리 캐시만 사용합니다: {e}")
+                return
+
+            previous = self._disk_index.get(key)
+            if previous is not None:
+                self._disk_bytes -= previous[0]
+            self._disk_index[key] = (len(audio), time.time())
+            self._disk_bytes += len(audio)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """용량의 90% 이하가 될 때까지 마지막 사용 시각이 오래된 파일부터 삭제합니다"""
+        target = self.disk_max_bytes * 0.9
+        for key, (size, _) in sorted(self._disk_index.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= target:
+                break
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"TTS 캐시 파일 삭제 실패: {e}")
+                continue
+            del self._disk_index[key]
+            self._disk_bytes -= size
+            self.stats["disk_evictions"] += 1
+
+    async def get(self, key: str) -> Tuple[Optional[bytes], str]:
+        """캐시된 오디오와 출처("memory", "disk", "miss")를 반환합니다"""
+        if not self.enabled:
+            return None, "disabled"
+
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                self.stats["bytes_saved"] += len(audio)
+                return audio, "memory"
+
+        if self.disk_dir:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                with self._lock:
+                    self._remember(key, audio)
+                self.stats["disk_hits"] += 1
+                self.stats["bytes_saved"] += len(audio)
+                return audio, "disk"
+
+        self.stats["misses"] += 1
+        return None, "miss"
+
+    async def set(self, key: str, audio: bytes):
+        """오디오를 메모리와 디스크에 저장합니다"""
+        if not self.enabled or not audio:
+            return
+
+        with self._lock:
+            self._remember(key, audio)
+        self.stats["stores"] += 1
+        if self.disk_dir and len(audio) <= self.disk_max_bytes:
+            await asyncio.to_thread(self._write_disk, key, audio)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """히트/미스 통계를 반환합니다"""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_max_bytes": self.memory_max_bytes,
+            "disk_entries": len(self._disk_index) if self._disk_index is not None else None,
+            "disk_bytes": self._disk_bytes if self._disk_index is not None else None,
+            "disk_max_bytes": self.disk_max_bytes,
+            "disk_enabled": bool(self.disk_dir),
+            "enabled": self.enabled
+        }
+
+    def clear(self):
+        """메모리와 디스크 캐시를 모두 비웁니다"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        with self._disk_lock:
+            if self.disk_dir:
+                if self._disk_index is None:
+                    self._load_disk_index()
+                for key in list(self._disk_index):
+                    try:
+                        self._path(key).unlink()
+                    except OSError:
+                        pass
+                self._disk_index = {}
+                self._disk_bytes = 0
+
+
+# 싱글톤 인스턴스
+tts_cache = TtsCache()
@@ -0,0 +1,20 @@
+"""
+의약품 지식 베이스 모듈
+
+MedDB / e약은요 데이터셋을 메모리에 적재해 제품명·성분명 조회와 답변 근거 자료를 제공합니다.
+python -m utils.drug_kb.etl로 컴파일한 바이너리가 있으면 CSV 대신 mmap으로 엽니다.
+"""
+
+from .knowledge_base import (
+    DrugKnowledgeBase, drug_kb, normalize_drug_name, normalize_ingredient, base_drug_name,
+    active_ingredient_key, format_duplicate_warning
+)
+from .suggest import DrugNameSuggester, to_chosung
+from .contraindications import ContraindicationEngine, contraindication_engine, format_contraindications
+
+__all__ = [
+    "DrugKnowledgeBase", "drug_kb", "normalize_drug_name", "normalize_ingredient", "base_drug_name",
+    "active_ingredient_key", "format_duplicate_warning",
+    "DrugNameSuggester", "to_chosung",
+    "ContraindicationEngine", "contraindication_engine", "format_contraindications"
+]
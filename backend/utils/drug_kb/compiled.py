@@ -0,0 +1,272 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 바이너리 파일 형식
+#   MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 섹션들 (8바이트 정렬)
+# 섹션은 uint32 배열("I") 또는 바이트열("B")이며, 위치는 헤더의 sections에 기록합니다.
+MAGIC = b"DRUGKB\x00\x01"
+FORMAT_VERSION = 1
+_ALIGN = 8
+_HASH_CHUNK = 1 << 20
+
+
+def file_checksum(path: str) -> str:
+    """파일 sha256 (1MB씩 읽으므로 큰 파일도 메모리를 쓰지 않음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_states(paths: Iterable[str], checksum: bool = True) -> List[Dict[str, Any]]:
+    """원본 파일 상태 목록 (파일이 없으면 size/mtime_ns/sha256이 None)"""
+    states = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            states.append({"file": os.path.basename(path), "size": None, "mtime_ns": None, "sha256": None})
+            continue
+        states.append({
+            "file": os.path.basename(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_checksum(path) if checksum else None
+        })
+    return states
+
+
+def changed_sources(header: Optional[Dict[str, Any]], paths: Sequence[str]) -> List[str]:
+    """컴파일 이후 바뀐 원본 파일 이름 목록 (빈 목록이면 최신 상태)
+
+    크기와 수정 시각이 같으면 체크섬 계산을 건너뛰고, 다르면 sha256으로 다시 비교합니다
+    (touch만 된 파일은 바뀌지 않은 것으로 봄).
+    """
+    names = [os.path.basename(path) for path in paths]
+    if not header or header.get("version") != FORMAT_VERSION:
+        return names
+    recorded = {state["file"]: state for state in header.get("sources", [])}
+    changed = []
+    for path, name, state in zip(paths, names, source_states(paths, checksum=False)):
+        known = recorded.get(name)
+        if known is None:
+            changed.append(name)
+        elif (state["size"], state["mtime_ns"]) == (known["size"], known["mtime_ns"]):
+            continue
+        elif state["size"] is None or state["size"] != known["size"] or file_checksum(path) != known["sha256"]:
+            changed.append(name)
+    return changed
+
+
+class StringPool:
+    """문자열 중복 제거 테이블 (같은 문자열은 번호 하나로 저장, 0번은 빈 문자열)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {"": 0}
+        self._strings: List[str] = [""]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def add(self, text: str) -> int:
+        text = text or ""
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = self._ids[text] = len(self._strings)
+            self._strings.append(text)
+        return string_id
+
+    def column(self, texts: Iterable[str]) -> array:
+        return array("I", (self.add(text) for text in texts))
+
+    def sections(self) -> Dict[str, Any]:
+        offsets, data, position = array("I", [0]), bytearray(), 0
+        for text in self._strings:
+            encoded = text.encode("utf-8")
+            data += encoded
+            position += len(encoded)
+            offsets.append(position)
+        return {"strings.offsets": offsets, "strings.data": bytes(data)}
+
+
+def hash_table_sections(prefix: str, pool: StringPool, entries: Iterable[Tuple[str, Sequence[int]]]) -> Dict[str, array]:
+    """문자열 → 번호 목록 사전을 mmap에서 바로 찾을 수 있는 해시 테이블로 만듭니다
+
+    crc32(키)로 칸을 정하고 선형 탐사하며, 칸에는 (항목 번호 + 1)을 넣습니다 (0은 빈 칸).
+    항목의 번호 목록은 ptr/ids 두 배열(CSR)로 저장합니다.
+    """
+    keys, ptr, ids = array("I"), array("I", [0]), array("I")
+    hashes = []
+    for key, values in entries:
+        keys.append(pool.add(key))
+        ids.extend(values)
+        ptr.append(len(ids))
+        hashes.append(zlib.crc32(key.encode("utf-8")))
+
+    size = 1
+    while size < len(keys) * 2:
+        size <<= 1
+    mask = size - 1
+    slots = array("I", bytes(4 * size))
+    for entry, hashed in enumerate(hashes):
+        slot = hashed & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = entry + 1
+    return {f"{prefix}.slots": slots, f"{prefix}.keys": keys, f"{prefix}.ptr": ptr, f"{prefix}.ids": ids}
+
+
+def write_compiled(path: str, sections: Dict[str, Any], header: Dict[str, Any]):
+    """섹션들을 바이너리 파일 하나로 저장합니다 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)"""
+    layout, position = {}, 0
+    for name, data in sections.items():
+        kind = "B" if isinstance(data, (bytes, bytearray)) else "I"
+        size = len(data) * (1 if kind == "B" else 4)
+        layout[name] = [position, len(data), kind]
+        position += size + (-size % _ALIGN)
+
+    header = {**header, "version": FORMAT_VERSION, "byteorder": sys.byteorder, "sections": layout}
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes
+    prefix += b"\x00" * (-len(prefix) % _ALIGN)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(prefix)
+            for data in sections.values():
+                raw = bytes(data) if isinstance(data, (bytes, bytearray)) else data.tobytes()
+                f.write(raw)
+                f.write(b"\x00" * (-len(raw) % _ALIGN))
+        # 이미 파일을 mmap한 워커는 교체 전 파일을 계속 사용
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_header(path: str) -> Optional[Dict[str, Any]]:
+    """헤더만 읽습니다 (파일이 없거나 형식이 다르면 None)"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return None
+    if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    header["data_offset"] = len(MAGIC) + 4 + length + (-(len(MAGIC) + 4 + length) % _ALIGN)
+    return header
+
+
+class CompiledFile:
+    """mmap으로 연 컴파일 파일
+
+    섹션은 복사 없이 memoryview로 돌려주므로 여러 워커가 같은 파일을 열면
+    페이지 캐시를 함께 사용합니다 (워커별 메모리는 실제로 꺼낸 문자열만큼만 늘어남).
+    """
+
+    def __init__(self, path: str):
+        header = read_header(path)
+        if header is None:
+            raise ValueError(f"올바른 의약품 바이너리 파일이 아닙니다: {path}")
+        self.path = path
+        self.header = header
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._offsets = self.section("strings.offsets")
+        self._data = self.section("strings.data")
+
+    @property
+    def size(self) -> int:
+        return len(self._mmap)
+
+    def section(self, name: str) -> memoryview:
+        offset, count, kind = self.header["sections"][name]
+        start = self.header["data_offset"] + offset
+        view = self._view[start:start + count * (1 if kind == "B" else 4)]
+        return view if kind == "B" else view.cast("I")
+
+    def string(self, string_id: int) -> str:
+        return str(self._data[self._offsets[string_id]:self._offsets[string_id + 1]], "utf-8")
+
+    def strings(self, name: str) -> List[str]:
+        """번호 배열 섹션을 문자열 목록으로 꺼냅니다"""
+        string = self.string
+        return [string(string_id) for string_id in self.section(name)]
+
+    def string_equals(self, string_id: int, encoded: bytes) -> bool:
+        return self._data[self._offsets[string_id]:self._offsets[string_id + 1]] == encoded
+
+
+class MappedRecords:
+    """mmap된 열 배열에서 레코드 튜플을 그때그때 만드는 시퀀스 (list[tuple] 대신 사용)
+
+    단일 값 필드는 col.<필드>, 목록 필드는 list.<필드>.ptr / list.<필드>.ids 섹션에서 읽습니다.
+    """
+
+    def __init__(self, compiled: CompiledFile, fields: Sequence[str], list_fields: Sequence[str]):
+        self._string = compiled.string
+        self._columns = []
+        for field in fields:
+            if field in list_fields:
+                self._columns.append((compiled.section(f"list.{field}.ptr"), compiled.section(f"list.{field}.ids")))
+            else:
+                self._columns.append((None, compiled.section(f"col.{field}")))
+        self._length = len(self._columns[0][1])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, record_id: int) -> Tuple:
+        if not -self._length <= record_id < self._length:
+            raise IndexError(record_id)
+        string = self._string
+        values = []
+        for ptr, column in self._columns:
+            if ptr is None:
+                values.append(string(column[record_id]))
+            else:
+                values.append(tuple(string(i) for i in column[ptr[record_id]:ptr[record_id + 1]]))
+        return tuple(values)
+
+
+class MappedPostings:
+    """hash_table_sections()로 저장한 사전을 mmap에서 조회합니다 (dict.get과 같은 사용법)"""
+
+    def __init__(self, compiled: CompiledFile, prefix: str):
+        self._compiled = compiled
+        self._slots = compiled.section(f"{prefix}.slots")
+        self._keys = compiled.section(f"{prefix}.keys")
+        self._ptr = compiled.section(f"{prefix}.ptr")
+        self._ids = compiled.section(f"{prefix}.ids")
+        self._mask = len(self._slots) - 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, key: str, default=None):
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            entry = self._slots[slot]
+            if not entry:
+                return default
+            entry -= 1
+            if self._compiled.string_equals(self._keys[entry], encoded):
+                return self._ids[self._ptr[entry]:self._ptr[entry + 1]]
+            slot = (slot + 1) & self._mask
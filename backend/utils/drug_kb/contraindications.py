@@ -0,0 +1,397 @@
+import re
+import threading
+import time
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.config import settings
+from utils.intent import KeywordMatcher
+from . import curated_rules
+from .knowledge_base import drug_kb, active_ingredient_key, normalize_ingredient
+
+# 심각도 (높을수록 우선)
+SEVERITY_RANK = {"contraindicated": 2, "caution": 1}
+SEVERITY_LABELS = {"contraindicated": "복용 금지", "caution": "주의 (의사·약사와 상의)"}
+
+# 데이터셋 문장 판별 (공백을 뺀 문장 기준)
+_SENTENCE_RE = re.compile(r"(?<=[다오])\.")
+_AVOID_RE = re.compile(r"(복용|사용|투여|섭취|병용|투약)하지(마|말)")
+_DATASET_REASONS = {
+    "disease": {
+        "contraindicated": "허가 정보에서 이 질환이 있으면 복용하지 말라고 안내합니다",
+        "caution": "허가 정보에서 이 질환이 있으면 복용 전에 의사·약사와 상의하라고 안내합니다"
+    },
+    "interaction": {
+        "contraindicated": "허가 정보에서 함께 복용하지 말라고 안내합니다",
+        "caution": "허가 정보에서 함께 복용할 때 의사·약사와 상의하라고 안내합니다"
+    }
+}
+_EVIDENCE_MAX_CHARS = 160
+_MIN_INGREDIENT_KEYWORD = 3  # 상호작용 문장에서 찾을 성분명 최소 길이
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"\s+", "", (text or "").lower())
+
+
+def _sentences(text: str) -> Iterable[Tuple[str, str]]:
+    """(원문 문장, 공백을 뺀 문장)"""
+    for sentence in _SENTENCE_RE.split(text or ""):
+        sentence = sentence.strip()
+        if sentence:
+            yield sentence, _compact(sentence)
+
+
+def _evidence(sentence: str) -> str:
+    sentence = sentence.strip()
+    if len(sentence) > _EVIDENCE_MAX_CHARS:
+        sentence = sentence[:_EVIDENCE_MAX_CHARS] + "…"
+    return sentence if sentence.endswith((".", "…")) else sentence + "."
+
+
+def format_contraindications(findings: List[Dict[str, Any]]) -> str:
+    """규칙 엔진 결과를 프롬프트/안내용 문장 목록으로 만듭니다 (결과가 없으면 빈 문자열)"""
+    lines = []
+    for finding in findings:
+        target = finding["target"]
+        if finding["type"] == "interaction":
+            target = f"{target} ({finding['target_ingredient']})"
+        lines.append(
+            f"- [{SEVERITY_LABELS[finding['severity']]}] {finding['medication']} ({finding['ingredient']}) + {target}: "
+            f"{finding['reason']}"
+        )
+    return "\n".join(lines)
+
+
+class ContraindicationEngine:
+    """약물-질환 금기, 약물-약물 상호작용 규칙 엔진
+
+    - 규칙은 (항목, 질환)과 (항목, 항목) 쌍을 키로 하는 사전으로 미리 만들어 둡니다.
+      항목은 성분(ingredient:키), 약물 계열(group:이름), 제품(product:제품명) 중 하나입니다
+    - 규칙 출처
+      1) 큐레이션 표(curated_rules): 약물 계열 단위의 금기/상호작용
+      2) 데이터셋 주의사항/상호작용 문장: "~환자는 이 약을 복용하지 마십시오"(금기),
+         "복용하기 전에 ~환자는 의사 또는 약사와 상의하십시오"(주의)에서 질환과 성분을 찾아
+         해당 제품에 연결하고, 단일 성분 제품이면 성분에도 연결합니다 (제품 수가 많은 심각도 우선)
+    - check()는 약 이름을 항목 집합으로 바꾼 뒤 사전 조회만 하므로 LLM 호출 없이 끝납니다
+      (규칙은 워밍업에서만 만들고, 아직 준비 전이면 빈 결과를 반환)
+    """
+
+    def __init__(self):
+        self._disease_rules: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._interaction_rules: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._ingredient_groups: Dict[str, Tuple[str, ...]] = {}
+        self._labels: Dict[str, str] = {}
+        self._disease_matcher = KeywordMatcher({
+            **curated_rules.DISEASES, "_stop": curated_rules.DISEASE_STOPWORDS
+        })
+        self._group_matcher = KeywordMatcher({
+            group: spec["ingredients"] + spec["keywords"] for group, spec in curated_rules.GROUPS.items()
+        })
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.load_stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # 규칙 생성
+    # ------------------------------------------------------------------
+    def find_diseases(self, text: str) -> List[str]:
+        """텍스트에 나오는 질환을 표준 이름으로 반환합니다 (예: "혈압이 높아요" → 고혈압)"""
+        found = []
+        for _, keyword in self._disease_matcher.find_longest(_compact(text)):
+            for disease in self._disease_matcher.categories_of(keyword):
+                if disease != "_stop" and disease not in found:
+                    found.append(disease)
+        return found
+
+    def _groups_in(self, text: str) -> Set[str]:
+        groups = set()
+        for _, keyword in self._group_matcher.find_longest(_compact(text)):
+            groups.update(self._group_matcher.categories_of(keyword))
+        return groups
+
+    def _groups_of_ingredient(self, key: str) -> Tuple[str, ...]:
+        """성분 키가 속한 약물 계열 (성분 키에 계열 성분명이 들어 있으면 포함, 예: 슈도에페드린 → 교감신경흥분제)"""
+        groups = self._ingredient_groups.get(key)
+        if groups is None:
+            groups = tuple(sorted(
+                group for group, spec in curated_rules.GROUPS.items()
+                if any(pattern in key for pattern in spec["ingredients"])
+            ))
+        return groups
+
+    def load(self) -> Dict[str, Any]:
+        """큐레이션 표와 데이터셋 문장으로 규칙 사전을 만듭니다"""
+        with self._lock:
+            if self.loaded:
+                return self.load_stats
+
+            start = time.perf_counter()
+            # 워밍업에서 지식 베이스 적재와 동시에 실행되므로 적재가 끝날 때까지 기다림
+            drug_kb.load()
+
+            for group, spec in curated_rules.GROUPS.items():
+                self._labels[f"group:{group}"] = spec["label"]
+            for key, name in drug_kb._active_ingredient_names.items():
+                self._labels[f"ingredient:{key}"] = name
+                self._ingredient_groups[key] = self._groups_of_ingredient(key)
+
+            for group, disease, severity, reason in curated_rules.DISEASE_RULES:
+                self._add_rule(self._disease_rules, (f"group:{group}", disease),
+                               {"severity": severity, "reason": reason, "source": "curated"})
+            for group_a, group_b, severity, reason in curated_rules.INTERACTION_RULES:
+                rule = {"severity": severity, "reason": reason, "source": "curated"}
+                self._add_rule(self._interaction_rules, (f"group:{group_a}", f"group:{group_b}"), rule)
+                self._add_rule(self._interaction_rules, (f"group:{group_b}", f"group:{group_a}"), rule)
+
+            curated_counts = (len(self._disease_rules), len(self._interaction_rules))
+            products = self._add_dataset_rules()
+
+            self.load_stats = {
+                "disease_rules": len(self._disease_rules),
+                "interaction_rules": len(self._interaction_rules),
+                "curated_disease_rules": curated_counts[0],
+                "curated_interaction_rules": curated_counts[1],
+                "dataset_products": products,
+                "load_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+            # check()는 잠금 없이 이 값만 확인하므로 규칙을 모두 만든 뒤에 켬
+            self.loaded = True
+            print(f"🚦 금기·상호작용 규칙 생성: 질환 {len(self._disease_rules)}개, "
+                  f"상호작용 {len(self._interaction_rules)}개 ({self.load_stats['load_ms']}ms)")
+            return self.load_stats
+
+    def ensure_loaded(self) -> bool:
+        """규칙 사전이 준비되었는지 반환합니다 (요청 처리용, 규칙 생성은 워밍업(load)에서만 함)"""
+        return self.loaded
+
+    @staticmethod
+    def _add_rule(table: Dict[Tuple[str, str], Dict[str, Any]], key: Tuple[str, str], rule: Dict[str, Any]):
+        """같은 키에 규칙이 이미 있으면 심각도가 높은 쪽을 남깁니다"""
+        known = table.get(key)
+        if known is None or SEVERITY_RANK[rule["severity"]] > SEVERITY_RANK[known["severity"]]:
+            table[key] = rule
+
+    def _add_dataset_rules(self) -> int:
+        """데이터셋 주의사항/상호작용 문장에서 규칙을 만듭니다 (규칙이 생긴 제품 수를 반환)"""
+        ingredient_matcher = KeywordMatcher({"ingredient": [
+            key for key in drug_kb._active_ingredient_names if len(key) >= _MIN_INGREDIENT_KEYWORD
+        ]})
+
+        # (항목, 대상) → 심각도 → [제품 수, 첫 근거 문장]
+        votes: Dict[str, Dict[Tuple[str, str], Dict[str, List]]] = {"disease": {}, "interaction": {}}
+
+        def vote(kind: str, subjects: List[str], target: str, severity: str, sentence: str):
+            for subject in subjects:
+                entry = votes[kind].setdefault((subject, target), {}).setdefault(severity, [0, sentence])
+                entry[0] += 1
+
+        products = 0
+        for record in drug_kb.iter_records():
+            if not record["precautions"] and not record["interactions"]:
+                continue
+            actives = sorted({key for key in map(active_ingredient_key, record["ingredients"]) if key})
+            product = f"product:{record['name']}"
+            self._labels[product] = record["name"]
+            # 여러 성분이 든 제품의 문장은 어느 성분 때문인지 알 수 없으므로 제품에만 연결
+            subjects = [product] + ([f"ingredient:{actives[0]}"] if len(actives) == 1 else [])
+            found = False
+
+            for sentence, compact in _sentences(record["precautions"]):
+                if _AVOID_RE.search(compact):
+                    severity = "contraindicated"
+                elif "상의" in compact and "전에" in compact:
+                    severity = "caution"
+                else:
+                    continue
+                for disease in self.find_diseases(compact):
+                    vote("disease", subjects, disease, severity, sentence)
+                    found = True
+
+            for sentence, compact in _sentences(record["interactions"]):
+                if _AVOID_RE.search(compact):
+                    severity = "contraindicated"
+                elif "상의" in compact or "주의" in compact:
+                    severity = "caution"
+                else:
+                    continue
+                targets = {f"group:{group}" for group in self._groups_in(compact)}
+                targets.update(
+                    f"ingredient:{key}" for _, key in ingredient_matcher.find_longest(normalize_ingredient(compact))
+                    if key not in actives
+                )
+                for target in targets:
+                    vote("interaction", subjects, target, severity, sentence)
+                    found = True
+            products += found
+
+        for kind, table in (("disease", self._disease_rules), ("interaction", self._interaction_rules)):
+            for (subject, target), severities in votes[kind].items():
+                # 제품 수가 많은 심각도, 같으면 높은 심각도
+                severity, (count, sentence) = max(
+                    severities.items(), key=lambda item: (item[1][0], SEVERITY_RANK[item[0]])
+                )
+                rule = {
+                    "severity": severity,
+                    "reason": _DATASET_REASONS[kind][severity],
+                    "source": "dataset",
+                    "evidence": _evidence(sentence),
+                    "products": count
+                }
+                # 큐레이션 규칙이 있으면 그대로 두고, 없는 쌍만 추가
+                if (subject, target) not in table:
+                    table[(subject, target)] = rule
+                if kind == "interaction" and (target, subject) not in table:
+                    table[(target, subject)] = rule
+        return products
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def resolve(self, name: str) -> Dict[str, Any]:
+        """약 이름을 규칙 조회용 항목 집합으로 바꿉니다
+
+        데이터셋에 있는 이름이면 제품·유효성분으로, 없으면 이름 자체를 성분명으로 보고
+        계열 키워드(예: 와파린, 혈압약)로 약물 계열을 찾습니다.
+        피부·눈·코에 쓰는 제형만 있는 제품에는 계열 규칙을 적용하지 않습니다.
+        """
+        named_groups = self._groups_in(name)
+        resolved = None
+        # 계열 이름(혈압약 등)은 오타 교정으로 엉뚱한 제품이 되지 않도록 데이터셋에 정확히 있을 때만 해석
+        if not named_groups or drug_kb.lookup(name, limit=1)[0] is not None:
+            resolved = drug_kb.resolve_medication(name)
+
+        if resolved is not None:
+            ingredients, products = resolved["ingredients"], resolved["products"]
+        else:
+            ingredients, products = [active_ingredient_key(name)], []
+        ingredients = [key for key in ingredients if key]
+
+        topical = bool(products) and all(
+            any(form in product for form in curated_rules.TOPICAL_FORMS) for product in products
+        )
+        groups = set() if topical else set(named_groups)
+        if not topical:
+            for key in ingredients:
+                groups.update(self._groups_of_ingredient(key))
+
+        terms = [f"product:{products[0]}"] if products else []
+        terms += [f"ingredient:{key}" for key in ingredients]
+        terms += [f"group:{group}" for group in sorted(groups)]
+        return {
+            "input": name,
+            "product": products[0] if products else None,
+            "ingredients": ingredients,
+            "groups": sorted(groups),
+            "terms": terms
+        }
+
+    def _label(self, term: str) -> str:
+        return self._labels.get(term) or term.split(":", 1)[1]
+
+    def _matched_ingredient(self, drug: Dict[str, Any], term: str) -> str:
+        """규칙이 걸린 항목에 해당하는 약의 유효성분 이름
+
+        성분 규칙이면 그 성분, 계열 규칙이면 약의 성분 중 그 계열에 속한 것,
+        제품 규칙이면 (어느 성분 때문인지 알 수 없으므로) 약의 유효성분 전체를 반환합니다.
+        """
+        kind, value = term.split(":", 1)
+        if kind == "ingredient":
+            return self._label(term)
+        keys = drug["ingredients"]
+        if kind == "group":
+            keys = [key for key in keys if value in self._groups_of_ingredient(key)] or keys
+        names = [self._label(f"ingredient:{key}") for key in keys]
+        return ", ".join(names) if names else self._label(term)
+
+    def _best(self, table: Dict[Tuple[str, str], Dict[str, Any]], subjects: List[str],
+              targets: List[str]) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """(항목, 대상) 쌍 중 가장 심각한 규칙 (같으면 큐레이션 규칙 우선)"""
+        best = None
+        for subject in subjects:
+            for target in targets:
+                rule = table.get((subject, target))
+                if rule is None:
+                    continue
+                rank = (SEVERITY_RANK[rule["severity"]], rule["source"] == "curated")
+                if best is None or rank > best[0]:
+                    best = (rank, subject, target, rule)
+        return best[1:] if best else None
+
+    def check(self, medications: Optional[List[str]] = None, diseases: Optional[List[str]] = None,
+              query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """복용 약물(과 질문에 나온 약)의 질환 금기와 약물 간 상호작용을 찾습니다
+
+        Returns:
+            심각한 순서의 [{"type": disease|interaction, "severity": contraindicated|caution,
+              "medication", "product", "ingredient", "matched_by": product|ingredient|group, "matched_term",
+              "target", "target_product", "target_ingredient", "target_matched_by", "target_matched_term",
+              "reason", "source": curated|dataset, "evidence"}]
+            ingredient은 항상 약의 유효성분 이름이고, 규칙이 걸린 제품명/계열명은 matched_term에 들어갑니다.
+        """
+        if not settings.DRUG_KB_ENABLED or not settings.DRUG_KB_RULES_ENABLED or not self.ensure_loaded():
+            return []
+
+        names = [name.strip() for name in medications or [] if name and name.strip()]
+        if query:
+            names += [record["name"] for record in drug_kb.find_mentions(query, limit=3)]
+            names += [keyword for _, keyword in self._group_matcher.find_longest(_compact(query))]
+
+        drugs, seen = [], set()
+        for name in names:
+            drug = self.resolve(name)
+            identity = drug["product"] or _compact(name)
+            if identity not in seen and drug["terms"]:
+                seen.add(identity)
+                drugs.append(drug)
+
+        conditions = []
+        for disease in diseases or []:
+            conditions += [d for d in self.find_diseases(disease) if d not in conditions]
+
+        findings = []
+        for drug in drugs:
+            for condition in conditions:
+                best = self._best(self._disease_rules, drug["terms"], [condition])
+                if best:
+                    findings.append(self._finding("disease", drug, condition, *best))
+
+        for drug, other in combinations(drugs, 2):
+            # 같은 성분이 겹치는 경우는 성분 중복 경고에서 다룸
+            if set(drug["ingredients"]) & set(other["ingredients"]):
+                continue
+            best = self._best(self._interaction_rules, drug["terms"], other["terms"])
+            if best:
+                findings.append(self._finding("interaction", drug, other, *best))
+
+        findings.sort(key=lambda f: (-SEVERITY_RANK[f["severity"]], f["type"] != "disease"))
+        return findings
+
+    def _finding(self, kind: str, drug: Dict[str, Any], target, subject: str, target_term: str,
+                 rule: Dict[str, Any]) -> Dict[str, Any]:
+        finding = {
+            "type": kind,
+            "severity": rule["severity"],
+            "medication": drug["input"],
+            "product": drug["product"],
+            "ingredient": self._matched_ingredient(drug, subject),
+            "matched_by": subject.split(":", 1)[0],
+            "matched_term": self._label(subject),
+            "target": target if kind == "disease" else target["input"],
+            "reason": rule["reason"],
+            "source": rule["source"],
+            "evidence": rule.get("evidence")
+        }
+        if kind == "interaction":
+            finding["target_product"] = target["product"]
+            finding["target_ingredient"] = self._matched_ingredient(target, target_term)
+            finding["target_matched_by"] = target_term.split(":", 1)[0]
+            finding["target_matched_term"] = self._label(target_term)
+        return finding
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"loaded": self.loaded, **self.load_stats}
+
+
+# 싱글톤 인스턴스
+contraindication_engine = ContraindicationEngine()
@@ -0,0 +1,187 @@
+"""
+금기·상호작용 규칙 큐레이션 표
+
+데이터셋(e약은요 주의사항/상호작용 문구)만으로는 성분과 질환의 관계가 문장 단위로만 드러나므로,
+자주 문제가 되는 약물 계열은 아래 표로 직접 정의합니다.
+키워드는 공백/기호를 뺀 소문자 기준으로 비교합니다.
+"""
+
+# 질환 → 판별 키워드 (기저질환 입력과 주의사항 문장에서 찾음, 긴 키워드 우선)
+DISEASES = {
+    "고혈압": ["고혈압", "혈압이높"],
+    "당뇨병": ["당뇨", "혈당이높"],
+    "심장질환": [
+        "심장질환", "심장애", "심장장애", "심질환", "심장병", "심혈관질환", "관상동맥", "협심증", "심근경색",
+        "부정맥", "심부전", "심기능부전", "심기능장애", "심장기능장애"
+    ],
+    "간질환": ["간질환", "간장애", "간장장애", "간기능장애", "간기능저하", "간경변", "간경화", "간염", "간부전", "간손상"],
+    "신장질환": [
+        "신장질환", "신장애", "신장장애", "신질환", "신부전", "신기능장애", "신기능저하", "신장병", "콩팥", "투석"
+    ],
+    "위궤양": [
+        "위궤양", "소화성궤양", "십이지장궤양", "소화궤양", "위장관궤양", "소화관궤양", "위장출혈", "위장관출혈",
+        "위출혈"
+    ],
+    "염증성장질환": ["궤양성대장염", "궤양성결장염", "크론병", "염증성장질환"],
+    "천식": ["천식"],
+    "녹내장": ["녹내장"],
+    "전립선비대증": ["전립선비대", "배뇨장애", "배뇨곤란", "요폐"],
+    "갑상선기능항진증": ["갑상선기능항진", "갑상샘기능항진"],
+    "출혈성질환": ["혈우병", "출혈경향", "출혈성소인", "혈소판감소", "혈액응고장애"],
+    "뇌혈관질환": ["뇌혈관질환", "뇌졸중", "뇌출혈", "뇌경색"],
+    "뇌전증": ["뇌전증", "경련성질환", "경련의기왕력"],
+    "임신·수유": ["임부", "임신", "임산부", "수유부", "수유중"],
+}
+
+# 다른 질환의 일부로 잘못 잡히지 않도록 먼저 소비할 키워드 (예: 정신장애 속 "신장애")
+DISEASE_STOPWORDS = ["정신장애", "정신신경장애"]
+
+# 약물 계열: 성분 키에 포함될 문자열(ingredients)과 문장/약 이름에서 계열을 나타내는 말(keywords)
+GROUPS = {
+    "nsaid": {
+        "label": "비스테로이드성 소염진통제",
+        "ingredients": [
+            "이부프로펜", "덱시부프로펜", "나프록센", "아스피린", "아세틸살리실산", "케토프로펜", "록소프로펜",
+            "디클로페낙", "플루르비프로펜", "멜록시캄", "셀레콕시브", "아세클로페낙", "잘토프로펜", "에토돌락"
+        ],
+        "keywords": ["비스테로이드성소염진통제", "비스테로이드성항염증약", "소염진통제", "nsaid"]
+    },
+    "acetaminophen": {
+        "label": "아세트아미노펜",
+        "ingredients": ["아세트아미노펜", "파라세타몰"],
+        "keywords": []
+    },
+    "sympathomimetic": {
+        "label": "교감신경흥분제(코막힘 완화 성분)",
+        "ingredients": ["에페드린", "페닐레프린", "페닐프로판올아민"],
+        "keywords": ["교감신경흥분제", "교감신경성약", "교감신경작용제", "충혈제거제"]
+    },
+    "antihistamine": {
+        "label": "1세대 항히스타민제",
+        "ingredients": [
+            "클로르페니라민", "디펜히드라민", "트리프롤리딘", "브롬페니라민", "독실아민", "카르비녹사민",
+            "메퀴타진", "디멘히드리네이트", "히드록시진", "시프로헵타딘"
+        ],
+        "keywords": ["항히스타민제"]
+    },
+    "dextromethorphan": {
+        "label": "덱스트로메토르판",
+        "ingredients": ["덱스트로메토르판"],
+        "keywords": []
+    },
+    "caffeine": {
+        "label": "카페인",
+        "ingredients": ["카페인"],
+        "keywords": []
+    },
+    "antacid_metal": {
+        "label": "마그네슘·알루미늄·칼슘 제산제",
+        "ingredients": ["마그네슘", "알루미늄", "알마게이트", "탄산칼슘", "히드로탈시트", "마가트레이트"],
+        "keywords": ["제산제"]
+    },
+    "anticoagulant": {
+        "label": "항응고제",
+        "ingredients": ["와파린", "리바록사반", "아픽사반", "에독사반", "다비가트란"],
+        "keywords": ["항응고제", "쿠마린계", "쿠마딘", "와파린"]
+    },
+    "antiplatelet": {
+        "label": "항혈소판제",
+        "ingredients": ["클로피도그렐", "티카그렐러", "프라수그렐", "실로스타졸", "아스피린", "아세틸살리실산"],
+        "keywords": ["항혈소판제", "혈전용해제"]
+    },
+    "maoi": {
+        "label": "MAO 억제제",
+        "ingredients": ["셀레길린", "라사길린", "모클로베미드", "페넬진", "트라닐시프로민", "리네졸리드"],
+        "keywords": ["mao억제제", "모노아민산화효소억제제", "모노아민옥시다제억제제"]
+    },
+    "serotonergic_antidepressant": {
+        "label": "세로토닌계 항우울제",
+        "ingredients": [
+            "플루옥세틴", "세르트랄린", "파록세틴", "에스시탈로프람", "시탈로프람", "플루복사민", "벤라팍신",
+            "둘록세틴"
+        ],
+        "keywords": ["선택적세로토닌재흡수억제제", "ssri", "항우울제", "항우울약"]
+    },
+    "antihypertensive": {
+        "label": "혈압약",
+        "ingredients": [
+            "암로디핀", "니페디핀", "로사르탄", "발사르탄", "텔미사르탄", "올메사르탄", "칸데사르탄", "이르베사르탄",
+            "리시노프릴", "에날라프릴", "라미프릴", "페린도프릴", "히드로클로로티아지드", "인다파미드",
+            "아테놀롤", "비소프롤롤", "카르베딜롤"
+        ],
+        "keywords": ["혈압강하제", "항고혈압제", "고혈압약", "고혈압치료제", "혈압약"]
+    },
+    "quinolone_tetracycline": {
+        "label": "테트라사이클린계·퀴놀론계 항생제",
+        "ingredients": [
+            "테트라사이클린", "독시사이클린", "미노사이클린", "시프로플록사신", "레보플록사신", "목시플록사신",
+            "오플록사신"
+        ],
+        "keywords": ["테트라사이클린계", "퀴놀론계", "뉴퀴놀론"]
+    },
+    "metformin": {
+        "label": "메트포르민",
+        "ingredients": ["메트포르민"],
+        "keywords": []
+    },
+    "lithium": {
+        "label": "리튬",
+        "ingredients": ["리튬"],
+        "keywords": ["리튬"]
+    },
+    "methotrexate": {
+        "label": "메토트렉세이트",
+        "ingredients": ["메토트렉세이트"],
+        "keywords": ["메토트렉세이트"]
+    },
+}
+
+# 피부·눈·코에 쓰는 제형 (전신 작용 기준의 계열 규칙은 적용하지 않음)
+TOPICAL_FORMS = [
+    "연고", "크림", "겔", "젤", "로션", "외용액", "점안액", "점비액", "스프레이", "패취", "패치", "플라스타",
+    "카타플라스마", "파스"
+]
+
+# (계열, 질환, 심각도, 이유). 심각도: contraindicated(복용하지 말 것) / caution(의사·약사와 상의)
+DISEASE_RULES = [
+    ("nsaid", "위궤양", "contraindicated", "위 점막을 보호하는 물질을 줄여 궤양과 위장 출혈을 악화시킬 수 있습니다"),
+    ("nsaid", "염증성장질환", "caution", "장 점막 손상과 출혈로 증상이 악화될 수 있습니다"),
+    ("nsaid", "신장질환", "caution", "신장 혈류를 줄여 신기능을 더 떨어뜨릴 수 있습니다"),
+    ("nsaid", "고혈압", "caution", "몸에 수분과 나트륨을 붙잡아 혈압을 올리고 혈압약 효과를 떨어뜨릴 수 있습니다"),
+    ("nsaid", "심장질환", "caution", "심부전을 악화시키고 심혈관 사건 위험을 높일 수 있습니다"),
+    ("nsaid", "천식", "caution", "진통제 과민성 천식(아스피린 천식) 발작을 일으킬 수 있습니다"),
+    ("nsaid", "출혈성질환", "caution", "혈소판 기능을 떨어뜨려 출혈 경향을 높입니다"),
+    ("nsaid", "임신·수유", "caution", "임신 20주 이후에는 태아의 신장과 동맥관에 영향을 줄 수 있습니다"),
+    ("acetaminophen", "간질환", "caution", "간에서 대사되므로 간 손상 위험이 커지며 하루 최대 용량을 줄여야 합니다"),
+    ("sympathomimetic", "고혈압", "contraindicated", "혈관을 수축시켜 혈압을 올립니다"),
+    ("sympathomimetic", "심장질환", "contraindicated", "심박수를 높이고 부정맥이나 협심증을 유발할 수 있습니다"),
+    ("sympathomimetic", "갑상선기능항진증", "caution", "두근거림, 떨림 등 교감신경 증상이 심해질 수 있습니다"),
+    ("sympathomimetic", "당뇨병", "caution", "혈당을 올릴 수 있습니다"),
+    ("sympathomimetic", "녹내장", "caution", "동공을 넓혀 안압을 올릴 수 있습니다"),
+    ("sympathomimetic", "전립선비대증", "caution", "방광 출구를 조여 소변 보기가 더 어려워질 수 있습니다"),
+    ("antihistamine", "녹내장", "caution", "항콜린 작용으로 안압을 올릴 수 있습니다"),
+    ("antihistamine", "전립선비대증", "caution", "항콜린 작용으로 소변이 나오지 않을 수 있습니다"),
+    ("caffeine", "심장질환", "caution", "심박수를 높이고 부정맥을 유발할 수 있습니다"),
+    ("caffeine", "위궤양", "caution", "위산 분비를 늘려 궤양 증상을 악화시킬 수 있습니다"),
+    ("antacid_metal", "신장질환", "caution", "마그네슘·알루미늄이 배설되지 않고 몸에 쌓일 수 있습니다"),
+    ("metformin", "신장질환", "caution", "신기능이 떨어지면 젖산산증 위험이 커집니다"),
+]
+
+# (계열, 계열, 심각도, 이유). 순서는 상관없음
+INTERACTION_RULES = [
+    ("nsaid", "anticoagulant", "contraindicated", "출혈 위험이 크게 높아집니다"),
+    ("nsaid", "antiplatelet", "caution", "위장 출혈 위험이 높아집니다"),
+    ("nsaid", "nsaid", "caution", "같은 계열 진통소염제를 함께 먹으면 위장 출혈과 신장 부작용이 커집니다"),
+    ("nsaid", "antihypertensive", "caution", "혈압약 효과가 떨어지고 신장에 부담이 커집니다"),
+    ("nsaid", "serotonergic_antidepressant", "caution", "위장 출혈 위험이 높아집니다"),
+    ("nsaid", "lithium", "caution", "리튬 혈중 농도가 올라 독성이 나타날 수 있습니다"),
+    ("nsaid", "methotrexate", "contraindicated", "메토트렉세이트 배설이 줄어 독성이 커집니다"),
+    ("acetaminophen", "anticoagulant", "caution", "규칙적으로 먹으면 와파린 효과(INR)가 올라갈 수 있습니다"),
+    ("anticoagulant", "antiplatelet", "caution", "출혈 위험이 높아집니다"),
+    ("sympathomimetic", "maoi", "contraindicated", "혈압이 급격히 오르는 고혈압 위기가 올 수 있습니다"),
+    ("sympathomimetic", "antihypertensive", "caution", "혈압약 효과를 떨어뜨립니다"),
+    ("dextromethorphan", "maoi", "contraindicated", "세로토닌 증후군(고열, 경련, 의식 저하)이 올 수 있습니다"),
+    ("dextromethorphan", "serotonergic_antidepressant", "caution", "세로토닌 증후군 위험이 있습니다"),
+    ("antihistamine", "antihistamine", "caution", "졸음과 항콜린 부작용(입마름, 배뇨곤란)이 겹칩니다"),
+    ("antacid_metal", "quinolone_tetracycline", "caution", "항생제 흡수가 줄어듭니다 (2시간 이상 간격을 두세요)"),
+]
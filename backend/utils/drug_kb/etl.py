@@ -0,0 +1,62 @@
+"""
+의약품 데이터셋 컴파일 (오프라인 ETL)
+
+MedDB_explain.csv, eMedDB_agent.txt, reduced_rows_to_4mb_수정본.csv를 읽어
+문자열 중복을 제거한 열 단위 바이너리(DRUG_KB_BINARY_PATH)로 저장합니다.
+워커들은 이 파일을 mmap으로 열어 페이지 캐시를 공유하므로 CSV 파싱과 인덱스 계산을 건너뜁니다.
+
+원본 체크섬(sha256)이 바뀐 경우에만 다시 만듭니다.
+
+실행 (backend/에서): python -m utils.drug_kb.etl [--force] [--check]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from core.config import settings
+from .compiled import changed_sources, read_header
+from .knowledge_base import DrugKnowledgeBase
+
+
+def compile_drug_kb(data_dir: str, output: str, force: bool = False) -> bool:
+    """원본이 바뀌었으면 바이너리를 다시 만듭니다 (다시 만들었으면 True)"""
+    kb = DrugKnowledgeBase(data_dir=data_dir, binary_path="")
+    changed = changed_sources(read_header(output), kb.source_paths())
+    if not changed and not force:
+        print(f"✅ 최신 상태입니다: {output}")
+        return False
+
+    print(f"🔄 변경된 원본: {', '.join(changed) or '없음 (--force)'}")
+    start = time.perf_counter()
+    stats = kb.load()
+    if not stats["files"]:
+        raise FileNotFoundError(f"의약품 데이터 파일이 없습니다: {data_dir}")
+    kb.save_compiled(output, files=stats["files"], missing=stats["missing_files"], skipped=stats["skipped_lines"])
+
+    header = read_header(output)
+    print(f"🗜️ 컴파일 완료: {output} ({os.path.getsize(output) / 1024 / 1024:.2f}MB, "
+          f"레코드 {header['records']}개, 문자열 {header['strings']}개, "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의약품 데이터셋을 mmap용 바이너리로 컴파일")
+    parser.add_argument("--data-dir", default=settings.DRUG_KB_DATA_DIR, help="데이터셋 디렉토리")
+    parser.add_argument("--output", default=settings.DRUG_KB_BINARY_PATH, help="바이너리 저장 경로")
+    parser.add_argument("--force", action="store_true", help="원본이 바뀌지 않았어도 다시 생성")
+    parser.add_argument("--check", action="store_true", help="다시 만들어야 하는지만 확인 (필요하면 종료 코드 1)")
+    args = parser.parse_args()
+
+    if args.check:
+        changed = changed_sources(read_header(args.output), DrugKnowledgeBase(args.data_dir, "").source_paths())
+        print(f"🔄 다시 생성 필요: {', '.join(changed)}" if changed else f"✅ 최신 상태입니다: {args.output}")
+        sys.exit(1 if changed else 0)
+
+    compile_drug_kb(args.data_dir, args.output, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+_HANGUL_BASE, _HANGUL_COUNT = 0xAC00, 11172
+_JUNG_COUNT, _JONG_COUNT = 21, 28
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 풀어 씁니다 (예: 놀 → ㄴㅗㄹ, 한글이 아닌 문자는 그대로)
+
+    음성 인식/OCR 오류는 대개 음절 전체가 아니라 자모 하나가 바뀌는 형태이므로
+    (타이레롤, 타이래놀) 자모 단위로 편집 거리를 계산합니다.
+    """
+    result = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code < _HANGUL_COUNT:
+            result.append(chr(0x1100 + code // (_JUNG_COUNT * _JONG_COUNT)))
+            result.append(chr(0x1161 + code % (_JUNG_COUNT * _JONG_COUNT) // _JONG_COUNT))
+            if code % _JONG_COUNT:
+                result.append(chr(0x11A7 + code % _JONG_COUNT))
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 문자 교환을 포함한 편집 거리 (OSA). max_distance를 넘으면 max_distance + 1을 반환합니다"""
+    if a == b:
+        return 0
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > max_distance:
+        return max_distance + 1
+    if len_a > len_b:
+        a, b, len_a, len_b = b, a, len_b, len_a
+
+    # 공통 접두어/접미어 제거
+    start = 0
+    while start < len_a and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len_a, len_b
+    while end_a > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    if len_a == 0:
+        return len_b if len_b <= max_distance else max_distance + 1
+
+    # max_distance 폭의 대각선 띠 안의 칸만 계산
+    big = max_distance + 1
+    previous_previous = None
+    previous = [j if j <= max_distance else big for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        lo, hi = max(1, i - max_distance), min(len_b, i + max_distance)
+        current = [big] * (len_b + 1)
+        current[0] = i if i <= max_distance else big
+        row_min = current[0]
+        char_a = a[i - 1]
+        for j in range(lo, hi + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (previous_previous is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous_previous[j - 2] + 1 < value):
+                value = previous_previous[j - 2] + 1
+            current[j] = value if value < big else big
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return big
+        previous_previous, previous = previous, current
+    return previous[len_b] if previous[len_b] <= max_distance else big
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """word에서 글자를 최대 max_distance개 지운 모든 문자열 (word 포함)"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for index in range(len(item)):
+                deleted = item[:index] + item[index + 1:]
+                if deleted not in result:
+                    next_frontier.add(deleted)
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+class FuzzyNameResolver:
+    """SymSpell 방식의 오타 교정기 (삭제 사전을 미리 계산, 자모 단위 편집 거리)
+
+    - 사전 단어마다 자모 앞부분(prefix_length)에서 최대 max_distance개를 지운 문자열을 만들어
+      삭제 문자열 → 단어 번호 사전에 넣어 둡니다
+    - 질의도 같은 방식으로 지운 문자열을 만들어 사전에서 후보를 모은 뒤,
+      후보에 대해서만 실제 편집 거리를 계산합니다 (사전 전체를 비교하지 않음)
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, Dict[str, Any]]], max_distance: int = 2, prefix_length: int = 7,
+                 jamo: Optional[Sequence[str]] = None, deletes=None):
+        """terms: (비교용 키, 결과 정보) 목록. 같은 키가 여러 번 나오면 처음 것을 사용
+
+        jamo/deletes: 컴파일된 파일에서 읽은 자모 목록과 삭제 사전 (get()을 지원하는 객체).
+        주어지면 다시 계산하지 않으며, 같은 terms로 만든 것이어야 합니다.
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._keys: List[str] = []
+        self._jamo: List[str] = []
+        self._info: List[Dict[str, Any]] = []
+        self._key_ids: Dict[str, int] = {}
+        self._deletes = deletes if deletes is not None else {}
+
+        for key, info in terms:
+            if not key or key in self._key_ids:
+                continue
+            term_id = len(self._keys)
+            self._key_ids[key] = term_id
+            self._keys.append(key)
+            term_jamo = jamo[term_id] if jamo is not None else to_jamo(key)
+            self._jamo.append(term_jamo)
+            self._info.append(info)
+            if deletes is None:
+                for deleted in _deletes(term_jamo[:prefix_length], max_distance):
+                    self._deletes.setdefault(deleted, []).append(term_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def delete_entries(self) -> int:
+        return len(self._deletes)
+
+    def iter_deletes(self) -> Iterator[Tuple[str, List[int]]]:
+        """(삭제 문자열, 단어 번호 목록) 전체 (컴파일된 파일 저장용)"""
+        return iter(self._deletes.items())
+
+    def lookup(self, key: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """key와 자모 편집 거리가 max_distance 이하인 단어를 가까운 순으로 반환합니다
+
+        Returns:
+            [{"key": 사전 단어, "distance": 자모 편집 거리, **결과 정보}]
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if not key:
+            return []
+        if key in self._key_ids:
+            term_id = self._key_ids[key]
+            return [{"key": key, "distance": 0, **self._info[term_id]}]
+
+        jamo = to_jamo(key)
+        candidates: Set[int] = set()
+        for deleted in _deletes(jamo[:self.prefix_length], max_distance):
+            term_ids = self._deletes.get(deleted)
+            if term_ids:
+                candidates.update(term_ids)
+
+        results = []
+        for term_id in candidates:
+            term_jamo = self._jamo[term_id]
+            if abs(len(term_jamo) - len(jamo)) > max_distance:
+                continue
+            distance = bounded_edit_distance(jamo, term_jamo, max_distance)
+            if distance <= max_distance:
+                results.append((distance, abs(len(term_jamo) - len(jamo)), term_id))
+
+        results.sort()
+        return [
+            {"key": self._keys[term_id], "distance": distance, **self._info[term_id]}
+            for distance, _, term_id in results[:limit]
+        ]
+
+    def brute_force_lookup(self, key: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """사전 전체와 편집 거리를 비교하는 기준 구현 (벤치마크/검증용)"""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        jamo = to_jamo(key)
+        results = []
+        for term_id, term_jamo in enumerate(self._jamo):
+            distance = bounded_edit_distance(jamo, term_jamo, max_distance)
+            if distance <= max_distance:
+                results.append((distance, abs(len(term_jamo) - len(jamo)), term_id))
+        results.sort()
+        return [
+            {"key": self._keys[term_id], "distance": distance, **self._info[term_id]}
+            for distance, _, term_id in results[:limit]
+        ]
@@ -0,0 +1,733 @@
+import csv
+import os
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.config import settings
+from utils.intent import KeywordMatcher
+from .suggest import DrugNameSuggester
+from .fuzzy import FuzzyNameResolver, to_jamo
+from .compiled import (
+    CompiledFile, MappedPostings, MappedRecords, StringPool, changed_sources, hash_table_sections, read_header,
+    source_states, write_compiled
+)
+
+# 레코드 필드 (메모리를 아끼기 위해 레코드는 이 순서의 튜플로 저장)
+FIELDS = (
+    "name", "company", "ingredients", "efficacy", "usage",
+    "precautions", "interactions", "adverse_reactions", "storage", "sources"
+)
+_FIELD_INDEX = {field: index for index, field in enumerate(FIELDS)}
+_LIST_FIELDS = ("ingredients", "sources")
+
+# 데이터셋 파일
+MEDDB_FILE = "MedDB_explain.csv"       # 제품명,주성분,효능,사용법,보관법 (utf-8-sig, 목록은 '|'로 구분)
+EMEDDB_FILE = "eMedDB_agent.txt"       # e약은요: '/'로 구분된 9개 필드 (본문에 '/'가 섞여 있음)
+REDUCED_FILE = "reduced_rows_to_4mb_수정본.csv"  # e약은요 수정본: 같은 9개 필드 (cp949, 목록은 '|'로 구분, 본문 공백 제거됨)
+EMEDDB_TEXT_FIELDS = ("efficacy", "usage", "precautions", "interactions", "adverse_reactions")
+
+# 제품명 끝에서 제거할 제형 (긴 것부터 비교)
+DOSAGE_FORMS = sorted([
+    "연질캡슐", "경질캡슐", "캡슐", "필름코팅정", "서방정", "장용정", "발포정", "츄어블정", "츄정",
+    "설하정", "정", "시럽", "건조시럽", "현탁액", "내복액", "액", "과립", "세립", "연고", "크림",
+    "겔", "젤", "로션", "점안액", "점비액", "스프레이", "패취", "패치", "플라스타", "좌제", "좌약",
+    "껌", "트로키", "산"
+], key=len, reverse=True)
+
+_PAREN_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]")
+_STRENGTH_RE = re.compile(
+    r"\d+(\.\d+)?(밀리그램|밀리그람|마이크로그램|밀리리터|그램|mg|mcg|㎍|ml|g|iu|단위|퍼센트|%)?$"
+)
+
+# 자유 텍스트에서 약품명을 찾을 때 사용할 최소 길이 (짧은 별칭은 일반 단어와 겹침)
+MIN_MENTION_LENGTH = 3
+
+# 성분 중복 판단 시 같은 유효성분으로 볼 원료 형태/염 (성분명 앞뒤에서 제거, 긴 것부터 비교)
+INGREDIENT_FORM_SUFFIXES = sorted([
+    "제피세립", "세립", "과립", "미분화", "디씨", "무수물", "수화물", "나트륨", "칼륨", "칼슘",
+    "염산염", "리신", "아르기닌"
+], key=len, reverse=True)
+INGREDIENT_FORM_PREFIXES = ("무수",)
+
+# 오타 교정 (음성 인식/OCR/직접 입력한 약 이름)
+FUZZY_MAX_DISTANCE = 2  # 자모 편집 거리
+FUZZY_MIN_JAMO = 6  # 이보다 짧은 단어는 교정하지 않음 (일반 단어와 혼동)
+FUZZY_SHORT_JAMO = 10  # 이보다 짧은 단어는 거리 1까지만 교정
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+_PARTICLES = sorted(
+    ["이랑", "하고", "에서", "으로", "을", "를", "이", "가", "은", "는", "도", "와", "과", "랑", "에", "의", "로", "만"],
+    key=len, reverse=True
+)
+
+
+def normalize_drug_name(name: str) -> str:
+    """제품명을 비교용으로 정규화합니다 (괄호 내용, 공백/기호 제거, 소문자)"""
+    name = unicodedata.normalize("NFKC", name or "").lower()
+    return _NON_WORD_RE.sub("", _PAREN_RE.sub("", name))
+
+
+def normalize_ingredient(name: str) -> str:
+    """성분명을 비교용으로 정규화합니다 (공백/기호 제거, 소문자)"""
+    return _NON_WORD_RE.sub("", unicodedata.normalize("NFKC", name or "").lower())
+
+
+def base_drug_name(name: str) -> str:
+    """제품명에서 함량과 제형을 떼어낸 기본 이름 (예: 타이레놀정500밀리그람 → 타이레놀)"""
+    base = normalize_drug_name(name)
+    base = _STRENGTH_RE.sub("", base)
+    for form in DOSAGE_FORMS:
+        if base.endswith(form) and len(base) - len(form) >= 2:
+            base = base[:-len(form)]
+            break
+    return _STRENGTH_RE.sub("", base)
+
+
+def active_ingredient_key(name: str) -> str:
+    """같은 유효성분이면 같은 값이 되도록 성분명을 정규화합니다
+
+    원료 형태와 염을 떼어냅니다 (예: 아세트아미노펜과립 → 아세트아미노펜, 나프록센나트륨 → 나프록센,
+    무수카페인/카페인무수물 → 카페인).
+    """
+    key = normalize_ingredient(_PAREN_RE.sub("", unicodedata.normalize("NFKC", name or "")))
+    for prefix in INGREDIENT_FORM_PREFIXES:
+        if key.startswith(prefix) and len(key) - len(prefix) >= 2:
+            key = key[len(prefix):]
+    for suffix in INGREDIENT_FORM_SUFFIXES:
+        if key.endswith(suffix) and len(key) - len(suffix) >= 2:
+            key = key[:-len(suffix)]
+            break
+    return key
+
+
+def format_duplicate_warning(duplicates: List[Dict[str, Any]]) -> str:
+    """성분 중복 검사 결과를 답변 앞에 붙일 경고 문구로 만듭니다 (중복이 없으면 빈 문자열)"""
+    if not duplicates:
+        return ""
+    lines = ["⚠️ 성분 중복 경고"]
+    for duplicate in duplicates:
+        lines.append(
+            f"- {', '.join(duplicate['medications'])}에 모두 '{duplicate['ingredient']}' 성분이 들어 있습니다."
+        )
+    lines.append("같은 성분을 함께 복용하면 하루 최대 용량을 넘길 수 있으니, 복용 전에 의사나 약사와 상의하세요.")
+    return "\n".join(lines)
+
+
+def _clean_text(text: str) -> str:
+    """데이터셋 본문 정리 (MedDB는 쉼표 대신 '|'를 사용)"""
+    return re.sub(r"\s+", " ", (text or "").replace("|", ", ").replace("\xa0", " ")).strip()
+
+
+def _split_emeddb_line(line: str) -> Optional[List[str]]:
+    """e약은요 한 줄을 9개 필드로 나눕니다
+
+    본문에도 '/'가 들어 있으므로(예: 3mg/100mL) 앞 3개(제품명/업체명/주성분)와
+    마지막(보관법)을 고정하고, 가운데 조각은 문장이 끝나지 않았으면 다음 조각과 합칩니다.
+    필드 수를 맞출 수 없으면 None을 반환합니다.
+    """
+    parts = line.split("/")
+    if len(parts) < 9:
+        return None
+    head, middle, storage = parts[:3], parts[3:-1], parts[-1]
+    if len(middle) != len(EMEDDB_TEXT_FIELDS):
+        merged: List[str] = []
+        for piece in middle:
+            if merged and not merged[-1].rstrip().endswith((".", "-")):
+                merged[-1] += "/" + piece
+            else:
+                merged.append(piece)
+        middle = merged
+    if len(middle) != len(EMEDDB_TEXT_FIELDS):
+        return None
+    return head + middle + [storage]
+
+
+class DrugKnowledgeBase:
+    """MedDB / e약은요 데이터셋으로 만든 의약품 지식 베이스
+
+    - 앱 시작 시(워밍업) 한 번 읽어 레코드를 튜플 목록으로 보관하고,
+      제품명(원문/정규화/기본 이름)과 성분명 → 레코드 번호 사전을 만듭니다
+    - 조회는 사전 조회만 하므로 LLM 호출 없이 1ms 이내에 끝납니다
+      요청 처리 중에는 적재하지 않으며, 아직 적재 전이면 빈 결과를 반환합니다
+    - 데이터 파일이 없으면 빈 지식 베이스로 동작합니다
+    - 컴파일된 바이너리(DRUG_KB_BINARY_PATH, python -m utils.drug_kb.etl)가 최신이면
+      CSV를 파싱하지 않고 mmap으로 열어 레코드 본문과 오타 교정 사전을 워커끼리 공유합니다
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, binary_path: Optional[str] = None):
+        self.data_dir = data_dir if data_dir is not None else settings.DRUG_KB_DATA_DIR
+        self.binary_path = binary_path if binary_path is not None else settings.DRUG_KB_BINARY_PATH
+        self._records: Sequence[Tuple] = []
+        self._compiled: Optional[CompiledFile] = None
+        self._by_name: Dict[str, int] = {}
+        self._by_normalized: Dict[str, List[int]] = {}
+        self._by_alias: Dict[str, List[int]] = {}
+        self._by_ingredient: Dict[str, List[int]] = {}
+        self._ingredient_names: Dict[str, str] = {}
+        self._by_active_ingredient: Dict[str, List[int]] = {}  # 유효성분 → 제품 (성분 중복 검사용 역색인)
+        self._active_ingredient_names: Dict[str, str] = {}
+        self._mention_matcher: Optional[KeywordMatcher] = None
+        self._suggester: Optional[DrugNameSuggester] = None
+        self._fuzzy: Optional[FuzzyNameResolver] = None
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.load_stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # 적재
+    # ------------------------------------------------------------------
+    def _read_meddb(self, path: str) -> Tuple[List[Dict[str, Any]], int]:
+        rows = []
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 헤더
+            for row in reader:
+                if len(row) < 5 or not row[0].strip():
+                    continue
+                rows.append({
+                    "name": row[0].strip(),
+                    "ingredients": [i.strip() for i in row[1].split("|") if i.strip()],
+                    "efficacy": _clean_text(row[2]),
+                    "usage": _clean_text(row[3]),
+                    "storage": _clean_text(row[4])
+                })
+        return rows, 0
+
+    def _read_emeddb(self, path: str) -> Tuple[List[Dict[str, Any]], int]:
+        rows, skipped = [], 0
+        with open(path, encoding="utf-8") as f:
+            next(f, None)  # 헤더
+            for line in f:
+                line = line.rstrip("\n")
+                if not line.strip():
+                    continue
+                parts = _split_emeddb_line(line)
+                if parts is None:
+                    skipped += 1
+                    continue
+                rows.append(self._emeddb_row(parts, ","))
+        return rows, skipped
+
+    def _read_reduced(self, path: str) -> Tuple[List[Dict[str, Any]], int]:
+        rows, skipped = [], 0
+        with open(path, encoding="cp949", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 헤더
+            for row in reader:
+                if len(row) < 9 or not row[0].strip():
+                    skipped += 1
+                    continue
+                rows.append(self._emeddb_row(row[:9], "|"))
+        return rows, skipped
+
+    @staticmethod
+    def _emeddb_row(parts: List[str], ingredient_separator: str) -> Dict[str, Any]:
+        """e약은요 형식 9개 필드 → 레코드 딕셔너리"""
+        row = {
+            "name": parts[0].strip(),
+            "company": parts[1].strip(),
+            "ingredients": [i.strip() for i in parts[2].split(ingredient_separator) if i.strip()],
+            "storage": _clean_text(parts[-1])
+        }
+        for field, value in zip(EMEDDB_TEXT_FIELDS, parts[3:-1]):
+            value = _clean_text(value)
+            row[field] = "" if value == "-" else value
+        return row
+
+    def _read_sources(self) -> Tuple[Dict[str, Dict[str, Any]], List[str], List[str], int]:
+        """데이터 파일을 읽어 제품명별로 합칩니다
+
+        같은 필드가 여러 파일에 있으면 MedDB → e약은요 → e약은요 수정본 순으로 우선합니다.
+
+        Returns:
+            (제품명 → 레코드, 읽은 파일, 없는 파일, 건너뛴 줄 수)
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        files, missing, skipped = [], [], 0
+        for file_name, reader, source in ((MEDDB_FILE, self._read_meddb, "MedDB"),
+                                          (EMEDDB_FILE, self._read_emeddb, "e약은요"),
+                                          (REDUCED_FILE, self._read_reduced, "e약은요 수정본")):
+            path = os.path.join(self.data_dir, file_name)
+            if not os.path.exists(path):
+                missing.append(file_name)
+                continue
+            files.append(file_name)
+            rows, file_skipped = reader(path)
+            skipped += file_skipped
+            for row in rows:
+                record = merged.setdefault(row["name"], {"name": row["name"], "ingredients": [], "sources": []})
+                record["sources"].append(source)
+                record["ingredients"] = list(dict.fromkeys(record["ingredients"] + row["ingredients"]))
+                for field, value in row.items():
+                    if field not in ("name", "ingredients") and value and not record.get(field):
+                        record[field] = value
+        return merged, files, missing, skipped
+
+    def load(self) -> Dict[str, Any]:
+        """데이터셋을 읽어 인덱스를 만듭니다 (이미 적재되었으면 통계만 반환)
+
+        컴파일된 바이너리가 최신이면 그것을 mmap으로 열고, 없거나 원본 체크섬이 바뀌었으면
+        원본을 파싱합니다 (DRUG_KB_AUTO_COMPILE이면 이때 바이너리를 다시 만듦).
+        """
+        with self._lock:
+            if self.loaded:
+                return self.load_stats
+
+            start = time.perf_counter()
+            header = read_header(self.binary_path) if self.binary_path else None
+            changed = changed_sources(header, self.source_paths()) if self.binary_path else []
+            storage = "memory"
+
+            if header is not None and not changed:
+                try:
+                    self._load_compiled(CompiledFile(self.binary_path))
+                    storage = "mmap"
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ 의약품 바이너리 열기 실패, 원본을 파싱합니다: {e}")
+                    self._reset_index()
+
+            if storage == "mmap":
+                files, missing, skipped = header["files"], header["missing_files"], header["skipped_lines"]
+            else:
+                merged, files, missing, skipped = self._read_sources()
+                self._build_index(merged.values())
+                if self.binary_path and settings.DRUG_KB_AUTO_COMPILE and files:
+                    try:
+                        self.save_compiled(self.binary_path, files=files, missing=missing, skipped=skipped)
+                        print(f"🗜️ 의약품 바이너리 생성: {self.binary_path} (변경: {', '.join(changed)})")
+                    except OSError as e:
+                        # 저장에 실패해도 메모리 인덱스로 계속 동작
+                        print(f"⚠️ 의약품 바이너리 저장 실패: {e}")
+
+            self.load_stats = {
+                "data_dir": self.data_dir,
+                "files": files,
+                "missing_files": missing,
+                "storage": storage,
+                "binary_path": self.binary_path or None,
+                "records": len(self._records),
+                "skipped_lines": skipped,
+                "name_keys": len(self._by_normalized),
+                "alias_keys": len(self._by_alias),
+                "ingredient_keys": len(self._by_ingredient),
+                "active_ingredient_keys": len(self._by_active_ingredient),
+                "suggest_entries": len(self._suggester),
+                "fuzzy_terms": len(self._fuzzy),
+                "fuzzy_delete_entries": self._fuzzy.delete_entries,
+                "load_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+            # 조회 메서드는 잠금 없이 이 값만 확인하므로 인덱스와 통계를 모두 만든 뒤에 켬
+            self.loaded = True
+            if missing:
+                print(f"⚠️ 의약품 데이터 파일 없음: {', '.join(missing)} ({self.data_dir})")
+            print(f"💊 의약품 지식 베이스 적재: {len(self._records)}개 "
+                  f"({self.load_stats['load_ms']}ms, {storage})")
+            return self.load_stats
+
+    def _reset_index(self):
+        self._records = []
+        self._compiled = None
+        for index in (self._by_name, self._by_normalized, self._by_alias, self._by_ingredient,
+                      self._ingredient_names, self._by_active_ingredient, self._active_ingredient_names):
+            index.clear()
+
+    @staticmethod
+    def _record_keys(name: str, ingredients: Iterable[str]) -> Tuple[str, str, List[Tuple[str, str, str]]]:
+        """레코드의 조회 키 (정규화 이름, 별칭, [(성분명, 성분 키, 유효성분 키)])"""
+        return normalize_drug_name(name), base_drug_name(name), [
+            (ingredient, normalize_ingredient(ingredient), active_ingredient_key(ingredient))
+            for ingredient in ingredients
+        ]
+
+    def _build_index(self, records):
+        # 제품명 순으로 정렬해 두면 같은 별칭 안에서는 짧은(대표) 제품명이 앞에 옴
+        self._records = [
+            tuple(
+                tuple(record.get(field) or ()) if field in _LIST_FIELDS else record.get(field, "")
+                for field in FIELDS
+            )
+            for record in sorted(records, key=lambda r: (len(r["name"]), r["name"]))
+        ]
+        ingredients_index = _FIELD_INDEX["ingredients"]
+        self._index_records(
+            (record[0], *self._record_keys(record[0], record[ingredients_index])) for record in self._records
+        )
+        self._build_matchers()
+
+    def _load_compiled(self, compiled: CompiledFile):
+        """컴파일된 파일에서 레코드와 인덱스를 엽니다 (정규화/정렬/삭제 사전 계산 없음)"""
+        string = compiled.string
+        names = compiled.strings("col.name")
+        normalized, aliases = compiled.strings("key.normalized"), compiled.strings("key.alias")
+        ptr = compiled.section("list.ingredients.ptr")
+        ingredients = compiled.strings("list.ingredients.ids")
+        ingredient_keys = compiled.section("list.ingredients.key")
+        active_keys = compiled.section("list.ingredients.active")
+
+        def keys(record_id: int):
+            entries = range(ptr[record_id], ptr[record_id + 1])
+            return names[record_id], normalized[record_id], aliases[record_id], [
+                (ingredients[entry], string(ingredient_keys[entry]), string(active_keys[entry])) for entry in entries
+            ]
+
+        self._compiled = compiled
+        self._records = MappedRecords(compiled, FIELDS, _LIST_FIELDS)
+        self._index_records(keys(record_id) for record_id in range(len(names)))
+        self._build_matchers(
+            fuzzy_jamo=compiled.strings("fuzzy.jamo"),
+            fuzzy_deletes=MappedPostings(compiled, "fuzzy.deletes")
+        )
+        if len(self._fuzzy) != compiled.header["fuzzy_terms"]:
+            raise ValueError("오타 교정 사전 단어 수가 컴파일된 파일과 다릅니다")
+
+    def _index_records(self, record_keys: Iterable[Tuple[str, str, str, List[Tuple[str, str, str]]]]):
+        """레코드 번호 순서의 (제품명, 정규화 이름, 별칭, 성분 키 목록)으로 조회 사전을 만듭니다"""
+        for record_id, (name, normalized, alias, ingredients) in enumerate(record_keys):
+            self._by_name[name] = record_id
+            if normalized:
+                self._by_normalized.setdefault(normalized, []).append(record_id)
+            if alias:
+                self._by_alias.setdefault(alias, []).append(record_id)
+
+            for ingredient, key, active in ingredients:
+                if key:
+                    self._by_ingredient.setdefault(key, []).append(record_id)
+                    self._ingredient_names.setdefault(key, ingredient)
+                if active:
+                    ids = self._by_active_ingredient.setdefault(active, [])
+                    if not ids or ids[-1] != record_id:
+                        ids.append(record_id)
+                    # 표시용 이름은 가장 짧은 원래 성분명 (예: 아세트아미노펜)
+                    known = self._active_ingredient_names.get(active)
+                    if known is None or len(ingredient) < len(known):
+                        self._active_ingredient_names[active] = ingredient
+
+    def _build_matchers(self, fuzzy_jamo: Optional[Sequence[str]] = None, fuzzy_deletes=None):
+        record_names = list(self._by_name)  # 레코드 번호 순서의 제품명
+
+        # 질문 속 약품명 탐지용 오토마톤 (제품명 별칭 + 정규화 이름)
+        names = [key for key in list(self._by_normalized) + list(self._by_alias) if len(key) >= MIN_MENTION_LENGTH]
+        self._mention_matcher = KeywordMatcher({"drug": names})
+
+        # 제품명·성분명 자동완성
+        self._suggester = DrugNameSuggester(
+            [(name, "product") for name in record_names]
+            + [(name, "ingredient") for name in self._ingredient_names.values()]
+        )
+
+        # 오타 교정 사전 (같은 거리면 별칭 → 제품명 → 성분명 순으로 우선)
+        fuzzy_terms = [
+            (alias, {"type": "alias", "product": record_names[ids[0]]})
+            for alias, ids in self._by_alias.items() if len(alias) >= MIN_MENTION_LENGTH
+        ] + [
+            (key, {"type": "product", "product": record_names[ids[0]]})
+            for key, ids in self._by_normalized.items() if len(key) >= MIN_MENTION_LENGTH
+        ] + [
+            (key, {"type": "ingredient", "product": None})
+            for key in self._ingredient_names if len(key) >= MIN_MENTION_LENGTH
+        ]
+        self._fuzzy = FuzzyNameResolver(
+            fuzzy_terms, max_distance=FUZZY_MAX_DISTANCE, jamo=fuzzy_jamo, deletes=fuzzy_deletes
+        )
+
+    def save_compiled(self, path: str, files: List[str], missing: List[str], skipped: int):
+        """현재 레코드와 인덱스를 컴파일된 바이너리로 저장합니다 (문자열은 중복 없이 한 번만)"""
+        pool = StringPool()
+        sections: Dict[str, Any] = {}
+        ingredients_index = _FIELD_INDEX["ingredients"]
+        for index, field in enumerate(FIELDS):
+            if field in _LIST_FIELDS:
+                ptr, ids = [0], []
+                for record in self._records:
+                    ids.extend(record[index])
+                    ptr.append(len(ids))
+                sections[f"list.{field}.ptr"] = array("I", ptr)
+                sections[f"list.{field}.ids"] = pool.column(ids)
+            else:
+                sections[f"col.{field}"] = pool.column(record[index] for record in self._records)
+
+        record_keys = [self._record_keys(record[0], record[ingredients_index]) for record in self._records]
+        sections["key.normalized"] = pool.column(normalized for normalized, _, _ in record_keys)
+        sections["key.alias"] = pool.column(alias for _, alias, _ in record_keys)
+        sections["list.ingredients.key"] = pool.column(key for _, _, items in record_keys for _, key, _ in items)
+        sections["list.ingredients.active"] = pool.column(
+            active for _, _, items in record_keys for _, _, active in items
+        )
+
+        sections["fuzzy.jamo"] = pool.column(self._fuzzy._jamo)
+        sections.update(hash_table_sections("fuzzy.deletes", pool, self._fuzzy.iter_deletes()))
+        sections.update(pool.sections())
+
+        write_compiled(path, sections, {
+            "sources": source_states(self.source_paths()),
+            "files": files,
+            "missing_files": missing,
+            "skipped_lines": skipped,
+            "records": len(self._records),
+            "strings": len(pool),
+            "fuzzy_terms": len(self._fuzzy),
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        })
+
+    def ensure_loaded(self) -> bool:
+        """적재가 끝났는지 반환합니다 (요청 처리용, 적재를 기다리거나 시작하지 않음)
+
+        CSV 파싱은 수 초가 걸리므로 이벤트 루프에서 하지 않고 워밍업(load)에 맡깁니다.
+        """
+        return self.loaded
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def to_dict(self, record_id: int) -> Dict[str, Any]:
+        """레코드를 응답용 딕셔너리로 변환합니다"""
+        record = self._records[record_id]
+        result = dict(zip(FIELDS, record))
+        result["ingredients"] = list(result["ingredients"])
+        result["sources"] = list(result["sources"])
+        return result
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """모든 레코드를 제품명 순으로 반환합니다 (검색 인덱스 생성용, 적재 전이면 적재를 기다림)"""
+        self.load()
+        for record_id in range(len(self._records)):
+            yield self.to_dict(record_id)
+
+    def source_paths(self) -> List[str]:
+        """데이터 파일 경로 목록 (파생 인덱스의 재생성 여부 판단용)"""
+        return [os.path.join(self.data_dir, name) for name in (MEDDB_FILE, EMEDDB_FILE, REDUCED_FILE)]
+
+    def lookup(self, name: str, limit: int = 20) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """제품명 또는 성분명으로 조회합니다
+
+        Returns:
+            (match_type, records): match_type은 exact, normalized, alias, ingredient 중 하나
+            (찾지 못했거나 아직 적재 전이면 None, [])
+        """
+        if not self.ensure_loaded():
+            return None, []
+        name = (name or "").strip()
+
+        if name in self._by_name:
+            return "exact", [self.to_dict(self._by_name[name])]
+
+        normalized = normalize_drug_name(name)
+        if normalized in self._by_normalized:
+            return "normalized", [self.to_dict(i) for i in self._by_normalized[normalized][:limit]]
+
+        alias = base_drug_name(name)
+        if alias in self._by_alias:
+            return "alias", [self.to_dict(i) for i in self._by_alias[alias][:limit]]
+
+        ingredient = normalize_ingredient(name)
+        if ingredient in self._by_ingredient:
+            return "ingredient", [self.to_dict(i) for i in self._by_ingredient[ingredient][:limit]]
+
+        return None, []
+
+    def get_by_ingredient(self, ingredient: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """해당 성분이 들어 있는 제품 목록을 반환합니다"""
+        if not self.ensure_loaded():
+            return []
+        ids = self._by_ingredient.get(normalize_ingredient(ingredient), [])
+        return [self.to_dict(i) for i in ids[:limit]]
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """제품명·성분명 자동완성 (접두어 또는 초성, 예: "ㅌㅇㄹㄴ" → 타이레놀...)"""
+        if not self.ensure_loaded() or self._suggester is None:
+            return []
+        return self._suggester.suggest(query, limit)
+
+    def _active_ingredients(self, record_id: int) -> set:
+        return {
+            key for key in (active_ingredient_key(i) for i in self._records[record_id][_FIELD_INDEX["ingredients"]])
+            if key
+        }
+
+    def resolve_medication(self, name: str) -> Optional[Dict[str, Any]]:
+        """사용자가 입력한 복용 약물 이름을 제품과 유효성분으로 해석합니다
+
+        별칭에 여러 제품이 묶여 있으면 (예: 타이레놀 → 타이레놀정500밀리그람, 타이레놀산500밀리그램)
+        모든 제품에 공통인 성분만 사용합니다. 해석할 수 없거나 아직 적재 전이면 None을 반환합니다.
+        """
+        name = (name or "").strip()
+        if not name or not self.ensure_loaded():
+            return None
+
+        ingredient = active_ingredient_key(name)
+        if name in self._by_name:
+            record_ids = [self._by_name[name]]
+        elif normalize_drug_name(name) in self._by_normalized:
+            record_ids = self._by_normalized[normalize_drug_name(name)]
+        elif base_drug_name(name) in self._by_alias:
+            record_ids = self._by_alias[base_drug_name(name)]
+        elif ingredient in self._by_active_ingredient:
+            # 성분명으로 입력한 경우
+            return {"input": name, "products": [], "ingredients": [ingredient]}
+        else:
+            mentions = self.find_mentions(name, limit=1)
+            if mentions:
+                record_ids = [self._by_name[mentions[0]["name"]]]
+            else:
+                # 오타가 있으면 가장 가까운 이름으로 다시 해석 (예: 타이래놀 → 타이레놀)
+                corrections = self.fuzzy_lookup(name, limit=1)
+                if not corrections or corrections[0]["distance"] == 0:
+                    return None
+                resolved = self.resolve_medication(corrections[0]["key"])
+                if resolved is not None:
+                    resolved["input"] = name
+                return resolved
+
+        ingredient_sets = [self._active_ingredients(record_id) for record_id in record_ids]
+        common = set.intersection(*ingredient_sets) or ingredient_sets[0]
+        return {
+            "input": name,
+            "products": [self._records[record_id][0] for record_id in record_ids],
+            "ingredients": sorted(common)
+        }
+
+    def find_duplicate_ingredients(self, medications: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """복용 약물 중 같은 유효성분이 들어 있는 약 조합을 찾습니다 (약 k개에 대해 O(k))
+
+        Returns:
+            [{"ingredient": 성분명, "medications": [입력한 약 이름], "products": [해석된 제품명]}]
+        """
+        if not medications or len(medications) < 2:
+            return []
+
+        by_ingredient: Dict[str, List[Dict[str, Any]]] = {}
+        seen_products, seen_inputs = set(), set()
+        for medication in medications:
+            resolved = self.resolve_medication(medication)
+            if resolved is None:
+                continue
+            # 같은 약을 두 번 입력한 경우(오타·표기 차이 포함)는 중복 복용으로 보지 않음.
+            # 해석된 제품이 이미 나온 제품과 겹치면 같은 약으로 보고, 성분명으로 입력한 경우는 입력 이름으로 비교
+            products = set(resolved["products"])
+            if products:
+                if products & seen_products:
+                    continue
+                seen_products.update(products)
+            else:
+                if normalize_drug_name(resolved["input"]) in seen_inputs:
+                    continue
+                seen_inputs.add(normalize_drug_name(resolved["input"]))
+            for ingredient in resolved["ingredients"]:
+                by_ingredient.setdefault(ingredient, []).append(resolved)
+
+        duplicates = []
+        for ingredient, resolved_list in by_ingredient.items():
+            if len(resolved_list) < 2:
+                continue
+            duplicates.append({
+                "ingredient": self._active_ingredient_names.get(ingredient, ingredient),
+                "medications": [resolved["input"] for resolved in resolved_list],
+                "products": [resolved["products"][0] if resolved["products"] else resolved["input"]
+                             for resolved in resolved_list]
+            })
+        return duplicates
+
+    def fuzzy_lookup(self, name: str, limit: int = 5, max_distance: Optional[int] = None) -> List[Dict[str, Any]]:
+        """오타가 섞인 약 이름과 가까운 별칭/제품명/성분명을 찾습니다 (자모 편집 거리 순)
+
+        Returns:
+            [{"key": 정규화된 이름, "distance": 자모 편집 거리, "type": alias|product|ingredient,
+              "product": 대표 제품명}]
+        """
+        key = normalize_drug_name(name)
+        if not self.ensure_loaded() or self._fuzzy is None or not key:
+            return []
+        return self._fuzzy.lookup(key, max_distance=max_distance, limit=limit)
+
+    def _correct_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """단어 하나의 교정 결과 (교정할 필요가 없거나 확실하지 않으면 None)"""
+        key = normalize_drug_name(token)
+        if (len(key) < MIN_MENTION_LENGTH or key in self._by_normalized or key in self._by_alias
+                or key in self._by_ingredient):
+            return None
+        jamo_length = len(to_jamo(key))
+        if jamo_length < FUZZY_MIN_JAMO:
+            return None
+        max_distance = 1 if jamo_length < FUZZY_SHORT_JAMO else FUZZY_MAX_DISTANCE
+
+        candidates = self._fuzzy.lookup(key, max_distance=max_distance, limit=2)
+        if not candidates:
+            return None
+        # 같은 거리의 후보가 둘이면 어느 쪽인지 알 수 없으므로 교정하지 않음
+        if len(candidates) > 1 and candidates[1]["distance"] == candidates[0]["distance"] \
+                and candidates[1]["product"] != candidates[0]["product"]:
+            return None
+        return candidates[0]
+
+    def correct_drug_names(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """음성 인식/OCR 텍스트의 약 이름 오타를 사전 이름으로 바꿉니다
+
+        단어 끝의 조사는 떼고 비교한 뒤 그대로 붙입니다 (예: 타이레롤을 → 타이레놀을).
+
+        Returns:
+            (교정된 텍스트, [{"original", "corrected", "distance", "product"}])
+        """
+        if not text or not self.ensure_loaded() or self._fuzzy is None:
+            return text, []
+
+        pieces, corrections, last = [], [], 0
+        for match in _TOKEN_RE.finditer(text):
+            token = match.group()
+            candidates = [(token, "")] + [
+                (token[:-len(particle)], particle) for particle in _PARTICLES
+                if token.endswith(particle) and len(token) > len(particle)
+            ]
+            for stem, particle in candidates:
+                correction = self._correct_token(stem)
+                if correction is not None:
+                    pieces.append(text[last:match.start()])
+                    pieces.append(correction["key"] + particle)
+                    last = match.end()
+                    corrections.append({
+                        "original": stem,
+                        "corrected": correction["key"],
+                        "distance": correction["distance"],
+                        "product": correction["product"]
+                    })
+                    break
+                # 조사를 떼기 전 단어가 이미 사전에 있으면 더 볼 필요 없음
+                if normalize_drug_name(stem) in self._by_alias or normalize_drug_name(stem) in self._by_normalized:
+                    break
+        pieces.append(text[last:])
+        return "".join(pieces), corrections
+
+    def find_mentions(self, text: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """자유 텍스트(질문)에 언급된 제품을 찾습니다
+
+        긴 이름부터 선택하고, 이미 선택된 이름에 포함된 짧은 별칭은 건너뜁니다
+        (예: "타이레놀정500밀리그람"이 있으면 "타이레놀"은 따로 선택하지 않음).
+        별칭 하나에 제품이 여러 개면 가장 짧은(대표) 제품명 하나만 사용합니다.
+        """
+        if not text or not self.ensure_loaded() or self._mention_matcher is None:
+            return []
+
+        found = self._mention_matcher.find_keywords(normalize_drug_name(text))
+        selected_keys: List[str] = []
+        record_ids: List[int] = []
+        for key in sorted(found, key=len, reverse=True):
+            if any(key in selected for selected in selected_keys):
+                continue
+            ids = self._by_normalized.get(key) or self._by_alias.get(key) or []
+            if ids and ids[0] not in record_ids:
+                selected_keys.append(key)
+                record_ids.append(ids[0])
+            if len(record_ids) >= limit:
+                break
+        return [self.to_dict(i) for i in record_ids]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적재 통계를 반환합니다"""
+        return {"loaded": self.loaded, **self.load_stats}
+
+
+# 싱글톤 인스턴스
+drug_kb = DrugKnowledgeBase()
@@ -0,0 +1,101 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Tuple
+
+# 한글 초성 (유니코드 음절 순서)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = frozenset(CHOSUNG)
+_HANGUL_BASE, _HANGUL_COUNT, _CHOSUNG_STEP = 0xAC00, 11172, 588
+
+_PAREN_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_KEY_RE = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎ]")
+
+# 정렬된 키 배열에서 접두어 범위 끝을 찾기 위한 문자 (모든 키 문자보다 큼)
+_MAX_CHAR = "\U0010ffff"
+
+
+def _normalize_key(text: str) -> str:
+    """검색 키 정규화 (괄호 내용, 공백/기호 제거, 소문자)
+
+    NFKC는 호환용 자모(ㄱ)를 첫가끝 자모로 바꾸므로 자모는 그대로 둡니다.
+    """
+    text = "".join(ch if ch in _CHOSUNG_SET else unicodedata.normalize("NFKC", ch) for ch in text or "")
+    return _NON_KEY_RE.sub("", _PAREN_RE.sub("", text.lower()))
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 바꿉니다 (예: 타이레놀 → ㅌㅇㄹㄴ, 한글이 아닌 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        result.append(CHOSUNG[code // _CHOSUNG_STEP] if 0 <= code < _HANGUL_COUNT else ch)
+    return "".join(result)
+
+
+class DrugNameSuggester:
+    """제품명·성분명 자동완성 (정렬된 키 배열 + 이분 탐색)
+
+    - 이름마다 정규화 키와 초성 키를 만들어 각각 정렬된 배열로 보관합니다
+      (트라이보다 메모리가 작고, 접두어 범위는 bisect 두 번으로 찾음)
+    - 이름 번호를 (키 길이, 이름) 순으로 매겨 두었으므로 범위 안에서 번호가 작은 것이
+      짧은(대표) 이름입니다
+    - 초성이 섞인 질의(예: "타ㅇㄹ")는 초성 배열에서 찾은 뒤 완성된 글자를 비교합니다
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, str]]):
+        """names: (이름, 종류) 목록. 종류는 product 또는 ingredient"""
+        # 이름마다 정규화는 한 번만 (글자별 NFKC라 적재 시간의 대부분을 차지)
+        keyed: Dict[Tuple[str, str], str] = {}
+        for entry in names:
+            if entry not in keyed:
+                keyed[entry] = _normalize_key(entry[0])
+        entries = sorted(
+            (entry for entry, key in keyed.items() if key),
+            key=lambda entry: (len(keyed[entry]), entry[0], entry[1])
+        )
+        self._names: List[str] = [name for name, _ in entries]
+        self._kinds: List[str] = [kind for _, kind in entries]
+        self._name_keys: List[str] = [keyed[entry] for entry in entries]
+
+        by_key = sorted((key, entry_id) for entry_id, key in enumerate(self._name_keys))
+        self._keys = [key for key, _ in by_key]
+        self._key_ids = [entry_id for _, entry_id in by_key]
+
+        by_chosung = sorted((to_chosung(key), entry_id) for entry_id, key in enumerate(self._name_keys))
+        self._chosung_keys = [key for key, _ in by_chosung]
+        self._chosung_ids = [entry_id for _, entry_id in by_chosung]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + _MAX_CHAR)
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """접두어가 일치하는 이름을 짧은 순으로 최대 limit개 반환합니다"""
+        key = _normalize_key(query)
+        if not key:
+            return []
+
+        if any(ch in _CHOSUNG_SET for ch in key):
+            # 초성 검색: 완성된 글자가 있는 위치는 원래 글자까지 같아야 함
+            lo, hi = self._prefix_range(self._chosung_keys, to_chosung(key))
+            fixed = [(index, ch) for index, ch in enumerate(key) if ch not in _CHOSUNG_SET]
+            candidates = self._chosung_ids[lo:hi]
+            if fixed:
+                name_keys = self._name_keys
+                candidates = [
+                    entry_id for entry_id in candidates
+                    if all(name_keys[entry_id][index] == ch for index, ch in fixed)
+                ]
+        else:
+            lo, hi = self._prefix_range(self._keys, key)
+            candidates = self._key_ids[lo:hi]
+
+        return [
+            {"name": self._names[entry_id], "type": self._kinds[entry_id]}
+            for entry_id in heapq.nsmallest(limit, candidates)
+        ]
@@ -1,15 +1,19 @@
 import os
 import json
+import asyncio
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import pytz
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 from .text_to_cal_json import text_to_cal_converter
 from core.config import settings
+from core.metrics import track_upstream
 from utils.googleToken.user_token_manager import token_manager
 
 # 개발 환경에서 HTTPS 요구사항 우회 (프로덕션에서는 제거 필요)
@@ -25,6 +29,10 @@ class GoogleCalendarAgent:
         self.korea_tz = pytz.timezone('Asia/Seoul')
         # 사용자별 서비스 인스턴스 캐시
         self._user_services = {}
+        # 서비스의 httplib2 연결은 스레드 간 공유할 수 없으므로 사용자별로 호출을 직렬화
+        self._user_locks: Dict[str, threading.RLock] = {}
+        # 파싱된 Calendar API discovery 문서 (warm_up에서 로드)
+        self._discovery_document = None
         
         # .env에서 Google OAuth 설정 가져오기
         self.client_config = {
@@ -39,6 +47,27 @@ class GoogleCalendarAgent:
             }
         }
     
+    def warm_up(self) -> Dict:
+        """Calendar API discovery 문서를 미리 읽어 서비스 생성 비용을 줄입니다 (앱 시작 시 호출)"""
+        document = get_static_doc('calendar', 'v3')
+        if document is None:
+            raise RuntimeError("Calendar API discovery 문서를 찾을 수 없습니다.")
+        self._discovery_document = json.loads(document)
+        return {"resources": len(self._discovery_document.get("resources", {}))}
+
+    def _build_service(self, credentials):
+        """캐시된 discovery 문서가 있으면 재사용해 Calendar 서비스를 생성합니다"""
+        # 부하 테스트 등에서 API 엔드포인트를 재지정할 수 있도록 함
+        client_options = None
+        if settings.GOOGLE_CALENDAR_API_ENDPOINT:
+            client_options = {"api_endpoint": settings.GOOGLE_CALENDAR_API_ENDPOINT}
+
+        if self._discovery_document is not None:
+            return build_from_document(
+                self._discovery_document, credentials=credentials, client_options=client_options
+            )
+        return build('calendar', 'v3', credentials=credentials, client_options=client_options)
+
     def get_user_service(self, user_id: str):
         """사용자별 Google Calendar 서비스를 반환합니다"""
         
@@ -70,7 +99,7 @@ class GoogleCalendarAgent:
         
         # Google Calendar 서비스 생성
         try:
-            service = build('calendar', 'v3', credentials=credentials)
+            service = self._build_service(credentials)
             self._user_services[user_id] = service
             print(f"사용자 {user_id}의 Google Calendar 서비스 연결 성공")
             return service
@@ -78,6 +107,15 @@ class GoogleCalendarAgent:
             print(f"Calendar 서비스 빌드 실패 ({user_id}): {e}")
             return None
     
+    def _user_lock(self, user_id: str) -> threading.RLock:
+        """사용자별 Calendar 서비스 호출 잠금을 반환합니다"""
+        return self._user_locks.setdefault(user_id, threading.RLock())
+
+    def _add_medication_schedule_locked(self, user_id: str, events: List[Dict]) -> Dict:
+        """같은 사용자의 일정 추가 요청이 동시에 들어와도 서비스 객체를 순서대로 사용합니다"""
+        with self._user_lock(user_id):
+            return self.add_medication_schedule(user_id, events)
+
     def is_user_authenticated(self, user_id: str) -> bool:
         """사용자가 인증되어 있는지 확인합니다"""
         return token_manager.is_user_authenticated(user_id)
@@ -90,14 +128,15 @@ class GoogleCalendarAgent:
         
         try:
             # 복약 이벤트 전체 조회
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_date.isoformat(),
-                timeMax=end_date.isoformat(),
-                q='💊',  # 복약 이모지로 필터링
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            with track_upstream("google_calendar", "events.list"):
+                events_result = service.events().list(
+                    calendarId='primary',
+                    timeMin=start_date.isoformat(),
+                    timeMax=end_date.isoformat(),
+                    q='💊',  # 복약 이모지로 필터링
+                    singleEvents=True,
+                    orderBy='startTime'
+                ).execute()
             
             events = events_result.get('items', [])
             
@@ -147,10 +186,11 @@ class GoogleCalendarAgent:
                     continue
                 
                 # 이벤트 생성
-                created_event = service.events().insert(
-                    calendarId='primary',
-                    body=event
-                ).execute()
+                with track_upstream("google_calendar", "events.insert"):
+                    created_event = service.events().insert(
+                        calendarId='primary',
+                        body=event
+                    ).execute()
                 
                 results['events_added'] += 1
                 results['created_events'].append({
@@ -180,12 +220,12 @@ class GoogleCalendarAgent:
         
         return results
     
-    def process_medication_request(self, user_id: str, medication_text: str, start_date: datetime = None) -> Dict:
+    async def process_medication_request(self, user_id: str, medication_text: str, start_date: datetime = None) -> Dict:
         """복약 텍스트를 받아서 전체 파이프라인을 실행합니다"""
         
         try:
             # 1단계: 텍스트를 캘린더 이벤트로 변환
-            events = text_to_cal_converter.process_medication_text(medication_text, start_date)
+            events = await text_to_cal_converter.process_medication_text(medication_text, start_date)
             
             if not events:
                 return {
@@ -194,8 +234,8 @@ class GoogleCalendarAgent:
                     'events_added': 0
                 }
             
-            # 2단계: Google Calendar에 추가
-            results = self.add_medication_schedule(user_id, events)
+            # 2단계: Google Calendar에 추가 (googleapiclient는 동기 라이브러리)
+            results = await asyncio.to_thread(self._add_medication_schedule_locked, user_id, events)
             
             # 결과에 처리된 이벤트 정보 추가
             results['processed_events'] = len(events)
@@ -221,14 +261,15 @@ class GoogleCalendarAgent:
             now = datetime.now(self.korea_tz)
             time_max = now + timedelta(days=days)
             
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now.isoformat(),
-                timeMax=time_max.isoformat(),
-                q='💊',  # 복약 이벤트 이모지로 필터링
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            with self._user_lock(user_id), track_upstream("google_calendar", "events.list"):
+                events_result = service.events().list(
+                    calendarId='primary',
+                    timeMin=now.isoformat(),
+                    timeMax=time_max.isoformat(),
+                    q='💊',  # 복약 이벤트 이모지로 필터링
+                    singleEvents=True,
+                    orderBy='startTime'
+                ).execute()
             
             events = events_result.get('items', [])
             
@@ -1,9 +1,9 @@
 import json
 from datetime import datetime, timedelta
-from ibm_watson_machine_learning.foundation_models import Model
 from ibm_watson_machine_learning.metanames import GenTextParamsMetaNames as GenParams
-from core.config import settings
-from typing import Optional, List, Dict
+from utils.watsonx import watsonx_client
+from typing import List, Dict
+from fastapi import HTTPException
 import pytz
 
 
@@ -11,24 +11,9 @@ class TextToCalendarConverter:
     """자연어 복약 지시사항을 Google Calendar 이벤트로 변환하는 클래스"""
     
     def __init__(self):
-        self._model: Optional[Model] = None
         self.korea_tz = pytz.timezone('Asia/Seoul')
     
-    def get_model(self) -> Model:
-        """IBM Watson 모델 인스턴스를 반환합니다"""
-        if self._model is None:
-            creds = {
-                "url": settings.WATSONX_API_URL,
-                "apikey": settings.WATSONX_API_KEY
-            }
-            self._model = Model(
-                model_id='ibm/granite-3-3-8b-instruct',
-                credentials=creds,
-                project_id=settings.WATSONX_PROJECT_ID
-            )
-        return self._model
-    
-    def extract_medication_info(self, medication_text: str) -> Dict:
+    async def extract_medication_info(self, medication_text: str) -> Dict:
         """AI를 사용해 복약 정보를 추출합니다"""
         
         prompt = f"""
@@ -54,8 +39,7 @@ class TextToCalendarConverter:
 """
         
         try:
-            model = self.get_model()
-            response = model.generate(
+            response = await watsonx_client.generate(
                 prompt=prompt,
                 params={
                     GenParams.MAX_NEW_TOKENS: 200,
@@ -80,6 +64,9 @@ class TextToCalendarConverter:
             else:
                 raise ValueError("JSON 형태를 찾을 수 없습니다.")
                 
+        except HTTPException:
+            # 대기열 초과(503) 등은 그대로 전달
+            raise
         except Exception as e:
             print(f"❌ AI 파싱 실패: {e}")
             # 기본값 반환
@@ -172,12 +159,12 @@ class TextToCalendarConverter:
         
         return events
     
-    def process_medication_text(self, medication_text: str, start_date: datetime = None) -> List[Dict]:
+    async def process_medication_text(self, medication_text: str, start_date: datetime = None) -> List[Dict]:
         """전체 파이프라인: 텍스트 → 정보 추출 → 캘린더 이벤트 변환"""
         
         try:
             # 1단계: AI로 정보 추출
-            medication_info = self.extract_medication_info(medication_text)
+            medication_info = await self.extract_medication_info(medication_text)
             
             # 2단계: 캘린더 이벤트로 변환
             events = self.convert_to_calendar_events(medication_info, start_date)
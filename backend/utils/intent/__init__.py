@@ -0,0 +1,9 @@
+"""
+의도 분류 모듈
+
+채팅/음성/OCR 텍스트의 키워드를 한 번에 찾는 Aho-Corasick 매처를 제공합니다.
+"""
+
+from .keyword_matcher import KeywordMatcher
+
+__all__ = ["KeywordMatcher"]
@@ -0,0 +1,147 @@
+from collections import Counter, deque
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    print("Warning: pyahocorasick not available. 키워드 매처가 순수 파이썬 오토마톤을 사용합니다.")
+
+
+class _PyAutomaton:
+    """pyahocorasick이 없을 때 사용하는 순수 파이썬 Aho-Corasick 오토마톤"""
+
+    def __init__(self, words: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        # 1. 트라이 구성
+        for word in words:
+            node = 0
+            for char in word:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    next_node = len(self._goto) - 1
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node].append(word)
+
+        # 2. BFS로 실패 링크와 출력 집합 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(끝 위치, 키워드) 형태로 모든 (겹치는 것 포함) 매치를 반환합니다"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word in output[node]:
+                yield index, word
+
+
+class KeywordMatcher:
+    """여러 카테고리의 키워드를 한 번의 스캔으로 찾는 Aho-Corasick 매처
+
+    오토마톤은 생성 시 한 번만 만들고, match()는 입력 길이에 비례하는 시간으로
+    매칭된 모든 카테고리와 점수를 반환합니다.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]], case_insensitive: bool = True):
+        self.case_insensitive = case_insensitive
+        self.categories = {
+            category: list(dict.fromkeys(self._normalize(kw) for kw in keywords))
+            for category, keywords in categories.items()
+        }
+
+        # 키워드 → 카테고리 목록 (여러 카테고리에 같은 키워드가 있을 수 있음)
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                self._keyword_categories.setdefault(keyword, []).append(category)
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._keyword_categories:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = _PyAutomaton(list(self._keyword_categories))
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self.case_insensitive else text
+
+    def match(self, text: str) -> Dict[str, Dict]:
+        """
+        텍스트에서 매칭된 카테고리를 반환합니다.
+
+        Returns:
+            Dict[str, Dict]: {카테고리: {"keywords": 찾은 키워드(정의 순서), "hits": 총 등장 횟수,
+                             "score": 찾은 키워드 비율(0~1)}}
+        """
+        if not text or not self._keyword_categories:
+            return {}
+
+        hits = Counter(keyword for _, keyword in self._automaton.iter(self._normalize(text)))
+
+        result = {}
+        for category, keywords in self.categories.items():
+            found = [kw for kw in keywords if kw in hits]
+            if found:
+                result[category] = {
+                    "keywords": found,
+                    "hits": sum(hits[kw] for kw in found),
+                    "score": round(len(found) / len(keywords), 4)
+                }
+        return result
+
+    def find_keywords(self, text: str) -> List[str]:
+        """텍스트에 등장한 키워드를 처음 등장한 순서대로 (중복 없이) 반환합니다
+
+        키워드 수가 많은 사전(예: 약품명)에서 카테고리별 집계 없이 매칭 결과만 필요할 때 사용합니다.
+        """
+        if not text or not self._keyword_categories:
+            return []
+        return list(dict.fromkeys(keyword for _, keyword in self._automaton.iter(self._normalize(text))))
+
+    def find_longest(self, text: str) -> List[Tuple[int, str]]:
+        """겹치지 않는 매치를 leftmost-longest 규칙으로 골라 (시작 위치, 키워드) 목록을 반환합니다
+
+        왼쪽에서 먼저 시작하는 매치를 우선하고, 같은 위치에서 시작하면 긴 키워드를 고른 뒤
+        이미 고른 매치와 겹치는 매치는 건너뜁니다 (예: "정신장애" 속의 "신장애"는 선택하지 않음).
+        """
+        if not text or not self._keyword_categories:
+            return []
+        spans = sorted(
+            ((end - len(keyword) + 1, keyword) for end, keyword in self._automaton.iter(self._normalize(text))),
+            key=lambda span: (span[0], -len(span[1]))
+        )
+        result, covered = [], 0
+        for start, keyword in spans:
+            if start >= covered:
+                result.append((start, keyword))
+                covered = start + len(keyword)
+        return result
+
+    def categories_of(self, keyword: str) -> List[str]:
+        """키워드가 속한 카테고리 목록"""
+        return self._keyword_categories.get(self._normalize(keyword), [])
+
+    def matches_any(self, text: str, category: str) -> bool:
+        """텍스트에 해당 카테고리 키워드가 하나라도 있는지 확인합니다"""
+        return category in self.match(text)
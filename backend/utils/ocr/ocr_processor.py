@@ -5,9 +5,25 @@ from PIL import Image
 import PyPDF2
 from pathlib import Path
 from typing import Union, Dict, Any
+from utils.intent import KeywordMatcher
+from core.config import settings
+from core.metrics import track_upstream
+from utils.drug_kb import drug_kb
 
 class OCRProcessor:
     """의료 문서 OCR 처리를 위한 클래스"""
+
+    # 의료 문서 키워드 (카테고리별)
+    MEDICAL_KEYWORD_MATCHER = KeywordMatcher({
+        "진단서": ["진단서", "의료진단서", "diagnosis"],
+        "처방전": ["처방전", "prescription", "처방"],
+        "검사결과": ["검사결과", "test result", "혈액검사", "소변검사", "엑스레이"],
+        "병원": ["병원", "의원", "클리닉", "hospital", "clinic"],
+        "의사": ["의사", "doctor", "주치의"],
+        "환자": ["환자", "patient", "성명", "이름"],
+        "증상": ["증상", "symptom", "통증", "아픔"],
+        "약물": ["약물", "medicine", "medication", "약", "투약"]
+    })
     
     def __init__(self):
         self._setup_tesseract()
@@ -21,6 +37,13 @@ class OCRProcessor:
             if os.path.exists(tesseract_path):
                 pytesseract.pytesseract.tesseract_cmd = tesseract_path
         
+    def warm_up(self) -> Dict[str, Any]:
+        """Tesseract 실행 파일과 언어 데이터를 미리 불러옵니다 (앱 시작 시 호출)"""
+        version = str(pytesseract.get_tesseract_version())
+        # 작은 빈 이미지로 한 번 실행해 kor+eng 언어 데이터를 디스크 캐시에 올림
+        pytesseract.image_to_string(Image.new('L', (32, 32), color=255), lang='kor+eng')
+        return {"tesseract_version": version}
+        
     def extract_text(self, file_path: Union[str, Path]) -> Dict[str, Any]:
         """
         파일에서 텍스트 추출 (이미지 + PDF 지원)
@@ -65,22 +88,29 @@ class OCRProcessor:
         try:
             image = Image.open(image_path)
             
-            # 한국어 + 영어로 OCR
-            text_kor_eng = pytesseract.image_to_string(image, lang='kor+eng')
-            
-            # 한국어만
-            text_kor = pytesseract.image_to_string(image, lang='kor')
-            
-            # 영어만
-            text_eng = pytesseract.image_to_string(image, lang='eng')
+            with track_upstream("tesseract", "image_to_string"):
+                # 한국어 + 영어로 OCR
+                text_kor_eng = pytesseract.image_to_string(image, lang='kor+eng')
+                
+                # 한국어만
+                text_kor = pytesseract.image_to_string(image, lang='kor')
+                
+                # 영어만
+                text_eng = pytesseract.image_to_string(image, lang='eng')
             
             # 텍스트 정리
             cleaned_text = self._clean_text(text_kor_eng)
             
+            # OCR이 잘못 읽은 약 이름을 사전 이름으로 교정 (원문은 text_variants에 남음)
+            drug_name_corrections = []
+            if settings.DRUG_KB_ENABLED:
+                cleaned_text, drug_name_corrections = drug_kb.correct_drug_names(cleaned_text)
+            
             return {
                 "success": True,
                 "error": None,
                 "text": cleaned_text,
+                "drug_name_corrections": drug_name_corrections,
                 "text_variants": {
                     "korean_english": text_kor_eng,
                     "korean_only": text_kor,
@@ -177,24 +207,12 @@ class OCRProcessor:
         
         text = result["text"]
         
-        # 의료 문서 키워드 검색
-        medical_keywords = {
-            "진단서": ["진단서", "의료진단서", "diagnosis"],
-            "처방전": ["처방전", "prescription", "처방"],
-            "검사결과": ["검사결과", "test result", "혈액검사", "소변검사", "엑스레이"],
-            "병원": ["병원", "의원", "클리닉", "hospital", "clinic"],
-            "의사": ["의사", "doctor", "주치의"],
-            "환자": ["환자", "patient", "성명", "이름"],
-            "증상": ["증상", "symptom", "통증", "아픔"],
-            "약물": ["약물", "medicine", "medication", "약", "투약"]
+        # 의료 문서 키워드 검색 (전체 카테고리를 한 번의 스캔으로 확인)
+        matches = self.MEDICAL_KEYWORD_MATCHER.match(text)
+        detected_keywords = {
+            category: match["keywords"] for category, match in matches.items()
         }
         
-        detected_keywords = {}
-        for category, keywords in medical_keywords.items():
-            found_keywords = [kw for kw in keywords if kw.lower() in text.lower()]
-            if found_keywords:
-                detected_keywords[category] = found_keywords
-        
         # 결과에 의료 문서 분석 정보 추가
         result["medical_analysis"] = {
             "detected_keywords": detected_keywords,
@@ -223,7 +241,7 @@ class OCRProcessor:
             return 0.0
         
         total_categories = len(detected_keywords)
-        max_categories = 8  # 전체 의료 키워드 카테고리 수
+        max_categories = len(self.MEDICAL_KEYWORD_MATCHER.categories)  # 전체 의료 키워드 카테고리 수
         
         return min(total_categories / max_categories, 1.0)
 
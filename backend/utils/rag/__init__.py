@@ -0,0 +1,11 @@
+"""
+답변 근거 검색(RAG) 모듈
+
+의약품 설명 문단을 문자 n-gram TF-IDF로 색인하고, 질문과 관련된 문단을 찾아
+ExplainAI/WarnAI 프롬프트에 넣습니다.
+"""
+
+from .tfidf_index import CharNgramTfidfIndex, normalize_for_ngrams
+from .retriever import PassageRetriever, passage_retriever
+
+__all__ = ["CharNgramTfidfIndex", "normalize_for_ngrams", "PassageRetriever", "passage_retriever"]
@@ -0,0 +1,186 @@
+import csv
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from utils.drug_kb import drug_kb, normalize_drug_name
+from .tfidf_index import INDEX_VERSION, NUMPY_AVAILABLE, CharNgramTfidfIndex, normalize_for_ngrams
+
+# 문단으로 나눌 레코드 필드와 표시 이름 (보관법은 질문과 관련이 적어 제외)
+PASSAGE_FIELDS = (
+    ("efficacy", "효능"),
+    ("usage", "사용법"),
+    ("precautions", "주의사항"),
+    ("interactions", "상호작용"),
+    ("adverse_reactions", "이상반응(부작용)"),
+)
+_FIELD_LABELS = dict(PASSAGE_FIELDS)
+
+# e약은요 대화용 자료: 제품명, 업체명, 주성분, 효능, 사용법 (탭 구분)
+_EXTRA_CORPUS_COLUMNS = ("name", "company", "ingredients", "efficacy", "usage")
+
+
+def _clean_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").replace("|", ", ").replace("\xa0", " ")).strip()
+
+
+def _file_fingerprint(path: str) -> Optional[List[Any]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.abspath(path), stat.st_size, int(stat.st_mtime)]
+
+
+class PassageRetriever:
+    """의약품 설명 문단 검색기 (ExplainAI/WarnAI 프롬프트 근거 자료)
+
+    - 지식 베이스 레코드의 효능/사용법/주의사항/상호작용/이상반응 필드와
+      e약은요 대화용 자료를 "제품명 + 항목" 단위 문단으로 나눠 색인합니다
+    - 인덱스는 RAG_INDEX_DIR에 저장해 두고 다음 시작 때 mmap으로 엽니다
+      (원본 파일 크기/수정 시각이 바뀌면 다시 만듦)
+    - numpy가 없거나 비활성화되어 있거나 인덱스가 아직 준비되지 않았으면 빈 결과를 반환합니다
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, extra_corpus_path: Optional[str] = None):
+        self.index_dir = index_dir if index_dir is not None else settings.RAG_INDEX_DIR
+        self.extra_corpus_path = extra_corpus_path if extra_corpus_path is not None else settings.RAG_EXTRA_CORPUS_PATH
+        self.index: Optional[CharNgramTfidfIndex] = None
+        self._lock = threading.Lock()
+        self.load_stats: Dict[str, Any] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self.index is not None
+
+    # ------------------------------------------------------------------
+    # 인덱스 생성 / 적재
+    # ------------------------------------------------------------------
+    def _source_fingerprint(self) -> List[Any]:
+        paths = drug_kb.source_paths() + ([self.extra_corpus_path] if self.extra_corpus_path else [])
+        return [_file_fingerprint(path) for path in paths]
+
+    def _read_extra_corpus(self) -> List[Dict[str, str]]:
+        if not self.extra_corpus_path or not os.path.exists(self.extra_corpus_path):
+            return []
+        rows = []
+        with open(self.extra_corpus_path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+            next(reader, None)  # 헤더
+            for row in reader:
+                if len(row) < len(_EXTRA_CORPUS_COLUMNS) or not row[0].strip():
+                    continue
+                rows.append({column: _clean_text(value) for column, value in zip(_EXTRA_CORPUS_COLUMNS, row)})
+        return rows
+
+    def build_passages(self) -> List[Tuple[str, str]]:
+        """(제목, 본문) 문단 목록을 만듭니다 (같은 제품의 같은 내용은 한 번만)"""
+        passages: List[Tuple[str, str]] = []
+        seen = set()
+
+        def add(name: str, field: str, text: str):
+            key = (normalize_drug_name(name), normalize_for_ngrams(text))
+            if not text or not key[1] or key in seen:
+                return
+            seen.add(key)
+            passages.append((f"{name} - {_FIELD_LABELS[field]}", text))
+
+        for record in drug_kb.iter_records():
+            for field, _ in PASSAGE_FIELDS:
+                add(record["name"], field, record.get(field, ""))
+        for row in self._read_extra_corpus():
+            for field in ("efficacy", "usage"):
+                add(row["name"], field, row[field])
+        return passages
+
+    def load(self) -> Dict[str, Any]:
+        """저장된 인덱스를 열거나, 없거나 오래되었으면 새로 만듭니다"""
+        with self._lock:
+            if self.index is not None:
+                return self.load_stats
+            if not NUMPY_AVAILABLE:
+                self.load_stats = {"error": "numpy not available"}
+                return self.load_stats
+
+            start = time.perf_counter()
+            fingerprint = self._source_fingerprint()
+            meta = CharNgramTfidfIndex.read_meta(self.index_dir)
+            rebuilt = not (meta and meta.get("version") == INDEX_VERSION and meta.get("sources") == fingerprint)
+
+            if rebuilt:
+                index = CharNgramTfidfIndex.build(self.build_passages(), meta={"sources": fingerprint})
+                try:
+                    index.save(self.index_dir)
+                    index = CharNgramTfidfIndex.load(self.index_dir)
+                except OSError as e:
+                    # 저장에 실패해도 메모리 인덱스로 계속 동작
+                    print(f"⚠️ 검색 인덱스 저장 실패: {e}")
+            else:
+                index = CharNgramTfidfIndex.load(self.index_dir)
+            self.index = index
+
+            self.load_stats = {
+                "index_dir": self.index_dir,
+                "rebuilt": rebuilt,
+                "passages": index.n_docs,
+                "nnz": index.meta.get("nnz"),
+                "build_ms": index.meta.get("build_ms"),
+                "load_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+            action = "생성" if rebuilt else "적재"
+            print(f"📚 검색 인덱스 {action}: 문단 {index.n_docs}개 ({self.load_stats['load_ms']}ms)")
+            return self.load_stats
+
+    def ensure_loaded(self) -> bool:
+        """인덱스가 준비되었는지 반환합니다 (요청 처리용, 인덱스 생성은 워밍업(load)에서만 함)"""
+        return self.index is not None
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def search_batch(self, queries: List[str], top_k: Optional[int] = None,
+                     min_score: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """여러 질의를 한 번에 검색합니다 (결과: 질의별 [{title, text, score, doc_id}])"""
+        # 인덱스가 아직 준비되지 않았으면 근거 자료 없이 답변하도록 빈 결과를 반환
+        if not settings.RAG_ENABLED or not queries or not self.ensure_loaded():
+            return [[] for _ in queries]
+        return self.index.search_batch(
+            queries,
+            top_k=top_k if top_k is not None else settings.RAG_TOP_K,
+            min_score=min_score if min_score is not None else settings.RAG_MIN_SCORE
+        )
+
+    def search(self, query: str, top_k: Optional[int] = None, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        return self.search_batch([query], top_k, min_score)[0]
+
+    def build_reference(self, query: str, exclude_names: Optional[List[str]] = None,
+                        max_chars: Optional[int] = None) -> str:
+        """프롬프트에 넣을 관련 문단 목록 (지식 베이스 참고 자료에 이미 있는 제품은 제외)
+
+        Returns:
+            str: "- 제목: 본문" 줄 목록 (관련 문단이 없으면 빈 문자열)
+        """
+        if not query:
+            return ""
+        max_chars = max_chars if max_chars is not None else settings.DRUG_KB_GROUNDING_MAX_CHARS
+        excluded = [f"{name} - " for name in exclude_names or []]
+
+        lines = []
+        for passage in self.search(query):
+            if any(passage["title"].startswith(prefix) for prefix in excluded):
+                continue
+            text = passage["text"]
+            if len(text) > max_chars:
+                text = text[:max_chars].rstrip() + "…"
+            lines.append(f"- {passage['title']}: {text}")
+        return "\n".join(lines)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"loaded": self.loaded, **self.load_stats}
+
+
+# 싱글톤 인스턴스
+passage_retriever = PassageRetriever()
@@ -0,0 +1,269 @@
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    print("Warning: numpy not available. 답변 근거 검색(RAG)이 비활성화됩니다.")
+
+INDEX_VERSION = 1
+NGRAM_RANGE = (2, 3)
+N_FEATURES = 1 << 20  # 해시 공간 크기 (n-gram 사전을 저장하지 않기 위해 해싱 사용)
+MAX_DF = 0.5  # 전체 문서의 절반 이상에 나오는 n-gram(예: "이약", "합니")은 제외
+
+# n-gram 해시용 상수 (64비트 곱셈 해시, 프로세스와 무관하게 항상 같은 값)
+_HASH_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)
+_HASH_SEEDS = {2: 0x27D4EB2F165667C5, 3: 0x94D049BB133111EB}
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]")
+
+# 인덱스 파일
+_META_FILE = "meta.json"
+_ARRAY_FILES = ("feature_ptr", "doc_ids", "weights", "idf", "text_offsets", "title_offsets")
+_TEXT_FILE = "texts.bin"
+_TITLE_FILE = "titles.bin"
+
+
+def normalize_for_ngrams(text: str) -> str:
+    """n-gram 추출용 정규화 (소문자, 공백/기호 제거)
+
+    한국어는 띄어쓰기가 일정하지 않으므로(데이터셋은 대부분 붙여 씀) 공백을 모두 없앤 뒤
+    문자 n-gram을 만듭니다.
+    """
+    return _NON_WORD_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def hash_ngrams(text: str) -> "np.ndarray":
+    """정규화된 텍스트의 문자 n-gram을 해시 특성 번호 배열로 변환합니다 (numpy 벡터 연산)"""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    features = []
+    with np.errstate(over="ignore"):
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            if len(codes) < n:
+                continue
+            h = np.full(len(codes) - n + 1, _HASH_SEEDS[n], dtype=np.uint64)
+            for offset in range(n):
+                h ^= codes[offset:len(codes) - n + 1 + offset] * np.uint64(_HASH_MULTIPLIERS[offset])
+                h *= np.uint64(_HASH_MULTIPLIERS[0])
+            features.append((h >> np.uint64(40)) % np.uint64(N_FEATURES))
+    if not features:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(features).astype(np.int64)
+
+
+def _term_weights(text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """(특성 번호, 1 + log(tf)) 배열"""
+    features, counts = np.unique(hash_ngrams(normalize_for_ngrams(text)), return_counts=True)
+    return features, 1.0 + np.log(counts)
+
+
+class CharNgramTfidfIndex:
+    """문자 n-gram TF-IDF 희소 인덱스
+
+    - 문서 벡터는 특성(n-gram 해시)별 게시 목록(CSC) 형태의 numpy 배열로 저장합니다
+      (feature_ptr[f]:feature_ptr[f+1] 구간이 특성 f를 가진 문서 번호와 가중치)
+    - 검색은 질의 특성들의 게시 목록을 한 번에 모아 np.bincount로 점수를 합산하므로
+      여러 질의를 한 번의 희소 행렬 곱으로 처리합니다
+    - save()로 저장한 인덱스는 np.load(mmap_mode="r")로 열어 적재 시간이 거의 들지 않습니다
+    """
+
+    def __init__(self):
+        self.feature_ptr = None
+        self.doc_ids = None
+        self.weights = None
+        self.idf = None
+        self.text_offsets = None
+        self.title_offsets = None
+        self._texts = b""
+        self._titles = b""
+        self.meta: Dict[str, Any] = {}
+
+    @property
+    def n_docs(self) -> int:
+        return 0 if self.text_offsets is None else len(self.text_offsets) - 1
+
+    # ------------------------------------------------------------------
+    # 생성 / 저장 / 적재
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, passages: Iterable[Tuple[str, str]], meta: Optional[Dict[str, Any]] = None) -> "CharNgramTfidfIndex":
+        """(제목, 본문) 목록으로 인덱스를 만듭니다 (제목도 함께 색인)"""
+        start = time.perf_counter()
+        titles, texts, rows, cols, vals = [], [], [], [], []
+        for doc_id, (title, text) in enumerate(passages):
+            titles.append(title)
+            texts.append(text)
+            features, tf = _term_weights(f"{title} {text}")
+            rows.append(np.full(len(features), doc_id, dtype=np.int32))
+            cols.append(features)
+            vals.append(tf)
+
+        n_docs = len(texts)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        vals = np.concatenate(vals) if vals else np.zeros(0, dtype=np.float64)
+
+        # idf = log((1 + N) / (1 + df)) + 1, 너무 흔한 n-gram은 제외
+        df = np.bincount(cols, minlength=N_FEATURES)
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+        idf[df > max(MAX_DF * n_docs, 1)] = 0.0
+        vals = vals * idf[cols]
+
+        # 문서 벡터 L2 정규화
+        norms = np.sqrt(np.bincount(rows, weights=vals ** 2, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        vals = vals / norms[rows]
+
+        keep = vals > 0
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+        # 특성 순(CSC)으로 정렬
+        order = np.lexsort((rows, cols))
+        index = cls()
+        index.doc_ids = rows[order].astype(np.int32)
+        index.weights = vals[order].astype(np.float32)
+        index.feature_ptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=N_FEATURES)))).astype(np.int64)
+        index.idf = idf
+        index._texts, index.text_offsets = cls._pack(texts)
+        index._titles, index.title_offsets = cls._pack(titles)
+        index.meta = {
+            **(meta or {}),
+            "version": INDEX_VERSION,
+            "ngram_range": list(NGRAM_RANGE),
+            "n_features": N_FEATURES,
+            "n_docs": n_docs,
+            "nnz": int(len(index.doc_ids)),
+            "build_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        return index
+
+    @staticmethod
+    def _pack(strings: List[str]) -> Tuple[bytes, "np.ndarray"]:
+        """문자열 목록을 하나의 UTF-8 바이트열과 오프셋 배열로 묶습니다"""
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded]) if encoded else []
+        return b"".join(encoded), offsets
+
+    def save(self, index_dir: str):
+        """인덱스를 디렉토리에 저장합니다 (임시 디렉토리에 쓴 뒤 교체)"""
+        tmp_dir = f"{index_dir}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name in _ARRAY_FILES:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(tmp_dir, _TEXT_FILE), "wb") as f:
+            f.write(self._texts)
+        with open(os.path.join(tmp_dir, _TITLE_FILE), "wb") as f:
+            f.write(self._titles)
+        with open(os.path.join(tmp_dir, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(index_dir):
+            old_dir = f"{index_dir}.old"
+            os.replace(index_dir, old_dir)
+            os.replace(tmp_dir, index_dir)
+            for name in os.listdir(old_dir):
+                os.remove(os.path.join(old_dir, name))
+            os.rmdir(old_dir)
+        else:
+            os.replace(tmp_dir, index_dir)
+
+    @staticmethod
+    def read_meta(index_dir: str) -> Optional[Dict[str, Any]]:
+        """저장된 인덱스의 메타데이터 (없거나 손상되었으면 None)"""
+        try:
+            with open(os.path.join(index_dir, _META_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "CharNgramTfidfIndex":
+        """저장된 인덱스를 mmap으로 엽니다 (배열은 필요한 부분만 디스크에서 읽음)"""
+        index = cls()
+        index.meta = cls.read_meta(index_dir) or {}
+        for name in _ARRAY_FILES:
+            setattr(index, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r"))
+        index._texts = np.memmap(os.path.join(index_dir, _TEXT_FILE), dtype=np.uint8, mode="r") \
+            if os.path.getsize(os.path.join(index_dir, _TEXT_FILE)) else b""
+        index._titles = np.memmap(os.path.join(index_dir, _TITLE_FILE), dtype=np.uint8, mode="r") \
+            if os.path.getsize(os.path.join(index_dir, _TITLE_FILE)) else b""
+        return index
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def _get_string(self, blob, offsets, doc_id: int) -> str:
+        return bytes(blob[int(offsets[doc_id]):int(offsets[doc_id + 1])]).decode("utf-8")
+
+    def get_passage(self, doc_id: int) -> Dict[str, Any]:
+        return {
+            "doc_id": int(doc_id),
+            "title": self._get_string(self._titles, self.title_offsets, doc_id),
+            "text": self._get_string(self._texts, self.text_offsets, doc_id)
+        }
+
+    def _query_vectors(self, queries: List[str]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """질의들을 (질의 번호, 특성, 가중치) 희소 행렬로 변환합니다"""
+        q_rows, q_cols, q_vals = [], [], []
+        for q_index, query in enumerate(queries):
+            features, tf = _term_weights(query)
+            weights = tf * self.idf[features]
+            norm = np.sqrt((weights ** 2).sum())
+            if norm > 0:
+                weights = weights / norm
+            keep = weights > 0
+            q_rows.append(np.full(int(keep.sum()), q_index, dtype=np.int64))
+            q_cols.append(features[keep])
+            q_vals.append(weights[keep])
+        return np.concatenate(q_rows), np.concatenate(q_cols), np.concatenate(q_vals)
+
+    def score(self, queries: List[str]) -> "np.ndarray":
+        """질의별 전체 문서 점수 (질의 수 × 문서 수, 코사인 유사도)"""
+        n_docs = self.n_docs
+        if not queries or n_docs == 0:
+            return np.zeros((len(queries), n_docs), dtype=np.float32)
+
+        q_rows, q_cols, q_vals = self._query_vectors(queries)
+        starts = self.feature_ptr[q_cols]
+        lengths = self.feature_ptr[q_cols + 1] - starts
+
+        # 질의 특성마다의 게시 목록 구간을 하나의 인덱스 배열로 펼침
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros((len(queries), n_docs), dtype=np.float32)
+        segment = np.repeat(np.arange(len(q_cols)), lengths)
+        positions = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+
+        docs = np.asarray(self.doc_ids[positions], dtype=np.int64)
+        contrib = np.asarray(self.weights[positions], dtype=np.float64) * q_vals[segment]
+        flat = np.bincount(q_rows[segment] * n_docs + docs, weights=contrib, minlength=len(queries) * n_docs)
+        return flat.reshape(len(queries), n_docs).astype(np.float32)
+
+    def search_batch(self, queries: List[str], top_k: int = 3, min_score: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """여러 질의의 상위 top_k 문단을 한 번에 검색합니다"""
+        scores = self.score(queries)
+        results = []
+        for row in scores:
+            if len(row) == 0:
+                results.append([])
+                continue
+            k = min(top_k, len(row))
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            results.append([
+                {**self.get_passage(doc_id), "score": round(float(row[doc_id]), 4)}
+                for doc_id in top if row[doc_id] > min_score
+            ])
+        return results
+
+    def search(self, query: str, top_k: int = 3, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """질의 하나의 상위 top_k 문단을 검색합니다"""
+        return self.search_batch([query], top_k, min_score)[0]
@@ -0,0 +1,15 @@
+"""
+IBM Watson 음성 서비스 모듈
+
+음성 API들이 공유하는 STT/TTS 비동기 클라이언트, 문장 단위 TTS 스트리밍, 실시간 STT 세션을 제공합니다.
+"""
+
+from .audio_client import WatsonAudioClient, AudioServiceBusyError, watson_audio_client
+from .tts_stream import CONCATENABLE_FORMATS, SentenceBuffer, split_sentences, synthesize_in_order
+from .stt_stream import RecognizeStream, TranscriptCollector
+
+__all__ = [
+    "WatsonAudioClient", "AudioServiceBusyError", "watson_audio_client",
+    "CONCATENABLE_FORMATS", "SentenceBuffer", "split_sentences", "synthesize_in_order",
+    "RecognizeStream", "TranscriptCollector"
+]
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlencode
+
+import httpx
+from fastapi import HTTPException
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    print("Warning: h2 not available. 음성 서비스 클라이언트가 HTTP/1.1로 동작합니다.")
+
+from core.config import settings
+from core.metrics import track_upstream
+from .stt_stream import WEBSOCKETS_AVAILABLE, RecognizeStream
+
+if WEBSOCKETS_AVAILABLE:
+    import websockets
+
+
+class AudioServiceBusyError(HTTPException):
+    """STT/TTS 동시 호출 한도에서 대기 시간이 초과되었을 때 발생 (503 + Retry-After)"""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
+class _AudioService:
+    """Watson 음성 서비스 하나(STT 또는 TTS)의 커넥션 풀과 동시 호출 한도"""
+
+    # 토큰 만료 전 갱신 여유 시간 (초)
+    TOKEN_REFRESH_MARGIN = 60
+
+    def __init__(self, name: str, label: str, max_concurrency: int, timeout: float):
+        self.name = name
+        self.label = label
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self.stats = {"requests": 0, "rejected_timeout": 0}
+        self._token_lock = asyncio.Lock()
+        self._access_token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+
+    @property
+    def url(self) -> str:
+        return getattr(settings, f"WATSON_{self.name.upper()}_URL")
+
+    @property
+    def api_key(self) -> str:
+        return getattr(settings, f"WATSON_{self.name.upper()}_API_KEY")
+
+    def get_client(self) -> httpx.AsyncClient:
+        """서비스별 공유 httpx.AsyncClient를 반환합니다 (Basic 인증은 클라이언트에 한 번만 설정)"""
+        if self._client is None or self._client.is_closed:
+            if not self.api_key:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"IBM Watson {self.label} API 키가 설정되지 않았습니다."
+                )
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                auth=("apikey", self.api_key),
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=settings.WATSON_AUDIO_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.WATSON_AUDIO_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    async def get_access_token(self) -> str:
+        """IAM 액세스 토큰을 반환합니다 (WebSocket 인식은 Basic 인증 대신 토큰 사용, 만료 임박 시 갱신)"""
+        if self._access_token and time.time() < self._token_expires_at - self.TOKEN_REFRESH_MARGIN:
+            return self._access_token
+
+        async with self._token_lock:
+            # 다른 코루틴이 이미 갱신했는지 다시 확인
+            if self._access_token and time.time() < self._token_expires_at - self.TOKEN_REFRESH_MARGIN:
+                return self._access_token
+
+            with track_upstream("ibm_iam", "token"):
+                response = await self.get_client().post(
+                    settings.IBM_IAM_URL,
+                    data={
+                        "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+                        "apikey": self.api_key
+                    },
+                    headers={"Accept": "application/json"},
+                    auth=None  # 서비스용 Basic 인증을 IAM에 보내지 않음
+                )
+                response.raise_for_status()
+
+            token_data = response.json()
+            self._access_token = token_data["access_token"]
+            self._token_expires_at = float(
+                token_data.get("expiration") or time.time() + token_data.get("expires_in", 3600)
+            )
+            return self._access_token
+
+    @asynccontextmanager
+    async def slot(self):
+        """동시 호출 슬롯을 하나 확보합니다 (queue timeout 안에 못 얻으면 503)"""
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=settings.WATSON_AUDIO_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.stats["rejected_timeout"] += 1
+            raise AudioServiceBusyError(
+                f"음성 {self.label} 요청이 많아 잠시 후 다시 시도해주세요.",
+                settings.WATSON_AUDIO_RETRY_AFTER
+            )
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        self.stats["requests"] += 1
+        try:
+            yield self.get_client()
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """현재 사용량 통계"""
+        return {
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            **self.stats
+        }
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+class WatsonAudioClient:
+    """IBM Watson STT/TTS 비동기 클라이언트 (모든 음성 API가 공유)
+
+    - 서비스마다 워커당 하나의 httpx.AsyncClient를 재사용합니다 (keep-alive, HTTP/2)
+      요청마다 새 연결과 TLS 핸드셰이크를 맺지 않습니다
+    - 서비스별 동시 호출 수를 제한하고, 대기 시간이 초과되면 503으로 거절합니다
+    - 실시간 인식은 IAM 토큰으로 Watson STT WebSocket에 연결합니다 (recognize_stream)
+    """
+
+    def __init__(self):
+        self._stream_sessions = 0
+        self.stt = _AudioService("stt", "인식(STT)", settings.WATSON_STT_MAX_CONCURRENCY, settings.WATSON_STT_TIMEOUT)
+        self.tts = _AudioService("tts", "합성(TTS)", settings.WATSON_TTS_MAX_CONCURRENCY, settings.WATSON_TTS_TIMEOUT)
+
+    async def recognize(self, audio: bytes, content_type: str,
+                        model: str = "ko-KR_BroadbandModel") -> Dict[str, Any]:
+        """오디오를 Watson STT /v1/recognize로 보내 인식 결과(JSON)를 반환합니다"""
+        async with self.stt.slot() as client:
+            with track_upstream("watson_stt", "recognize"):
+                response = await client.post(
+                    "/v1/recognize",
+                    params={"model": model},
+                    headers={"Content-Type": content_type, "Accept": "application/json"},
+                    content=audio
+                )
+                response.raise_for_status()
+        return response.json()
+
+    async def synthesize(self, text: str, voice: str, audio_format: str = "mp3") -> bytes:
+        """텍스트를 Watson TTS /v1/synthesize로 합성해 오디오 바이트를 반환합니다"""
+        # UTF-8 JSON 본문을 직접 직렬화해 보냄 (한국어 텍스트 인코딩 문제 방지)
+        body = json.dumps({"text": text}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        async with self.tts.slot() as client:
+            with track_upstream("watson_tts", "synthesize"):
+                response = await client.post(
+                    "/v1/synthesize",
+                    params={"voice": voice},
+                    headers={"Content-Type": "application/json; charset=utf-8", "Accept": f"audio/{audio_format}"},
+                    content=body
+                )
+                response.raise_for_status()
+        return response.content
+
+    @asynccontextmanager
+    async def recognize_stream(self, model: str, content_type: str,
+                               interim_results: bool = True) -> AsyncIterator[RecognizeStream]:
+        """Watson STT WebSocket 인식 세션을 엽니다 (오디오를 보내는 동안 중간/최종 결과를 받음)
+
+        동시 세션이 WATSON_STT_MAX_STREAMS개를 넘으면 바로 AudioServiceBusyError를 발생시킵니다.
+        """
+        if not WEBSOCKETS_AVAILABLE:
+            raise RuntimeError("websockets 패키지가 없어 실시간 음성 인식을 사용할 수 없습니다.")
+        if self._stream_sessions >= settings.WATSON_STT_MAX_STREAMS:
+            raise AudioServiceBusyError("실시간 음성 인식 요청이 많아 잠시 후 다시 시도해주세요.",
+                                        settings.WATSON_AUDIO_RETRY_AFTER)
+
+        self._stream_sessions += 1
+        try:
+            token = await self.stt.get_access_token()
+            base_url = self.stt.url.replace("https://", "wss://", 1).replace("http://", "ws://", 1).rstrip("/")
+            url = f"{base_url}/v1/recognize?{urlencode({'access_token': token, 'model': model})}"
+            # 업스트림 지연/오류는 연결과 start 메시지 전송까지만 기록
+            # (이후 세션 길이는 사용자가 말하는 시간이고, 호출자 쪽 예외는 Watson 오류가 아님)
+            with track_upstream("watson_stt", "recognize_stream"):
+                connection = await websockets.connect(url, open_timeout=10, max_size=None)
+                try:
+                    await connection.send(json.dumps({
+                        "action": "start",
+                        "content-type": content_type,
+                        "interim_results": interim_results,
+                        "inactivity_timeout": settings.WATSON_STT_STREAM_INACTIVITY_TIMEOUT
+                    }))
+                except BaseException:
+                    await connection.close()
+                    raise
+            try:
+                yield RecognizeStream(connection)
+            finally:
+                await connection.close()
+        finally:
+            self._stream_sessions -= 1
+
+    async def list_models(self) -> Dict[str, Any]:
+        """STT 모델 목록 (상태 확인용)"""
+        async with self.stt.slot() as client:
+            response = await client.get("/v1/models", timeout=10.0)
+            response.raise_for_status()
+        return response.json()
+
+    async def list_voices(self) -> Dict[str, Any]:
+        """TTS 음성 목록 (상태 확인용)"""
+        async with self.tts.slot() as client:
+            response = await client.get("/v1/voices", timeout=10.0)
+            response.raise_for_status()
+        return response.json()
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """설정된 서비스의 호스트와 연결을 맺어 둡니다 (앱 시작 시 호출)"""
+        services = [service for service in (self.stt, self.tts) if service.api_key]
+        if not services:
+            raise RuntimeError("IBM Watson STT/TTS API 키가 설정되지 않았습니다.")
+
+        async def connect(service: _AudioService) -> str:
+            # 응답 코드와 관계없이 TLS/HTTP2 연결을 keep-alive 풀에 올려두는 것이 목적
+            response = await service.get_client().head("/")
+            return response.http_version
+
+        versions = await asyncio.gather(*(connect(service) for service in services))
+        return {service.name: version for service, version in zip(services, versions)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """서비스별 사용량 통계"""
+        return {
+            "stt": {**self.stt.get_stats(), "stream_sessions": self._stream_sessions},
+            "tts": self.tts.get_stats(),
+            "http2": HTTP2_AVAILABLE
+        }
+
+    async def aclose(self):
+        """커넥션 풀을 정리합니다 (앱 종료 시 호출)"""
+        await self.stt.aclose()
+        await self.tts.aclose()
+
+
+# 싱글톤 인스턴스
+watson_audio_client = WatsonAudioClient()
@@ -0,0 +1,119 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+try:
+    from websockets.exceptions import ConnectionClosedOK
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    print("Warning: websockets not available. 실시간 음성 인식(/voice/stream)을 사용할 수 없습니다.")
+
+
+class RecognizeStream:
+    """Watson STT WebSocket 인식 세션 하나 (/v1/recognize)
+
+    start 메시지를 보낸 연결을 감싸 오디오 전송, 종료 요청, 결과 메시지 수신을 제공합니다.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.audio_bytes = 0
+        self.stopped = False
+
+    async def send_audio(self, data: bytes):
+        """오디오 프레임을 그대로 전달합니다"""
+        self.audio_bytes += len(data)
+        await self._connection.send(data)
+
+    async def stop(self):
+        """오디오 전송이 끝났음을 알립니다 (Watson이 남은 최종 결과를 보낸 뒤 listening 상태로 돌아감)"""
+        if not self.stopped:
+            self.stopped = True
+            await self._connection.send(json.dumps({"action": "stop"}))
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """Watson이 보내는 JSON 메시지 (state/results/error)를 차례로 반환합니다"""
+        try:
+            async for raw in self._connection:
+                if isinstance(raw, str):
+                    yield json.loads(raw)
+        except ConnectionClosedOK:
+            return
+
+
+class TranscriptCollector:
+    """Watson 스트리밍 결과를 클라이언트 이벤트로 바꾸고 최종 인식 결과를 모읍니다
+
+    최종 결과의 신뢰도 판정은 /voice/stt의 confidence_threshold와 같은 기준을 사용합니다.
+    """
+
+    def __init__(self, confidence_threshold: float):
+        self.confidence_threshold = confidence_threshold
+        # result_index → (문장, 신뢰도). Watson이 같은 인덱스를 다시 보내면 덮어씀
+        self._finals: Dict[int, Tuple[str, float]] = {}
+        self._listening_count = 0
+        self.error = None
+
+    @property
+    def finished(self) -> bool:
+        """종료 요청 처리가 끝났거나(두 번째 listening) 오류가 발생했는지"""
+        return self._listening_count >= 2 or self.error is not None
+
+    def _judge(self, transcript: str, confidence: float) -> Dict[str, Any]:
+        """/voice/stt와 같은 기준으로 상태와 메시지를 정합니다"""
+        if not transcript:
+            return {"status": "no_speech", "message": "음성을 인식할 수 없습니다."}
+        if confidence < self.confidence_threshold:
+            return {
+                "status": "low_confidence",
+                "message": f"음성 인식 신뢰도가 낮습니다 ({confidence:.2f} < {self.confidence_threshold})"
+            }
+        return {"status": "success", "message": "음성 인식 성공"}
+
+    def handle(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Watson 메시지 하나를 처리하고 클라이언트에 보낼 이벤트 목록을 반환합니다"""
+        if "error" in message:
+            self.error = message["error"]
+            return [{"type": "error", "message": f"음성 인식 중 오류가 발생했습니다: {self.error}"}]
+
+        if message.get("state") == "listening":
+            self._listening_count += 1
+            return [{"type": "listening"}] if self._listening_count == 1 else []
+
+        events = []
+        base_index = message.get("result_index", 0)
+        for offset, result in enumerate(message.get("results") or []):
+            alternatives = result.get("alternatives") or []
+            if not alternatives:
+                continue
+            index = base_index + offset
+            transcript = alternatives[0].get("transcript", "").strip()
+            if result.get("final"):
+                confidence = alternatives[0].get("confidence", 0.0)
+                self._finals[index] = (transcript, confidence)
+                events.append({
+                    "type": "final",
+                    "result_index": index,
+                    "text": transcript,
+                    "confidence": confidence,
+                    **self._judge(transcript, confidence)
+                })
+            else:
+                events.append({"type": "interim", "result_index": index, "text": transcript})
+        return events
+
+    def summary(self) -> Dict[str, Any]:
+        """지금까지의 최종 결과를 /voice/stt 응답과 같은 형태로 합칩니다"""
+        finals = [self._finals[index] for index in sorted(self._finals) if self._finals[index][0]]
+        transcript = " ".join(text for text, _ in finals)
+        confidence = round(sum(conf for _, conf in finals) / len(finals), 4) if finals else 0.0
+        return {
+            "type": "end",
+            "text": transcript,
+            "confidence": confidence,
+            **self._judge(transcript, confidence),
+            "metadata": {
+                "result_count": len(finals),
+                "word_count": len(transcript.split())
+            }
+        }
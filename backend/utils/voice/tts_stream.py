@@ -0,0 +1,147 @@
+import asyncio
+import re
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Union
+
+# 이어 붙여도 재생 가능한 형식 (MP3 프레임, Ogg 페이지). wav/flac은 헤더가 하나여야 하므로 나눠 합성하지 않음
+CONCATENABLE_FORMATS = {"mp3", "ogg"}
+
+# 문장 끝 (마침표/물음표/느낌표/말줄임 뒤 공백) 또는 줄바꿈
+_SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?…。])\s+|\n+')
+# 너무 긴 문장을 나눌 때 쓰는 쉼표/세미콜론 위치
+_CLAUSE_END_PATTERN = re.compile(r'(?<=[,;:])\s+')
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """max_chars보다 긴 문장을 쉼표, 그래도 길면 공백 기준으로 나눕니다"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces, current = [], ""
+    for part in _CLAUSE_END_PATTERN.split(sentence):
+        words = [part] if len(part) <= max_chars else part.split(' ')
+        for word in words:
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class SentenceBuffer:
+    """생성 중인 텍스트 조각을 받아 완성된 문장 청크를 내보냅니다
+
+    첫 청크는 한 문장만 담아 첫 음성이 빨리 나오게 하고,
+    이후 청크는 min_chars 이상이 될 때까지 짧은 문장을 합쳐 TTS 호출 수를 줄입니다.
+    끝나지 않은 문장이 max_chars를 넘으면 쉼표/공백에서 잘라 먼저 내보냅니다.
+    """
+
+    def __init__(self, min_chars: int = 40, max_chars: int = 400):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.emitted = 0
+        self._text = ""     # 아직 끝나지 않은 문장
+        self._pending = ""  # min_chars를 채우기 위해 모으는 중인 문장들
+
+    def _push(self, sentence: str) -> List[str]:
+        if self.emitted == 0:
+            self.emitted += 1
+            return [sentence]
+
+        chunks = []
+        if self._pending and len(self._pending) + 1 + len(sentence) > self.max_chars:
+            chunks.append(self._pending)
+            self._pending = sentence
+        else:
+            self._pending = f"{self._pending} {sentence}" if self._pending else sentence
+        if len(self._pending) >= self.min_chars:
+            chunks.append(self._pending)
+            self._pending = ""
+        self.emitted += len(chunks)
+        return chunks
+
+    def _push_all(self, sentences: List[str]) -> List[str]:
+        chunks = []
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if sentence:
+                for piece in _split_long(sentence, self.max_chars):
+                    chunks.extend(self._push(piece))
+        return chunks
+
+    def feed(self, text: str) -> List[str]:
+        """텍스트 조각을 추가하고 완성된 청크들을 반환합니다"""
+        parts = _SENTENCE_END_PATTERN.split(self._text + text)
+        self._text = parts.pop()
+        if len(self._text) > self.max_chars:
+            pieces = _split_long(self._text, self.max_chars)
+            self._text = pieces.pop()
+            parts.extend(pieces)
+        return self._push_all(parts)
+
+    def flush(self) -> List[str]:
+        """남은 텍스트를 모두 청크로 내보냅니다 (생성이 끝났을 때 호출)"""
+        chunks = self._push_all([self._text])
+        self._text = ""
+        if self._pending:
+            chunks.append(self._pending)
+            self.emitted += 1
+            self._pending = ""
+        return chunks
+
+
+def split_sentences(text: str, min_chars: int = 40, max_chars: int = 400) -> List[str]:
+    """완성된 TTS 텍스트를 문장 단위 청크로 나눕니다 (SentenceBuffer와 같은 규칙)"""
+    buffer = SentenceBuffer(min_chars, max_chars)
+    return buffer.feed(text) + buffer.flush()
+
+
+async def synthesize_in_order(chunks: Union[Iterable[str], AsyncIterable[str]],
+                              synthesize: Callable[[str], Awaitable[bytes]],
+                              concurrency: int) -> AsyncIterator[bytes]:
+    """청크들을 최대 concurrency개씩 동시에 합성하고, 완료되는 대로 원래 순서에 맞춰 반환합니다
+
+    chunks가 비동기 이터레이터(예: LLM 답변에서 나오는 문장)이면 청크가 도착하는 즉시 합성을 시작하고,
+    청크 생성 중 발생한 예외는 그때까지의 오디오를 모두 반환한 뒤 전파합니다.
+    제너레이터가 닫히면(클라이언트 연결 종료 등) 남은 합성 작업을 취소합니다.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    queue: "asyncio.Queue[asyncio.Task]" = asyncio.Queue()
+
+    async def run(chunk: str) -> bytes:
+        async with semaphore:
+            return await synthesize(chunk)
+
+    async def schedule():
+        try:
+            if hasattr(chunks, "__aiter__"):
+                async for chunk in chunks:
+                    queue.put_nowait(asyncio.create_task(run(chunk)))
+            else:
+                for chunk in chunks:
+                    queue.put_nowait(asyncio.create_task(run(chunk)))
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(schedule())
+    tasks = []
+    try:
+        while True:
+            task = await queue.get()
+            if task is None:
+                break
+            tasks.append(task)
+            yield await task
+        producer.result()
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            task = queue.get_nowait()
+            if task is not None:
+                tasks.append(task)
+        for task in tasks:
+            task.cancel()
+        # 취소된 작업의 예외를 회수해 "never retrieved" 경고를 막음
+        await asyncio.gather(producer, *tasks, return_exceptions=True)
@@ -0,0 +1,16 @@
+"""
+IBM watsonx.ai 모듈
+
+에이전트들이 공유하는 비동기 텍스트 생성 클라이언트를 제공합니다.
+"""
+
+from .async_client import WatsonxAsyncClient, WatsonxError, watsonx_client
+from .model_pool import ModelPool, WatsonxOverloadedError
+from .single_flight import SingleFlight
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+__all__ = [
+    "WatsonxAsyncClient", "WatsonxError", "watsonx_client",
+    "ModelPool", "WatsonxOverloadedError", "SingleFlight",
+    "CircuitBreaker", "CircuitOpenError"
+]
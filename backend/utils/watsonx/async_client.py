@@ -0,0 +1,307 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    print("Warning: h2 not available. Watson 클라이언트가 HTTP/1.1로 동작합니다.")
+
+from core.config import settings
+from core.timing import timed_stage
+from core.metrics import track_upstream
+from .model_pool import ModelPool
+from .single_flight import SingleFlight
+from .circuit_breaker import CircuitBreaker
+
+
+class WatsonxError(Exception):
+    """watsonx.ai 호출 실패를 나타내는 예외"""
+
+
+class WatsonxAsyncClient:
+    """asyncio 기반 IBM watsonx.ai 텍스트 생성 클라이언트 (모든 에이전트가 공유)
+
+    - 워커당 하나의 httpx.AsyncClient를 재사용합니다 (keep-alive, HTTP/2)
+    - IAM 토큰을 캐시하고 만료 전에 갱신합니다
+    - ModelPool로 동시 생성 요청 수와 대기열 길이를 제한합니다 (초과 시 503)
+    - 동일한 프롬프트/파라미터의 동시 요청은 한 번만 호출합니다 (single-flight)
+    - 오류/지연이 많아지면 서킷 브레이커가 호출을 바로 거절합니다 (CircuitOpenError)
+    - 설정 시 p95 지연을 넘긴 요청에 헤지 요청을 한 번 더 보냅니다
+    """
+
+    # 토큰 만료 전 갱신 여유 시간 (초)
+    TOKEN_REFRESH_MARGIN = 60
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.pool = ModelPool(
+            max_concurrency=settings.WATSONX_MAX_CONCURRENCY,
+            max_queue_depth=settings.WATSONX_MAX_QUEUE_DEPTH,
+            queue_timeout=settings.WATSONX_QUEUE_TIMEOUT,
+            retry_after=settings.WATSONX_RETRY_AFTER
+        )
+        self._token_lock = asyncio.Lock()
+        self._access_token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+        self.single_flight = SingleFlight()
+        self.breaker = CircuitBreaker(
+            "watsonx.generation",
+            enabled=settings.WATSONX_BREAKER_ENABLED,
+            window_size=settings.WATSONX_BREAKER_WINDOW,
+            min_calls=settings.WATSONX_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.WATSONX_BREAKER_FAILURE_RATE,
+            slow_call_duration=settings.WATSONX_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.WATSONX_BREAKER_SLOW_CALL_RATE,
+            open_duration=settings.WATSONX_BREAKER_OPEN_SECONDS,
+            half_open_max_calls=settings.WATSONX_BREAKER_HALF_OPEN_CALLS
+        )
+        self.hedge_stats = {"hedged": 0, "hedge_won": 0}
+
+    @property
+    def is_configured(self) -> bool:
+        """필수 설정이 모두 존재하는지 확인합니다"""
+        return bool(settings.WATSONX_API_KEY and settings.WATSONX_PROJECT_ID)
+
+    def get_client(self) -> httpx.AsyncClient:
+        """공유 httpx.AsyncClient 인스턴스를 반환합니다"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(settings.WATSONX_TIMEOUT, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.WATSONX_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.WATSONX_MAX_KEEPALIVE,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+
+    async def get_access_token(self) -> str:
+        """IAM 액세스 토큰을 반환합니다 (만료 임박 시 갱신)"""
+        if self._access_token and time.time() < self._token_expires_at - self.TOKEN_REFRESH_MARGIN:
+            return self._access_token
+
+        async with self._token_lock:
+            # 다른 코루틴이 이미 갱신했는지 다시 확인
+            if self._access_token and time.time() < self._token_expires_at - self.TOKEN_REFRESH_MARGIN:
+                return self._access_token
+
+            if not self.is_configured:
+                raise WatsonxError("IBM Watson API 키 또는 프로젝트 ID가 설정되지 않았습니다.")
+
+            # IAM 장애는 생성 오류와 같이 503 + Retry-After로 전달 (생성 경로에서는 브레이커 guard 안에서 호출되어 실패로 집계)
+            with track_upstream("ibm_iam", "token"):
+                try:
+                    response = await self.get_client().post(
+                        settings.IBM_IAM_URL,
+                        data={
+                            "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+                            "apikey": settings.WATSONX_API_KEY
+                        },
+                        headers={"Accept": "application/json"}
+                    )
+                except httpx.HTTPError as e:
+                    print(f"❌ IAM 토큰 요청 실패: {e}")
+                    raise self.pool.overloaded("AI 모델 인증 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.") from e
+                if response.status_code != 200:
+                    print(f"❌ IAM 토큰 발급 실패 ({response.status_code}): {response.text[:200]}")
+                    raise self.pool.overloaded("AI 모델 인증에 실패했습니다. 잠시 후 다시 시도해주세요.")
+
+            token_data = response.json()
+            self._access_token = token_data["access_token"]
+            self._token_expires_at = float(
+                token_data.get("expiration") or time.time() + token_data.get("expires_in", 3600)
+            )
+            return self._access_token
+
+    def _build_body(self, prompt: str, params: Optional[Dict[str, Any]],
+                    model_id: Optional[str]) -> Dict[str, Any]:
+        """텍스트 생성 요청 본문을 구성합니다"""
+        return {
+            "model_id": model_id or settings.WATSONX_MODEL_ID,
+            "input": prompt,
+            "parameters": params or {},
+            "project_id": settings.WATSONX_PROJECT_ID
+        }
+
+    def _check_response_status(self, response: httpx.Response):
+        """오류 응답이면 WatsonxError를 발생시킵니다"""
+        if response.status_code == 401:
+            # 토큰이 서버 측에서 무효화된 경우 다음 요청에서 재발급
+            self._access_token = None
+        if response.status_code == 429:
+            # Watson 요청 제한은 클라이언트에게 503 + Retry-After로 전달
+            self.pool.stats["upstream_throttled"] += 1
+            retry_after = response.headers.get("Retry-After")
+            raise self.pool.overloaded(
+                "AI 모델 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+                int(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        if response.status_code != 200:
+            raise WatsonxError(f"watsonx.ai 오류 ({response.status_code}): {response.text}")
+
+    async def generate(self, prompt: str, params: Optional[Dict[str, Any]] = None,
+                       model_id: Optional[str] = None) -> Dict[str, Any]:
+        """텍스트 생성 요청을 보내고 watsonx.ai 응답(JSON)을 반환합니다
+
+        반환 형식은 SDK의 Model.generate와 동일합니다 (response['results'][0]['generated_text']).
+        동시에 들어온 동일한 요청은 하나의 업스트림 호출 결과를 공유합니다.
+        """
+        body = self._build_body(prompt, params, model_id)
+        with timed_stage("generation"):
+            if not settings.WATSONX_SINGLE_FLIGHT_ENABLED:
+                return await self._post_generation(body)
+
+            flight_key = json.dumps(body, ensure_ascii=False, sort_keys=True, default=str)
+            return await self.single_flight.do(flight_key, lambda: self._post_generation(body))
+
+    def _hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보내기 전 기다릴 시간 (헤지하지 않으면 None)"""
+        if not settings.WATSONX_HEDGING_ENABLED:
+            return None
+        if self.breaker.latency_samples < settings.WATSONX_HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.breaker.latency_percentile(95), settings.WATSONX_HEDGE_MIN_DELAY)
+
+    async def _post_generation(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """text/generation 엔드포인트를 호출합니다 (p95를 넘기면 헤지 요청)"""
+        # 브레이커가 열려 있으면 대기열에 들어가기 전에 바로 거절
+        self.breaker.check()
+
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._attempt_generation(body)
+
+        primary = asyncio.ensure_future(self._attempt_generation(body))
+        pending = {primary}
+        # 호출자가 취소되면(클라이언트 연결 종료 등) 진행 중인 요청도 모두 취소해 슬롯과 할당량을 돌려줌
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            # 이미 끝났거나 여유 슬롯이 없으면 헤지하지 않음 (대기열을 더 늘리지 않도록)
+            if done or not self.pool.has_free_slot:
+                return await primary
+
+            self.hedge_stats["hedged"] += 1
+            hedge = asyncio.ensure_future(self._attempt_generation(body))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_stats["hedge_won"] += 1
+                        return task.result()
+            # 둘 다 실패하면 원래 요청의 오류를 전달
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt_generation(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """생성 요청을 한 번 보냅니다"""
+        url = f"{settings.WATSONX_API_URL}/ml/v1/text/generation"
+
+        async with self.pool.slot():
+            with self.breaker.guard():
+                token = await self.get_access_token()
+                with track_upstream("watsonx", "generation"):
+                    try:
+                        response = await self.get_client().post(
+                            url,
+                            params={"version": settings.WATSONX_API_VERSION},
+                            json=body,
+                            headers={
+                                "Authorization": f"Bearer {token}",
+                                "Accept": "application/json"
+                            }
+                        )
+                    except httpx.HTTPError as e:
+                        raise WatsonxError(f"watsonx.ai 요청 실패: {str(e)}") from e
+                    self._check_response_status(response)
+
+        return response.json()
+
+    async def generate_text_stream(self, prompt: str, params: Optional[Dict[str, Any]] = None,
+                                   model_id: Optional[str] = None) -> AsyncIterator[str]:
+        """생성되는 텍스트 조각을 도착하는 즉시 순서대로 반환합니다
+
+        watsonx.ai의 generation_stream(SSE) 엔드포인트를 사용합니다.
+        """
+        body = self._build_body(prompt, params, model_id)
+        url = f"{settings.WATSONX_API_URL}/ml/v1/text/generation_stream"
+
+        self.breaker.check()
+        async with self.pool.slot():
+            client = self.get_client()
+            try:
+                # 브레이커는 응답 헤더를 받을 때까지만 기록 (스트림 길이는 지연으로 보지 않음)
+                # 첫 응답 시간은 전체 생성 시간보다 훨씬 짧으므로 헤지 지연용 백분위 표본에서 제외
+                with self.breaker.guard(record_latency=False):
+                    token = await self.get_access_token()
+                    # 스트림은 응답 헤더를 받을 때까지의 시간을 기록
+                    with track_upstream("watsonx", "generation_stream"):
+                        request = client.build_request(
+                            "POST",
+                            url,
+                            params={"version": settings.WATSONX_API_VERSION},
+                            json=body,
+                            headers={
+                                "Authorization": f"Bearer {token}",
+                                "Accept": "text/event-stream"
+                            }
+                        )
+                        response = await client.send(request, stream=True)
+                        if response.status_code != 200:
+                            await response.aread()
+                            await response.aclose()
+                            self._check_response_status(response)
+
+                try:
+                    async for line in response.aiter_lines():
+                        # SSE 형식: "data: {...}" 줄만 처리
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if not data:
+                            continue
+                        try:
+                            payload = json.loads(data)
+                        except ValueError:
+                            continue
+
+                        results = payload.get("results") or []
+                        if results and results[0].get("generated_text"):
+                            yield results[0]["generated_text"]
+                finally:
+                    await response.aclose()
+            except httpx.HTTPError as e:
+                raise WatsonxError(f"watsonx.ai 스트리밍 요청 실패: {str(e)}") from e
+
+    async def generate_text(self, prompt: str, params: Optional[Dict[str, Any]] = None,
+                            model_id: Optional[str] = None) -> str:
+        """생성된 텍스트만 반환합니다"""
+        response = await self.generate(prompt, params, model_id)
+        return response['results'][0]['generated_text']
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """IAM 토큰을 미리 발급받고 watsonx.ai 호스트와 연결을 맺어 둡니다 (앱 시작 시 호출)"""
+        await self.get_access_token()
+        # 응답 코드와 관계없이 TLS/HTTP2 연결을 keep-alive 풀에 올려두는 것이 목적
+        response = await self.get_client().head(settings.WATSONX_API_URL)
+        return {"model_id": settings.WATSONX_MODEL_ID, "http_version": response.http_version}
+
+    async def aclose(self):
+        """커넥션 풀을 정리합니다 (앱 종료 시 호출)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+# 싱글톤 인스턴스
+watsonx_client = WatsonxAsyncClient()
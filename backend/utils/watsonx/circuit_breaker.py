@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 업스트림 호출을 바로 거절할 때 발생"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 서비스 응답이 불안정하여 요청을 일시 중단했습니다.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """업스트림 호출의 오류율/지연을 감시해 장애 시 호출을 차단합니다
+
+    - closed: 정상. 최근 window_size개 호출 중 실패 또는 느린 호출 비율이
+      임계값을 넘으면 open으로 전환
+    - open: open_duration초 동안 모든 호출을 즉시 거절
+    - half_open: half_open_max_calls개의 시험 호출만 허용하고,
+      성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, enabled: bool = True, window_size: int = 50,
+                 min_calls: int = 10, failure_rate_threshold: float = 0.5,
+                 slow_call_duration: float = 20.0, slow_call_rate_threshold: float = 0.5,
+                 open_duration: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.enabled = enabled
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_inflight = 0
+        # 최근 호출 결과 (실패 여부, 느린 호출 여부)
+        self._window: deque = deque(maxlen=window_size)
+        # 최근 성공한 전체 생성 호출의 소요 시간 (백분위 계산용, 스트림의 첫 응답 시간은 제외)
+        self._latencies: deque = deque(maxlen=window_size * 4)
+        self.stats = {
+            "successes": 0,
+            "failures": 0,
+            "slow_calls": 0,
+            "rejected": 0,
+            "opened": 0
+        }
+
+    def _retry_after(self) -> float:
+        return max(self._opened_at + self.open_duration - time.monotonic(), 0.0)
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        print(f"⚡ 서킷 브레이커 [{self.name}]: {self.state} → {state}")
+        self.state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.stats["opened"] += 1
+        if state != self.HALF_OPEN:
+            self._half_open_inflight = 0
+        if state == self.CLOSED:
+            self._window.clear()
+
+    def check(self):
+        """호출 가능 여부만 확인합니다 (열려 있으면 CircuitOpenError)"""
+        if not self.enabled:
+            return
+        if self.state == self.OPEN and self._retry_after() <= 0:
+            self._transition(self.HALF_OPEN)
+        if self.state == self.OPEN or (
+            self.state == self.HALF_OPEN and self._half_open_inflight >= self.half_open_max_calls
+        ):
+            self.stats["rejected"] += 1
+            raise CircuitOpenError(self.name, self._retry_after())
+
+    def _record(self, failed: bool, elapsed: float, record_latency: bool = True):
+        slow = elapsed >= self.slow_call_duration
+        if failed:
+            self.stats["failures"] += 1
+        else:
+            self.stats["successes"] += 1
+            if record_latency:
+                self._latencies.append(elapsed)
+        if slow:
+            self.stats["slow_calls"] += 1
+
+        if self.state == self.HALF_OPEN:
+            self._half_open_inflight = max(self._half_open_inflight - 1, 0)
+            self._transition(self.OPEN if failed or slow else self.CLOSED)
+            return
+
+        self._window.append((failed, slow))
+        if self.state == self.CLOSED and len(self._window) >= self.min_calls:
+            calls = len(self._window)
+            failure_rate = sum(1 for f, _ in self._window if f) / calls
+            slow_rate = sum(1 for _, s in self._window if s) / calls
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._transition(self.OPEN)
+
+    @contextmanager
+    def guard(self, record_latency: bool = True):
+        """업스트림 호출 구간을 감싸 결과와 소요 시간을 기록합니다
+
+        record_latency=False면 성공/실패와 느린 호출 여부만 기록하고 백분위 표본에는 넣지 않습니다
+        (스트림처럼 구간이 전체 생성 시간이 아닌 경우, 헤지 지연이 너무 짧아지지 않도록).
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self.check()
+        if self.state == self.HALF_OPEN:
+            self._half_open_inflight += 1
+
+        start = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            # 호출자가 취소한 경우는 성공/실패로 보지 않음
+            if self.state == self.HALF_OPEN:
+                self._half_open_inflight = max(self._half_open_inflight - 1, 0)
+            raise
+        except Exception:
+            self._record(True, time.monotonic() - start, record_latency)
+            raise
+        else:
+            self._record(False, time.monotonic() - start, record_latency)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """최근 성공 호출 소요 시간의 백분위 값 (초)"""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(int(len(ordered) * percentile / 100), len(ordered) - 1)
+        return ordered[index]
+
+    @property
+    def latency_samples(self) -> int:
+        return len(self._latencies)
+
+    def get_state(self) -> Dict[str, Any]:
+        """현재 상태와 통계를 반환합니다"""
+        calls = len(self._window)
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "state": self.state,
+            "retry_after": round(self._retry_after(), 1) if self.state == self.OPEN else 0,
+            "window_calls": calls,
+            "failure_rate": round(sum(1 for f, _ in self._window if f) / calls, 4) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, s in self._window if s) / calls, 4) if calls else 0.0,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            **self.stats
+        }
@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+class WatsonxOverloadedError(HTTPException):
+    """생성 요청 대기열이 가득 찼거나 Watson이 요청을 제한할 때 발생 (503 + Retry-After)"""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
+class ModelPool:
+    """Watson 생성 요청의 동시 실행 수와 대기열 길이를 제한합니다
+
+    - 동시에 실행되는 요청은 max_concurrency개까지
+    - 슬롯을 기다리는 요청은 max_queue_depth개까지, 초과하면 즉시 거절
+    - queue_timeout초 안에 슬롯을 얻지 못하면 거절
+    """
+
+    def __init__(self, max_concurrency: int, max_queue_depth: int,
+                 queue_timeout: float, retry_after: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self.stats = {
+            "admitted": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "upstream_throttled": 0
+        }
+
+    def overloaded(self, detail: str, retry_after: Optional[int] = None) -> WatsonxOverloadedError:
+        """거절 예외를 생성합니다"""
+        return WatsonxOverloadedError(detail, retry_after or self.retry_after)
+
+    @property
+    def has_free_slot(self) -> bool:
+        """대기 없이 바로 실행할 수 있는 슬롯이 있는지 확인합니다"""
+        return not self._semaphore.locked()
+
+    def check_capacity(self):
+        """대기열이 가득 찼으면 바로 거절합니다 (스트리밍 응답 시작 전 확인용)"""
+        if self._semaphore.locked() and self._waiting >= self.max_queue_depth:
+            self.stats["rejected_queue_full"] += 1
+            raise self.overloaded("AI 상담 요청이 많아 잠시 후 다시 시도해주세요.")
+
+    @asynccontextmanager
+    async def slot(self):
+        """실행 슬롯을 하나 확보합니다"""
+        if self._semaphore.locked():
+            self.check_capacity()
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats["rejected_timeout"] += 1
+                raise self.overloaded("AI 상담 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._active += 1
+        self.stats["admitted"] += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """현재 사용량과 거절 통계를 반환합니다"""
+        return {
+            **self.stats,
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth
+        }
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """동일한 키의 동시 요청을 하나의 업스트림 호출로 합칩니다
+
+    첫 요청(leader)이 실제 호출을 시작하고, 같은 키로 들어온 요청들은
+    그 결과를 함께 기다립니다. 호출이 끝나면 키가 제거되므로 결과를 보관하지 않습니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "calls": 0,
+            "upstream_calls": 0,
+            "collapsed_calls": 0
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key에 대해 진행 중인 호출이 있으면 그 결과를, 없으면 fn()의 결과를 반환합니다"""
+        self.stats["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["collapsed_calls"] += 1
+        else:
+            self.stats["upstream_calls"] += 1
+            # 별도 태스크로 실행해 leader가 취소되어도 다른 대기자는 결과를 받도록 함
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        """완료된 호출을 목록에서 제거합니다"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 조회
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """합쳐진 호출 수 등 통계를 반환합니다"""
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "inflight": len(self._inflight),
+            "collapse_ratio": round(self.stats["collapsed_calls"] / calls, 4) if calls else 0.0
+        }